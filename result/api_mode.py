@@ -0,0 +1,65 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+# --- 요청 처리 모드 설정 ---
+API_MODE = os.environ.get("API_MODE", "sync")  # sync | async
+BLOCKING_WORKERS = int(os.environ.get("BLOCKING_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# 처음 사용할 때 만드는 스레드 풀 (이미지 변환처럼 GIL을 풀어주는 CPU 작업용)
+class LazyExecutor:
+    def __init__(self, workers: int = BLOCKING_WORKERS, name: str = "blocking"):
+        self.workers = workers
+        self.name = name
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix=self.name)
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# --- 핸들러 실행 방식 선택 ---
+# sync 모드: 핸들러를 그대로 두어 Starlette 스레드풀에서 실행한다 (기존 동작).
+# async 모드: 코루틴으로 감싸 이벤트 루프에서 바로 실행하고, offload가 지정된 핸들러만 전용 executor로 보낸다.
+# functools.wraps로 원래 시그니처를 유지하므로 FastAPI의 파라미터/의존성 해석은 그대로다.
+def endpoint(fn: Optional[Callable] = None, *, offload: Optional[LazyExecutor] = None, mode: str = API_MODE):
+    if fn is None:
+        return lambda fn: endpoint(fn, offload=offload, mode=mode)
+    if mode == "sync":
+        return fn
+    if mode != "async":
+        raise ValueError(f"Unknown API mode: {mode}")
+
+    if offload is None:
+        @functools.wraps(fn)
+        async def run_inline(*args, **kwargs):
+            return fn(*args, **kwargs)
+        return run_inline
+
+    @functools.wraps(fn)
+    async def run_offloaded(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        return await loop.run_in_executor(offload.get(), call)
+    return run_offloaded
+
+
+async def iterate_inline(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    # StreamingResponse는 동기 이터레이터를 청크마다 스레드풀에서 돌리므로,
+    # async 모드에서는 메모리/DB 조회 청크를 루프에서 직접 순회한다.
+    for chunk in chunks:
+        yield chunk
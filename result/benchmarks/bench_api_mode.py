@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+import httpx
+from PIL import Image
+
+RESULT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- API_MODE 부하 비교 벤치마크 ---
+# API_MODE=sync/async 각각으로 uvicorn을 띄우고, 가벼운 조회(/api/me, /api/mentors)와
+# 무거운 이미지 업로드를 섞은 동시 부하를 걸어 조회 지연 시간과 처리량을 비교한다.
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def sample_png(size: int = 512) -> bytes:
+    buf = BytesIO()
+    Image.effect_noise((size, size), 64).convert("RGB").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, API_MODE=mode, BCRYPT_ROUNDS="4")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=RESULT_DIR, env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.get("/openapi.json")
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def seed(client: httpx.AsyncClient, mentors: int) -> str:
+    for i in range(mentors):
+        await client.post("/api/signup", json={
+            "email": f"mentor{i}@example.com", "password": "pw", "name": f"Mentor {i}", "role": "mentor",
+        })
+    await client.post("/api/signup", json={
+        "email": "bench@example.com", "password": "pw", "name": "Bench", "role": "mentee",
+    })
+    res = await client.post("/api/login", data={"username": "bench@example.com", "password": "pw"})
+    return res.json()["token"]
+
+
+async def load(client: httpx.AsyncClient, token: str, concurrency: int, duration: float, upload_every: int,
+               image: bytes) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies, uploads, errors = [], 0, 0
+    deadline = time.monotonic() + duration
+
+    async def worker(n: int):
+        nonlocal uploads, errors
+        i = 0
+        while time.monotonic() < deadline:
+            i += 1
+            if upload_every and (n + i) % upload_every == 0:
+                res = await client.put("/api/profile/image", headers=headers, files={"image": ("a.png", image, "image/png")})
+                uploads += 1
+            else:
+                path = "/api/me" if i % 2 else "/api/mentors?limit=50"
+                start = time.perf_counter()
+                res = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+            if res.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    latencies.sort()
+    return {
+        "reads_per_sec": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "uploads": uploads,
+        "errors": errors,
+    }
+
+
+async def bench(mode: str, args) -> dict:
+    port = free_port()
+    server = start_server(mode, port)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await wait_ready(client)
+            token = await seed(client, args.mentors)
+            return await load(client, token, args.concurrency, args.duration, args.upload_every, sample_png())
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API_MODE=sync/async 부하 비교")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mentors", type=int, default=200)
+    parser.add_argument("--upload-every", type=int, default=10, help="요청 N개마다 이미지 업로드 1개 (0이면 조회만)")
+    parser.add_argument("--modes", default="sync,async")
+    args = parser.parse_args()
+
+    for mode in args.modes.split(","):
+        result = asyncio.run(bench(mode, args))
+        print("{mode:<6} reads/s={reads_per_sec:8.0f} p50={p50_ms:7.1f}ms p99={p99_ms:7.1f}ms "
+              "uploads={uploads} errors={errors}".format(mode=mode, **result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RESULT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RESULT_DIR)
+
+from catalog import MentorCatalog
+from datasets import SKILLS, make_users
+from serialization import ProfileFragmentCache
+from store import UserStore, create_stores
+
+# --- 공유 멘토 카탈로그 벤치마크 ---
+# 1) 멘토 목록 페이지 지연 시간: sqlite 저장소 / 메모리 MentorIndex (+ 프로필 조각 캐시) / mmap 카탈로그
+# 2) 게시 시간과 파일 크기
+# 3) 워커 W개를 동시에 띄워 각자 멘토 목록을 들고 있을 때(메모리 저장소 + 프로필 조각 캐시)와
+#    카탈로그를 매핑해 전체 목록을 읽었을 때의 워커당 RSS / PSS (공유 페이지는 워커 수로 나눠 센다)
+QUERIES = {
+    "first page": dict(order_by="id", limit=20),
+    "name + skill": dict(skills=[SKILLS[0]], order_by="name", limit=20),
+    "2 skills all": dict(skills=SKILLS[:2], match="all", order_by="skill", limit=20),
+    "deep cursor": dict(order_by="name", limit=20, after=("mentor-5", 0)),
+    "full list": dict(order_by="id"),
+}
+
+
+def memory_kb() -> dict:
+    with open("/proc/self/smaps_rollup") as f:
+        next(f)  # 주소 범위 줄
+        fields = dict(line.split(":", 1) for line in f)
+    return {key: int(fields[key].split()[0]) for key in ("Rss", "Pss")}
+
+
+def worker(mode: str, directory: str):
+    # 부모가 모든 워커의 준비를 확인한 뒤 측정하도록 stdin 한 줄을 기다린다
+    if mode == "catalog":
+        snapshot = MentorCatalog(lambda: [], directory).current()
+        fragments, _ = snapshot.page()
+    else:
+        users, _ = create_stores("sqlite", os.path.join(directory, "app.db"))
+        local = UserStore()
+        local.insert_many(users.values())
+        cache = ProfileFragmentCache(max_size=len(local))
+        fragments = [cache.fragment(m) for m in local.mentors.page()[0]]
+    print(len(fragments), flush=True)
+    sys.stdin.readline()
+    kb = memory_kb()
+    print(kb["Rss"], kb["Pss"], flush=True)
+
+
+def measure_workers(mode: str, directory: str, count: int):
+    procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__), "--worker", mode, directory],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True) for _ in range(count)]
+    for proc in procs:
+        proc.stdout.readline()
+    for proc in procs:
+        proc.stdin.write("\n")
+        proc.stdin.flush()
+    rss, pss = zip(*(map(int, proc.stdout.readline().split()) for proc in procs))
+    for proc in procs:
+        proc.wait()
+    print(f"  {mode:<8} {count} workers   RSS {statistics.mean(rss) / 1024:7.1f} MB/worker"
+          f"   PSS {statistics.mean(pss) / 1024:7.1f} MB/worker   total PSS {sum(pss) / 1024:7.1f} MB")
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 멘토 카탈로그 지연 시간 / 워커 메모리")
+    parser.add_argument("--mentors", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--worker", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return worker(*args.worker)
+
+    directory = tempfile.mkdtemp(prefix="catalog-bench-")
+    try:
+        mentors, _ = make_users(args.mentors * 5, "hashed")
+        mentors = mentors[:args.mentors]
+        users, _ = create_stores("sqlite", os.path.join(directory, "app.db"))
+        users.insert_many(mentors)
+        memory = UserStore()
+        memory.insert_many(mentors)
+        cache = ProfileFragmentCache(max_size=len(mentors))
+
+        catalog = MentorCatalog(lambda: users.iter_role("mentor"), directory)
+        started = time.perf_counter()
+        version = catalog.publish()
+        size = os.path.getsize(os.path.join(directory, f"catalog-{version:012d}.bin")) / 2**20
+        print(f"mentors {args.mentors}   publish {time.perf_counter() - started:.2f}s   {size:.1f} MB")
+        snapshot = catalog.current()
+
+        paths = {
+            "sqlite": lambda q: [cache.fragment(m) for m in users.mentors.page(**q)[0]],
+            "memory": lambda q: [cache.fragment(m) for m in memory.mentors.page(**q)[0]],
+            "catalog": lambda q: snapshot.page(**q)[0],
+        }
+        print(f"{'query':<14}" + "".join(f"{name:>12}" for name in paths) + "   (median ms)")
+        for label, query in QUERIES.items():
+            results = {name: timed(lambda: fn(query), args.repeat) for name, fn in paths.items()}
+            print(f"{label:<14}" + "".join(f"{results[name] * 1000:12.3f}" for name in paths))
+        users.db.close()
+        del memory, cache
+
+        print("memory")
+        for mode in ("store", "catalog"):
+            measure_workers(mode, directory, args.workers)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
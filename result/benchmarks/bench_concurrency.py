@@ -0,0 +1,75 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import store
+from store import UserStore, MatchRequestStore
+
+# --- 동시성 스트레스 벤치마크 ---
+# 여러 스레드가 가입(create)과 매칭 요청 상태 변경(update)을 동시에 수행한 뒤
+# 중복 id/유실된 변경이 없는지 확인하고, 스트라이프 락과 전역 락(스트라이프 1개)의 처리량을 비교한다.
+# --hold-us 만큼 락을 잡은 채 기다려 실제 저장소 I/O 같은 임계 구역 비용을 흉내 낸다.
+
+
+def run(stripes: int, threads: int, ops: int, hold_us: int, keys: int) -> dict:
+    users, matches = UserStore(stripes), MatchRequestStore(stripes)
+    for _ in range(keys):
+        matches.create(lambda id: {"id": id, "mentorId": 1, "menteeId": 2, "message": "0", "status": "pending"})
+    hold = hold_us / 1_000_000
+
+    def bump(match: dict):
+        if hold:
+            time.sleep(hold)
+        match["message"] = str(int(match["message"]) + 1)
+
+    def worker(n: int):
+        for i in range(ops):
+            email = f"t{n}-{i}@example.com"
+            users.create(email, lambda id: {
+                "id": id, "email": email, "hashed_password": "", "name": email, "role": "mentee",
+                "profile": {"name": email, "bio": "", "imageUrl": f"/images/mentee/{id}", "skills": None},
+            })
+            matches.update((n * ops + i) % keys + 1, bump)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+
+    total = threads * ops
+    ids = [u["id"] for u in users.values()]
+    updates = sum(int(m["message"]) for m in matches.values())
+    return {
+        "stripes": stripes,
+        "ops": total,
+        "seconds": elapsed,
+        "ops_per_sec": total / elapsed,
+        "duplicate_ids": len(ids) - len(set(ids)),
+        "lost_updates": total - updates,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장소 동시 변경 스트레스 벤치마크")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=200, help="스레드당 가입+상태 변경 횟수")
+    parser.add_argument("--hold-us", type=int, default=200, help="임계 구역에서 락을 잡고 있는 시간(마이크로초)")
+    parser.add_argument("--keys", type=int, default=256, help="변경 대상 매칭 요청 수")
+    parser.add_argument("--stripes", type=int, default=store.LOCK_STRIPES)
+    args = parser.parse_args()
+
+    failed = False
+    for stripes in (1, args.stripes):
+        result = run(stripes, args.threads, args.ops, args.hold_us, args.keys)
+        print("stripes={stripes:<4} ops={ops:<7} {seconds:7.3f}s {ops_per_sec:10.0f} ops/s "
+              "duplicate_ids={duplicate_ids} lost_updates={lost_updates}".format(**result))
+        failed = failed or result["duplicate_ids"] or result["lost_updates"]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+RESULT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RESULT_DIR)
+
+import orjson
+
+import manage
+from datasets import iter_matches, make_users
+from passwords import hash_password
+from store import create_stores
+
+# --- 대량 가져오기/내보내기 벤치마크 ---
+# 합성 유저(해시 완료)/매칭 요청 NDJSON을 만든 뒤 manage.py로 sqlite와 메모리+저널 백엔드에 가져오고 다시 내보내
+# 행/초를 잰다. 비교용으로 sqlite에 한 건씩 트랜잭션으로 넣는 경로(가입 API의 저장 방식)와
+# 평문 비밀번호 해시를 프로세스 1개 / --workers개로 나눠 처리하는 시간도 잰다.
+
+
+def write_inputs(directory: str, users: int, matches: int):
+    mentors, mentees = make_users(users, hash_password("benchmark", 4))
+    users_path, matches_path = os.path.join(directory, "users.ndjson"), os.path.join(directory, "matches.ndjson")
+    with open(users_path, "wb") as f:
+        for user in mentors + mentees:
+            f.write(orjson.dumps(manage.user_to_row(user)) + b"\n")
+    with open(matches_path, "wb") as f:
+        for match in iter_matches(matches, [m["id"] for m in mentors], [m["id"] for m in mentees]):
+            del match["id"]
+            f.write(orjson.dumps(match) + b"\n")
+    return users_path, matches_path
+
+
+def timed(label: str, rows: int, fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed:8.2f}s  {rows / elapsed:10.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="manage.py 가져오기/내보내기 처리량")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--single", type=int, default=5_000, help="한 건씩 넣는 비교 경로의 유저 수")
+    parser.add_argument("--plain", type=int, default=32, help="해시 비교에 쓸 평문 비밀번호 수 (BCRYPT_ROUNDS 적용)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix="import-bench-")
+    rows = args.users + args.matches
+    try:
+        users_path, matches_path = write_inputs(directory, args.users, args.matches)
+        print(f"users {args.users}, matches {args.matches}")
+        for backend, options in (
+            ("sqlite", ["--backend", "sqlite", "--sqlite-path", os.path.join(directory, "app.db")]),
+            ("memory+journal", ["--backend", "memory", "--journal", "--journal-dir", os.path.join(directory, "journal")]),
+        ):
+            timed(f"import {backend}", rows, lambda: manage.main(
+                options + ["import", "--users", users_path, "--matches", matches_path]))
+            timed(f"export {backend}", rows, lambda: manage.main(options + [
+                "export", "--users", os.path.join(directory, "out-users.ndjson"),
+                "--matches", os.path.join(directory, "out-matches.csv")]))
+
+        users, _ = create_stores("sqlite", os.path.join(directory, "single.db"))
+        single = sum(make_users(args.single, "hashed"), [])
+        timed("sqlite one row per transaction", len(single), lambda: [
+            users.create(u["email"], lambda user_id, u=u: dict(u, id=user_id)) for u in single])
+        users.db.close()
+
+        passwords = [f"password-{i}" for i in range(args.plain)]
+        for workers in (1, args.workers):
+            importer = manage.Importer(None, None, workers=workers)
+            timed(f"bcrypt {args.plain} passwords, {workers} procs", args.plain, lambda: importer.hash_passwords(passwords))
+            importer.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
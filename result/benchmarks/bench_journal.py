@@ -0,0 +1,127 @@
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datasets import DATASETS, seed_stores
+from journal import Journal
+from store import MatchRequestStore, UserStore
+
+# --- 저널 / 스냅샷 벤치마크 ---
+# 1) 합성 데이터셋을 저널을 켠 저장소에 적재해 기록 처리량(요청 스레드 기준)과 디스크에 내려가기까지의 시간
+# 2) 여러 스레드가 매칭 요청 상태를 바꿀 때 저널 유무에 따른 변경 지연 시간
+# 3) 저널만으로 복구, 스냅샷을 만든 뒤 스냅샷으로 복구하는 시간과 파일 크기
+STATUSES = ("pending", "accepted", "rejected", "cancelled")
+
+
+def dir_size(directory: str) -> float:
+    return sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)) / 2**20
+
+
+def open_journal(directory: str, args) -> Journal:
+    return Journal(directory, commit_interval_ms=args.commit_ms, fsync=not args.no_fsync, snapshot_interval=0)
+
+
+def update_load(matches: MatchRequestStore, count: int, threads: int, ops: int) -> list:
+    # 스레드마다 임의의 매칭 요청 상태를 ops번 바꾸고 변경 한 번의 지연 시간(초)을 모은다
+    samples = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        local = []
+        for _ in range(ops):
+            match_id, status = rng.randint(1, count), rng.choice(STATUSES)
+            start = time.perf_counter()
+            matches.update(match_id, lambda m: m.update(status=status))
+            local.append(time.perf_counter() - start)
+        samples.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return samples
+
+
+def report_updates(label: str, samples: list, elapsed: float):
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"  {label:<10} {len(samples) / elapsed:10.0f} ops/s   p50 {statistics.median(samples) * 1e6:6.1f} us"
+          f"   p99 {p99 * 1e6:7.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저널 기록 처리량 / 복구 시간")
+    parser.add_argument("--dataset", choices=DATASETS, default="100k")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--matches", type=int)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=20_000, help="스레드당 상태 변경 수")
+    parser.add_argument("--commit-ms", type=float, default=5)
+    parser.add_argument("--no-fsync", action="store_true")
+    parser.add_argument("--dir", help="저널 디렉터리 (기본: 임시 디렉터리)")
+    args = parser.parse_args()
+    users_count, matches_count = DATASETS[args.dataset]
+    users_count, matches_count = args.users or users_count, args.matches or matches_count
+    directory = args.dir or tempfile.mkdtemp(prefix="journal-bench-")
+    os.makedirs(directory, exist_ok=True)
+
+    try:
+        print(f"users {users_count}, matches {matches_count}, fsync {'off' if args.no_fsync else 'on'}, "
+              f"commit {args.commit_ms} ms, dir {directory}")
+        users, matches = UserStore(), MatchRequestStore()
+        journal = open_journal(directory, args).open(users, matches)
+        started = time.perf_counter()
+        seed_stores(users, matches, users_count, matches_count)
+        appended = time.perf_counter() - started
+        journal.flush()
+        durable = time.perf_counter() - started
+        records = journal.durable
+        print(f"load      {records} records  appended {records / appended:9.0f} rec/s"
+              f"   durable after {durable:.2f}s ({records / durable:.0f} rec/s)   {dir_size(directory):.0f} MB")
+
+        print(f"updates   {args.threads} threads x {args.updates}")
+        baseline_matches = MatchRequestStore()
+        baseline_matches.insert_many(matches.records())
+        for label, store in (("no journal", baseline_matches), ("journal", matches)):
+            started = time.perf_counter()
+            samples = update_load(store, matches_count, args.threads, args.updates)
+            report_updates(label, samples, time.perf_counter() - started)
+        del baseline_matches
+        started = time.perf_counter()
+        journal.flush()
+        print(f"  flush after updates {time.perf_counter() - started:.3f}s")
+        journal.close()
+
+        users, matches = UserStore(), MatchRequestStore()
+        started = time.perf_counter()
+        journal = open_journal(directory, args).open(users, matches)
+        print(f"recover   journal only   {time.perf_counter() - started:7.2f}s"
+              f"   ({journal.recovered.records} records -> {len(users)} users, {len(matches)} matches)")
+        started = time.perf_counter()
+        journal.snapshot()
+        print(f"snapshot  {time.perf_counter() - started:7.2f}s   {dir_size(directory):.0f} MB")
+        journal.close()
+        del users, matches
+
+        users, matches = UserStore(), MatchRequestStore()
+        started = time.perf_counter()
+        journal = open_journal(directory, args).open(users, matches)
+        print(f"recover   snapshot       {time.perf_counter() - started:7.2f}s"
+              f"   ({journal.recovered.records} records -> {len(users)} users, {len(matches)} matches)")
+        journal.close()
+    finally:
+        if not args.dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
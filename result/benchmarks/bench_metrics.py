@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import MetricsMiddleware, profiler, span, spans
+
+# --- 메트릭 미들웨어 오버헤드 벤치마크 ---
+# 아무 일도 하지 않는 ASGI 앱을 미들웨어 없이/메트릭만/메트릭+span/메트릭+프로파일러로 감싸
+# 요청당 추가 비용(µs)을 비교한다. 실제 핸들러 비용이 빠지므로 순수 계측 오버헤드만 남는다.
+
+
+class FakeRoute:
+    path = "/api/mentors"
+
+
+async def noop_app(scope, receive, send):
+    scope["route"] = FakeRoute
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def span_app(scope, receive, send):
+    with span("serialize"):
+        await noop_app(scope, receive, send)
+
+
+async def run(app, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/api/mentors"}, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메트릭 미들웨어 오버헤드")
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    baseline = asyncio.run(run(noop_app, args.requests))
+    print(f"{'no middleware':<20} {baseline * 1e6:7.2f} µs")
+    spans.enabled = True
+    cases = (
+        ("metrics", MetricsMiddleware(noop_app), False),
+        ("metrics + span", MetricsMiddleware(span_app), False),
+        ("metrics + profiler", MetricsMiddleware(noop_app), True),
+    )
+    for name, app, profile in cases:
+        if profile:
+            profiler.slow_ms = float("inf")
+            profiler.start()
+        try:
+            elapsed = asyncio.run(run(app, args.requests))
+        finally:
+            profiler.stop()
+        print(f"{name:<20} {elapsed * 1e6:7.2f} µs  (+{(elapsed - baseline) * 1e6:.2f} µs/req)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datasets import SKILLS
+from recommend import MentorRecommender
+from store import MatchRequestStore, UserStore
+
+# --- 멘토 추천 벤치마크 ---
+# 멘토 N명(스킬 1~4개)과 수락된 매칭 일부를 만든 뒤 행렬 생성 시간, 추천 질의 지연 시간,
+# 프로필 변경 한 건의 증분 갱신 시간을 잰다.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멘토 추천 질의 지연 시간")
+    parser.add_argument("--mentors", type=int, default=100_000)
+    parser.add_argument("--extra-skills", type=int, default=2000, help="공통 스킬 외에 섞을 희귀 스킬 수")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocab = SKILLS + [f"skill-{i}" for i in range(args.extra_skills)]
+    users, matches = UserStore(), MatchRequestStore()
+    users.insert_many({
+        "id": i, "email": f"m{i}@bench.example.com", "hashed_password": "", "name": f"m{i}", "role": "mentor",
+        "profile": {"name": f"m{i}", "bio": "", "imageUrl": "", "skills": rng.sample(vocab[:40] if i % 2 else vocab, rng.randint(1, 4))},
+    } for i in range(1, args.mentors + 1))
+    matches.insert_many({"id": i, "mentorId": rng.randint(1, args.mentors), "menteeId": 0, "message": "", "status": "accepted"}
+                        for i in range(1, args.mentors // 10 + 1))
+    recommender = MentorRecommender(lambda: (users.iter_role("mentor"), matches.iter_status("accepted")))
+    users.subscribe(recommender.on_user_event)
+
+    started = time.perf_counter()
+    recommender.ensure_built()
+    print(f"build            {(time.perf_counter() - started) * 1000:8.1f} ms  ({len(recommender)} mentors, {len(vocab)} skills)")
+
+    latencies = []
+    for _ in range(args.queries):
+        skills = rng.sample(vocab[:40], rng.randint(1, 5))
+        started = time.perf_counter()
+        recommender.recommend(skills, bio="백엔드 Python 개발과 Kubernetes 운영을 배우고 싶습니다", limit=10)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    print(f"recommend        p50={statistics.median(latencies) * 1000:6.2f} ms  "
+          f"p95={latencies[int(len(latencies) * 0.95)] * 1000:6.2f} ms")
+
+    started = time.perf_counter()
+    for i in range(1, 1001):
+        users.update(f"m{i}@bench.example.com", lambda u: u["profile"].update(skills=rng.sample(vocab, 3)))
+    print(f"profile update   {(time.perf_counter() - started) * 1000:8.3f} µs/update (store + index)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datasets import SKILLS
+from search import MentorSearchIndex
+
+# --- 멘토 전문 검색 벤치마크 ---
+# 멘토 수를 늘려 가며 역색인(BM25) 질의와 소개글 전체를 훑는 부분 문자열 검색의 지연 시간을 비교한다.
+# 이름은 유일에 가까운 토큰을 섞어 결과 수가 멘토 수와 함께 늘지 않는 질의(이름/희귀어)와
+# 결과 수가 멘토 수에 비례하는 흔한 단어 질의를 나눠 본다.
+KOREAN_WORDS = ["백엔드", "프론트엔드", "개발", "운영", "데이터", "분석", "설계", "경험", "멘토링", "서비스",
+                "스타트업", "대규모", "트래픽", "클라우드", "인프라", "모바일", "보안", "테스트", "자동화", "협업"]
+ENGLISH_WORDS = ["backend", "frontend", "developer", "engineer", "platform", "distributed", "systems", "design",
+                 "mentor", "startup", "cloud", "mobile", "security", "testing", "automation", "architecture"]
+SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+SYLLABLES = "민서지현우준도윤하은채수아예진시연유나건호성재태영"
+QUERIES = {
+    "name": lambda rng, n: f"멘토{rng.randrange(n)}",
+    "name_prefix": lambda rng, n: f"mentor{rng.randrange(n)}"[:-1],
+    "rare_word": lambda rng, n: f"topic{rng.randrange(200)}",
+    "common_ko": lambda rng, n: "백엔드 개발",
+    "common_prefix": lambda rng, n: "reac",
+}
+
+
+def make_mentor(i: int, rng: random.Random) -> dict:
+    name = rng.choice(SURNAMES) + "".join(rng.sample(SYLLABLES, 2))
+    words = rng.choices(KOREAN_WORDS + ENGLISH_WORDS, k=12) + [f"멘토{i}", f"mentor{i}"]
+    # 희귀어는 멘토 수와 관계없이 약 200명 중 1명꼴이 아니라 고정된 수만 갖도록 앞쪽 멘토에만 넣는다
+    if i < 2000:
+        words.append(f"topic{i % 200}")
+    rng.shuffle(words)
+    return {
+        "id": i, "email": f"m{i}@bench.example.com", "name": name, "role": "mentor",
+        "profile": {"name": name, "bio": " ".join(words), "imageUrl": "", "skills": rng.sample(SKILLS, rng.randint(1, 4))},
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멘토 전문 검색 지연 시간")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mentors':>8} {'build':>9}  " + "  ".join(f"{name:>20}" for name in QUERIES) + f"  {'scan (substring)':>17}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        rng = random.Random(args.seed)
+        mentors = [make_mentor(i, rng) for i in range(size)]
+        index = MentorSearchIndex(lambda: mentors)
+        started = time.perf_counter()
+        index.ensure_built()
+        build = time.perf_counter() - started
+
+        cells = []
+        for name, make_query in QUERIES.items():
+            queries = [make_query(rng, size) for _ in range(args.repeat)]
+            it = iter(queries)
+            hits = len(index.search(queries[0]))
+            latency = timed(lambda: index.search(next(it)), args.repeat)
+            cells.append(f"{latency * 1000:8.3f} ms ({hits:>6})")
+        needle = "백엔드"
+        scan = timed(lambda: [m for m in mentors if needle in m["profile"]["bio"]], 5)
+        print(f"{size:>8} {build:8.2f}s  " + "  ".join(f"{c:>20}" for c in cells) + f"  {scan * 1000:14.2f} ms")
+    print("(괄호 안은 결과 수)")
+
+
+if __name__ == "__main__":
+    main()
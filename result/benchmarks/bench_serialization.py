@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from main import MentorProfile, MentorProfileDetails
+from serialization import ProfileFragmentCache, json_array
+
+# --- 멘토 목록 직렬화 벤치마크 ---
+# 항목마다 Pydantic 모델을 만들고 jsonable_encoder + JSONResponse로 인코딩하던 방식과
+# 캐시된 유저별 orjson 조각을 이어 붙이는 방식을 같은 멘토 목록으로 비교한다.
+
+
+def make_mentors(count: int) -> list:
+    return [{
+        "id": i, "email": f"mentor{i}@example.com", "hashed_password": "", "name": f"멘토{i}", "role": "mentor",
+        "profile": {"name": f"멘토{i}", "bio": "소개 " * 20, "imageUrl": f"/images/mentor/{i}",
+                    "skills": ["Python", "FastAPI", "React"]},
+    } for i in range(1, count + 1)]
+
+
+def pydantic_body(mentors: list) -> bytes:
+    models = [MentorProfile(
+        id=m["id"],
+        email=m["email"],
+        role="mentor",
+        profile=MentorProfileDetails(
+            name=m["profile"]["name"],
+            bio=m["profile"].get("bio", ""),
+            imageUrl=m["profile"].get("imageUrl", ""),
+            skills=m["profile"].get("skills", []),
+        ),
+    ) for m in mentors]
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="멘토 목록 직렬화 비교")
+    parser.add_argument("--mentors", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    mentors = make_mentors(args.mentors)
+    cache = ProfileFragmentCache()
+    cold = lambda: json_array(map(ProfileFragmentCache().fragment, mentors))
+    warm = lambda: json_array(map(cache.fragment, mentors))
+    warm()
+
+    baseline = timed(lambda: pydantic_body(mentors), args.repeat)
+    print(f"pydantic        {baseline * 1000:8.2f} ms")
+    for name, fn in (("orjson (cold)", cold), ("orjson (cached)", warm)):
+        elapsed = timed(fn, args.repeat)
+        print(f"{name:<15} {elapsed * 1000:8.2f} ms  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RESULT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RESULT_DIR)
+
+# --- 기동 시간 벤치마크 ---
+# 매번 새 인터프리터에서 main을 import하고, 앱을 기동한 뒤 주요 요청의 첫 호출(지연 로딩 포함)과
+# 두 번째 호출 지연 시간을 잰다. --runs번 반복해 중앙값을 출력한다.
+HEAVY_MODULES = ("PIL", "passlib", "bcrypt", "jose", "email_validator")
+
+
+def child(image_path: str):
+    started = time.perf_counter()
+    import main
+    import_ms = (time.perf_counter() - started) * 1000
+    import resource
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    from fastapi.testclient import TestClient
+
+    # 업로드 이미지는 부모 프로세스가 만든다 (여기서 Pillow를 불러오면 첫 업로드의 지연 로딩 비용이 빠진다)
+    with open(image_path, "rb") as f:
+        png = f.read()
+
+    timings = {}
+
+    def timed(name, fn):
+        for attempt in ("first", "second"):
+            start = time.perf_counter()
+            res = fn()
+            timings.setdefault(name, {})[attempt] = round((time.perf_counter() - start) * 1000, 3)
+            assert res.status_code < 400, (name, res.status_code, res.text)
+
+    started = time.perf_counter()
+    with TestClient(main.app) as client:
+        timings["startup"] = {"first": round((time.perf_counter() - started) * 1000, 3)}
+        emails = iter(f"startup{i}@example.com" for i in range(2))
+        timed("openapi", lambda: client.get("/openapi.json"))
+        timed("signup", lambda: client.post("/api/signup", json={
+            "email": next(emails), "password": "pw", "name": "s", "role": "mentor"}))
+        timed("login", lambda: client.post("/api/login", data={"username": "startup0@example.com", "password": "pw"}))
+        headers = {"Authorization": f"Bearer {client.post('/api/login', data={'username': 'startup0@example.com', 'password': 'pw'}).json()['token']}"}
+        main.token_cache.clear()
+        timed("me", lambda: client.get("/api/me", headers=headers))
+        timed("profile_image", lambda: client.put(
+            "/api/profile/image", headers=headers, files={"image": ("a.png", png, "image/png")}))
+    print(json.dumps({"import_ms": round(import_ms, 3), "rss_mb": round(rss_mb, 1), "loaded": loaded,
+                      "timings": timings}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기동 시간 / 첫 요청 지연 시간")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", metavar="IMAGE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    from PIL import Image
+
+    env = dict(os.environ, RATE_LIMIT_ENABLED="0")
+    runs = []
+    with tempfile.NamedTemporaryFile(suffix=".png") as image:
+        Image.new("RGB", (512, 512), "white").save(image, "PNG")
+        image.flush()
+        for _ in range(args.runs):
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", image.name], cwd=RESULT_DIR,
+                                 env=env, capture_output=True, text=True, check=True)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    median = lambda values: statistics.median(values)
+    print(f"import main      {median([r['import_ms'] for r in runs]):8.1f} ms   "
+          f"max RSS {median([r['rss_mb'] for r in runs]):.1f} MB   loaded: {', '.join(runs[0]['loaded']) or '-'}")
+    for name in runs[0]["timings"]:
+        first = median([r["timings"][name]["first"] for r in runs])
+        line = f"{name:<16} {first:8.1f} ms"
+        if "second" in runs[0]["timings"][name]:
+            line += f"   (second {median([r['timings'][name]['second'] for r in runs]):.1f} ms)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
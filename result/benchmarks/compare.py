@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+
+# --- 벤치마크 결과 비교 ---
+# suite.py가 저장한 두 결과 파일을 시나리오별로 비교하고,
+# 지연 시간(기본 p95)이 threshold 이상 늘거나 처리량이 그만큼 줄면 회귀로 보고 종료 코드 1을 돌려준다.
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(base: float, new: float) -> float:
+    return (new - base) / base * 100 if base else 0.0
+
+
+def describe(meta: dict) -> str:
+    dataset = meta.get("dataset", {})
+    commit = (meta.get("commit") or "nogit")[:8] + ("+dirty" if meta.get("dirty") else "")
+    return (f"{commit} {meta.get('timestamp', '')} {meta.get('target')}/{meta.get('storage')}/{meta.get('api_mode')} "
+            f"users={dataset.get('users')} matches={dataset.get('matches')} concurrency={meta.get('concurrency')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms"])
+    parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 볼 변화율(%%)")
+    args = parser.parse_args()
+
+    base, new = load(args.baseline), load(args.candidate)
+    print(f"baseline : {describe(base['meta'])}")
+    print(f"candidate: {describe(new['meta'])}")
+    if base["meta"].get("dataset", {}).get("users") != new["meta"].get("dataset", {}).get("users"):
+        print("warning: datasets differ")
+
+    regressions = []
+    print(f"\n{'scenario':<16} {'rps':>21} {'change':>8}   {args.metric:>21} {'change':>8}")
+    for name, result in new["results"].items():
+        before = base["results"].get(name)
+        if before is None:
+            print(f"{name:<16} (new)")
+            continue
+        rps_change = change(before["rps"], result["rps"])
+        latency_change = change(before[args.metric], result[args.metric])
+        regressed = latency_change > args.threshold or rps_change < -args.threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<16} {before['rps']:>10.1f}→{result['rps']:<10.1f} {rps_change:+7.1f}%   "
+              f"{before[args.metric]:>10.2f}→{result[args.metric]:<10.2f} {latency_change:+7.1f}%"
+              f"{'  REGRESSION' if regressed else ''}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import random
+from typing import Iterator, List, Tuple
+
+from passwords import hash_password
+
+# --- 벤치마크용 합성 데이터셋 ---
+# 이름 -> (유저 수, 매칭 요청 수). 유저의 20%는 멘토, 나머지는 멘티다.
+DATASETS = {
+    "1k": (1_000, 20_000),
+    "10k": (10_000, 200_000),
+    "100k": (100_000, 2_000_000),
+}
+MENTOR_RATIO = 0.2
+PASSWORD = "benchmark-password"
+SKILLS = [
+    "Python", "FastAPI", "Django", "Flask", "React", "Vue", "Svelte", "Angular", "TypeScript", "JavaScript",
+    "Go", "Rust", "Java", "Kotlin", "Spring", "Swift", "iOS", "Android", "Flutter", "SQL",
+    "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes", "AWS", "GCP", "ML", "PyTorch", "데이터분석",
+]
+STATUSES = ["pending"] * 5 + ["accepted"] * 3 + ["rejected", "cancelled"]
+BATCH_SIZE = 10_000
+
+
+def mentor_email(i: int) -> str:
+    return f"mentor{i}@bench.example.com"
+
+
+def mentee_email(i: int) -> str:
+    return f"mentee{i}@bench.example.com"
+
+
+def make_users(count: int, hashed_password: str, seed: int = 0) -> Tuple[List[dict], List[dict]]:
+    # (멘토 목록, 멘티 목록). id는 멘토부터 1..count 순서로 붙는다.
+    rng = random.Random(seed)
+    mentor_count = max(1, int(count * MENTOR_RATIO))
+    mentors, mentees = [], []
+    for i in range(count):
+        user_id = i + 1
+        if i < mentor_count:
+            role, email = "mentor", mentor_email(user_id)
+            skills = rng.sample(SKILLS, rng.randint(1, 4))
+        else:
+            role, email = "mentee", mentee_email(user_id)
+            skills = None
+        name = f"{role}-{rng.randrange(10**6):06d}"
+        user = {
+            "id": user_id,
+            "email": email,
+            "hashed_password": hashed_password,
+            "name": name,
+            "role": role,
+            "profile": {"name": name, "bio": "벤치마크 유저 " * 5, "imageUrl": f"/images/{role}/{user_id}", "skills": skills},
+        }
+        (mentors if role == "mentor" else mentees).append(user)
+    return mentors, mentees
+
+
+def iter_matches(count: int, mentor_ids: List[int], mentee_ids: List[int], seed: int = 0) -> Iterator[dict]:
+    # 인기 멘토에 요청이 몰리도록 앞쪽 멘토를 더 자주 고른다 (받은 요청함 편차 재현)
+    rng = random.Random(seed + 1)
+    for match_id in range(1, count + 1):
+        mentor = mentor_ids[min(int(rng.paretovariate(1.2)) - 1, len(mentor_ids) - 1)]
+        yield {
+            "id": match_id,
+            "mentorId": mentor,
+            "menteeId": rng.choice(mentee_ids),
+            "message": f"요청 {match_id}",
+            "status": rng.choice(STATUSES),
+        }
+
+
+def seed_stores(users_store, matches_store, users: int, matches: int, seed: int = 0) -> dict:
+    # 비밀번호 해시는 한 번만 만들어 모든 유저가 공유한다 (로그인 벤치마크는 실제 bcrypt 비용을 그대로 잰다)
+    hashed_password = hash_password(PASSWORD)
+    mentors, mentees = make_users(users, hashed_password, seed)
+    all_users = mentors + mentees
+    for start in range(0, len(all_users), BATCH_SIZE):
+        users_store.insert_many(all_users[start:start + BATCH_SIZE])
+    mentor_ids, mentee_ids = [m["id"] for m in mentors], [m["id"] for m in mentees]
+    batch = []
+    for match in iter_matches(matches, mentor_ids, mentee_ids, seed):
+        batch.append(match)
+        if len(batch) >= BATCH_SIZE:
+            matches_store.insert_many(batch)
+            batch = []
+    if batch:
+        matches_store.insert_many(batch)
+    return {
+        "users": users,
+        "mentors": len(mentors),
+        "mentees": len(mentees),
+        "matches": matches,
+        # 요청이 가장 많이 몰리는 멘토와 임의의 멘티를 대표 유저로 사용
+        "busy_mentor": {"id": mentor_ids[0], "email": mentors[0]["email"]},
+        "mentee": {"id": mentee_ids[0], "email": mentees[0]["email"]},
+    }
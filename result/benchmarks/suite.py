@@ -0,0 +1,278 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Callable, Dict, List, Optional
+
+RESULT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RESULT_DIR)
+
+import httpx
+from PIL import Image
+
+from datasets import DATASETS, PASSWORD, seed_stores
+
+# --- API 핫패스 벤치마크 스위트 ---
+# 합성 데이터셋을 시드한 뒤 ASGI 앱을 프로세스 안에서(httpx ASGITransport) 또는 로컬 uvicorn으로 띄워
+# 엔드포인트별 처리량과 p50/p95/p99 지연 시간을 재고, 커밋 간 비교할 수 있도록 JSON 파일로 저장한다.
+# 비교는 benchmarks/compare.py로 한다.
+
+
+# path/data의 {이름}은 prepare()가 만든 컨텍스트 값으로 치환된다.
+class Scenario:
+    def __init__(self, name: str, method: str, path: str, user: Optional[str] = "mentee",
+                 data: Optional[dict] = None, conditional: bool = False):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.user = user
+        self.data = data
+        self.conditional = conditional
+
+    def request(self, client: httpx.AsyncClient, ctx: dict):
+        headers = {}
+        if self.user:
+            headers["Authorization"] = f"Bearer {ctx['tokens'][self.user]}"
+        if self.conditional:
+            headers["If-None-Match"] = ctx["etags"][self.user]
+        data = {key: value.format(**ctx) for key, value in self.data.items()} if self.data else None
+        return client.request(self.method, self.path.format(**ctx), headers=headers, data=data)
+
+
+SCENARIOS = [
+    Scenario("login", "POST", "/api/login", user=None, data={"username": "{mentee_email}", "password": PASSWORD}),
+    Scenario("me", "GET", "/api/me"),
+    Scenario("me_not_modified", "GET", "/api/me", conditional=True),
+    Scenario("mentors_page", "GET", "/api/mentors?limit=50"),
+    Scenario("mentors_skill", "GET", "/api/mentors?skill=Python,Go&order_by=name&limit=50"),
+    Scenario("mentors_all", "GET", "/api/mentors"),
+    Scenario("image_thumbnail", "GET", "/api/images/mentor/{busy_mentor_id}?size=128"),
+    Scenario("image_webp", "GET", "/api/images/mentor/{busy_mentor_id}?size=256&format=webp"),
+    Scenario("inbox", "GET", "/api/match-requests/incoming?limit=50", user="mentor"),
+    Scenario("inbox_pending", "GET", "/api/match-requests/incoming?status=pending&limit=50", user="mentor"),
+    Scenario("outbox", "GET", "/api/match-requests/outgoing?limit=50"),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # nearest-rank 방식
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def sample_png(size: int = 512) -> bytes:
+    buf = BytesIO()
+    Image.effect_noise((size, size), 64).convert("RGB").save(buf, "PNG")
+    return buf.getvalue()
+
+
+async def prepare(client: httpx.AsyncClient, dataset: dict) -> dict:
+    # 대표 유저로 로그인하고, 이미지 조회용으로 멘토 프로필 이미지를 하나 올린다
+    ctx = {
+        "busy_mentor_id": dataset["busy_mentor"]["id"],
+        "mentee_email": dataset["mentee"]["email"],
+        "tokens": {},
+        "etags": {},
+    }
+    for user in ("mentor", "mentee"):
+        email = dataset["busy_mentor" if user == "mentor" else "mentee"]["email"]
+        res = await client.post("/api/login", data={"username": email, "password": PASSWORD})
+        res.raise_for_status()
+        ctx["tokens"][user] = res.json()["token"]
+        me = await client.get("/api/me", headers={"Authorization": f"Bearer {ctx['tokens'][user]}"})
+        ctx["etags"][user] = me.headers.get("ETag", "")
+    res = await client.put(
+        "/api/profile/image",
+        headers={"Authorization": f"Bearer {ctx['tokens']['mentor']}"},
+        files={"image": ("bench.png", sample_png(), "image/png")},
+    )
+    res.raise_for_status()
+    return ctx
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, ctx: dict, requests: int,
+                       concurrency: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        await scenario.request(client, ctx)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            res = await scenario.request(client, ctx)
+            latencies.append(time.perf_counter() - start)
+            if res.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run_all(client: httpx.AsyncClient, dataset: dict, scenarios: List[Scenario], args) -> Dict[str, dict]:
+    ctx = await prepare(client, dataset)
+    results = {}
+    for scenario in scenarios:
+        # 로그인은 bcrypt 비용 때문에 요청 수를 줄인다
+        requests = max(1, args.requests // 10) if scenario.name == "login" else args.requests
+        results[scenario.name] = await run_scenario(client, scenario, ctx, requests, args.concurrency, args.warmup)
+        r = results[scenario.name]
+        print(f"{scenario.name:<16} {r['rps']:9.1f} req/s  p50={r['p50_ms']:8.2f}ms  p95={r['p95_ms']:8.2f}ms  "
+              f"p99={r['p99_ms']:8.2f}ms  errors={r['errors']}", flush=True)
+    return results
+
+
+def configure_env(args, db_path: Optional[str]):
+    os.environ["API_MODE"] = args.api_mode
+    os.environ["STORAGE_BACKEND"] = args.storage
+    # 로그인 처리량을 재야 하므로 요청 제한은 끈다
+    os.environ["RATE_LIMIT_ENABLED"] = "0"
+    if db_path:
+        os.environ["SQLITE_PATH"] = db_path
+
+
+async def run_inprocess(args, scenarios: List[Scenario], db_path: Optional[str]):
+    configure_env(args, db_path)
+    import main  # 환경 변수를 정한 뒤에 불러와야 저장소/모드 설정이 반영된다
+
+    started = time.perf_counter()
+    dataset = seed_stores(main.fake_users_db, main.fake_match_requests, args.users, args.matches, args.seed)
+    dataset["seed_seconds"] = round(time.perf_counter() - started, 2)
+    print(f"seeded {args.users} users / {args.matches} match requests in {dataset['seed_seconds']}s", flush=True)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        results = await run_all(client, dataset, scenarios, args)
+    main.password_hasher.shutdown()
+    return dataset, results
+
+
+async def run_uvicorn(args, scenarios: List[Scenario], db_path: str):
+    # 서버 프로세스와 상태를 공유하도록 sqlite 파일에 먼저 시드한다
+    from store import create_stores
+    users, matches = create_stores("sqlite", db_path)
+    started = time.perf_counter()
+    dataset = seed_stores(users, matches, args.users, args.matches, args.seed)
+    dataset["seed_seconds"] = round(time.perf_counter() - started, 2)
+    users.db.close()
+    print(f"seeded {args.users} users / {args.matches} match requests in {dataset['seed_seconds']}s", flush=True)
+
+    configure_env(args, db_path)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--workers", str(args.workers),
+         "--log-level", "warning"],
+        cwd=RESULT_DIR, env=dict(os.environ),
+    )
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=None) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    await client.get("/openapi.json")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise
+                    await asyncio.sleep(0.2)
+            results = await run_all(client, dataset, scenarios, args)
+    finally:
+        server.terminate()
+        server.wait()
+    return dataset, results
+
+
+def git_commit() -> Dict[str, object]:
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=RESULT_DIR, text=True).strip()
+        dirty = bool(subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                             cwd=RESULT_DIR, text=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 핫패스 벤치마크 스위트")
+    parser.add_argument("--dataset", choices=sorted(DATASETS), default="1k")
+    parser.add_argument("--users", type=int, help="데이터셋의 유저 수 대신 사용")
+    parser.add_argument("--matches", type=int, help="데이터셋의 매칭 요청 수 대신 사용")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--storage", choices=["memory", "sqlite"], default="memory",
+                        help="uvicorn 대상은 항상 sqlite")
+    parser.add_argument("--db", help="sqlite 파일 경로 (기본: 임시 파일)")
+    parser.add_argument("--api-mode", choices=["sync", "async"], default=os.environ.get("API_MODE", "sync"))
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=1000, help="시나리오별 요청 수 (login은 1/10)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--scenarios", help="콤마로 구분한 시나리오 이름 (기본: 전체)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<시각>-<커밋>-<데이터셋>.json)")
+    args = parser.parse_args()
+
+    default_users, default_matches = DATASETS[args.dataset]
+    args.users = args.users or default_users
+    args.matches = default_matches if args.matches is None else args.matches
+    if args.target == "uvicorn":
+        args.storage = "sqlite"
+    names = args.scenarios.split(",") if args.scenarios else [s.name for s in SCENARIOS]
+    unknown = set(names) - {s.name for s in SCENARIOS}
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    scenarios = [s for s in SCENARIOS if s.name in names]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or (os.path.join(tmp, "bench.db") if args.storage == "sqlite" else None)
+        runner: Callable = run_uvicorn if args.target == "uvicorn" else run_inprocess
+        dataset, results = asyncio.run(runner(args, scenarios, db_path))
+
+    meta = {
+        **git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "target": args.target,
+        "storage": args.storage,
+        "api_mode": args.api_mode,
+        "workers": args.workers if args.target == "uvicorn" else None,
+        "concurrency": args.concurrency,
+        "dataset": {"name": args.dataset, **dataset},
+    }
+    output = args.output or os.path.join(
+        RESULT_DIR, "benchmarks", "results",
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{(meta['commit'] or 'nogit')[:8]}-{args.dataset}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
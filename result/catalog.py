@@ -0,0 +1,304 @@
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from functools import partial
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+
+from serialization import dumps, profile_dict
+from store import DEFAULT_ORDER, SORT_KEYS, normalize_skill
+
+try:
+    import fcntl
+except ImportError:  # Windows: 게시 잠금 없이 동작 (단일 프로세스)
+    fcntl = None
+
+# --- 멘토 카탈로그 설정 ---
+# 여러 워커가 멘토 목록을 프로세스마다 따로 들고 있지 않도록, 읽기 전용 스냅샷을 버전별 파일로 게시하고
+# 모든 워커가 같은 파일을 mmap 해서 읽는다 (페이지 캐시 공유).
+MENTOR_CATALOG_ENABLED = os.environ.get("MENTOR_CATALOG_ENABLED", "0") == "1"
+MENTOR_CATALOG_DIR = os.environ.get("MENTOR_CATALOG_DIR", "data/catalog")
+# 멘토 변경 후 이 시간 동안의 변경을 모아 한 번만 게시한다
+MENTOR_CATALOG_PUBLISH_DELAY_MS = float(os.environ.get("MENTOR_CATALOG_PUBLISH_DELAY_MS", "200"))
+# 읽는 중인 워커가 있을 수 있으므로 최근 몇 개 버전 파일은 지우지 않는다
+CATALOG_KEEP_VERSIONS = 3
+
+# --- 파일 형식 ---
+# catalog-<version>.bin: 헤더(MAGIC, 버전, 디렉터리 길이) + JSON 디렉터리 + 8바이트 정렬된 섹션들.
+# 섹션은 같은 호스트의 워커만 읽으므로 네이티브 바이트 순서의 배열이다. 위치(pos)는 id 순 번호.
+#   ids(q), fragment_offsets(Q) + fragments: 멘토별 프로필 JSON 조각 (profile_dict를 orjson으로 인코딩)
+#   <order>.order(I): order_by별 (정렬값, id) 순 위치, <order>.value_offsets(Q) + <order>.values: 정렬값(UTF-8)
+#   postings(I): 정규화한 스킬별 위치 목록 (디렉터리의 skills에 시작/개수)
+# current: 현재 버전 번호(8바이트). 게시자는 새 파일을 다 쓴 뒤 이 값만 바꾸고, 읽는 쪽은 mmap 한 값을 비교만 한다.
+MAGIC = b"MCAT0001"
+_HEADER = struct.Struct("<8sQI")
+_POINTER = struct.Struct("<Q")
+_CATALOG = re.compile(r"^catalog-(\d+)\.bin$")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _offsets(chunks: List[bytes]) -> array:
+    return array("Q", accumulate((len(c) for c in chunks), initial=0))
+
+
+def build_catalog(mentors: Iterable[dict], version: int) -> List[bytes]:
+    mentors = sorted(mentors, key=lambda m: m["id"])
+    ids = array("q", (m["id"] for m in mentors))
+    fragments = [dumps(profile_dict(m)) for m in mentors]
+    sections: Dict[str, bytes] = {
+        "ids": ids.tobytes(),
+        "fragment_offsets": _offsets(fragments).tobytes(),
+        "fragments": b"".join(fragments),
+    }
+    for order, sort_key in SORT_KEYS.items():
+        if order == "id":
+            continue
+        values = [sort_key(m)[0] for m in mentors]
+        encoded = [v.encode() for v in values]
+        sections[f"{order}.order"] = array("I", sorted(range(len(mentors)), key=lambda i: (values[i], ids[i]))).tobytes()
+        sections[f"{order}.value_offsets"] = _offsets(encoded).tobytes()
+        sections[f"{order}.values"] = b"".join(encoded)
+    postings: Dict[str, List[int]] = {}
+    for pos, mentor in enumerate(mentors):
+        for skill in {normalize_skill(s) for s in (mentor["profile"].get("skills") or []) if s.strip()}:
+            postings.setdefault(skill, []).append(pos)
+    flat, skills = array("I"), {}
+    for skill, positions in postings.items():
+        skills[skill] = (len(flat), len(positions))
+        flat.extend(positions)
+    sections["postings"] = flat.tobytes()
+
+    layout, offset = {}, 0
+    for name, data in sections.items():
+        layout[name] = (offset, len(data))
+        offset = _align(offset + len(data))
+    directory = orjson.dumps({"count": len(mentors), "sections": layout, "skills": skills})
+    header = _HEADER.pack(MAGIC, version, len(directory)) + directory
+    chunks = [header, b"\0" * (_align(len(header)) - len(header))]
+    for name, data in sections.items():
+        chunks += [data, b"\0" * (_align(len(data)) - len(data))]
+    return chunks
+
+
+# --- 카탈로그 스냅샷 (읽기) ---
+# 파일을 mmap 하고 섹션을 memoryview.cast로 바로 배열처럼 읽는다. 프로필을 다시 파싱하지 않고
+# 응답에는 미리 인코딩한 JSON 조각을 잘라 쓴다. 한 번 게시된 파일은 바뀌지 않으므로 락이 필요 없다.
+class CatalogSnapshot:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a mentor catalog: {path}")
+        directory = orjson.loads(self._map[_HEADER.size:_HEADER.size + length])
+        self._base = _align(_HEADER.size + length)
+        self._layout = directory["sections"]
+        self._skills: Dict[str, Tuple[int, int]] = directory["skills"]
+        self.count: int = directory["count"]
+        self._ids = self._section("ids", "q")
+        self._fragment_offsets = self._section("fragment_offsets", "Q")
+        self._fragments = self._start("fragments")
+        self._postings = self._section("postings", "I")
+        # order_by -> (정렬 순 위치, 정렬값 오프셋, 정렬값 시작). id 순서는 위치 자체
+        self._orders = {
+            order: (self._section(f"{order}.order", "I"), self._section(f"{order}.value_offsets", "Q"),
+                    self._start(f"{order}.values"))
+            for order in SORT_KEYS if order != "id"
+        }
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _start(self, name: str) -> int:
+        return self._base + self._layout[name][0]
+
+    def _section(self, name: str, fmt: str) -> memoryview:
+        start = self._start(name)
+        return memoryview(self._map)[start:start + self._layout[name][1]].cast(fmt)
+
+    def fragment(self, pos: int) -> bytes:
+        return self._map[self._fragments + self._fragment_offsets[pos]:self._fragments + self._fragment_offsets[pos + 1]]
+
+    def key(self, order: str, pos: int) -> tuple:
+        # MentorIndex의 SORT_KEYS와 같은 (정렬값, id) 키
+        mentor_id = self._ids[pos]
+        if order == "id":
+            return mentor_id, mentor_id
+        _, offsets, start = self._orders[order]
+        return self._map[start + offsets[pos]:start + offsets[pos + 1]].decode(), mentor_id
+
+    def skill_mask(self, skills: Iterable[str], match: str = "any"):
+        # 위치별 일치 여부 (numpy bool 배열). 스킬 위치 목록은 mmap을 그대로 numpy 배열로 본다
+        import numpy as np
+
+        counts = np.zeros(self.count, dtype=np.uint8)
+        wanted = {normalize_skill(s) for s in skills}
+        for skill in wanted:
+            entry = self._skills.get(skill)
+            if entry is not None:
+                counts[np.frombuffer(self._postings, dtype=np.uint32, count=entry[1], offset=entry[0] * 4)] += 1
+            elif match == "all":
+                return counts.astype(bool)
+        return counts == len(wanted) if match == "all" else counts.astype(bool)
+
+    def page(
+        self,
+        skills: Optional[Iterable[str]] = None,
+        match: str = "any",
+        order_by: Optional[str] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[bytes], Optional[tuple]]:
+        # MentorIndex.page와 같은 의미이며 레코드 대신 프로필 JSON 조각을 돌려준다
+        order = order_by if order_by in SORT_KEYS else DEFAULT_ORDER
+        view: Sequence[int] = range(self.count) if order == "id" else self._orders[order][0]
+        key = partial(self.key, order)
+        skills = [s for s in (skills or []) if s.strip()]
+        if skills:
+            import numpy as np
+
+            # 정렬 순 위치에 마스크를 씌우면 일치하는 위치가 정렬된 채로 남는다
+            mask = self.skill_mask(skills, match)
+            if order == "id":
+                view = np.flatnonzero(mask)
+            else:
+                ordered = np.frombuffer(view, dtype=np.uint32)
+                view = ordered[mask[ordered]]
+        start = bisect_right(view, after, key=key) if after is not None else 0
+        positions = list(view[start:] if limit is None else view[start:start + limit + 1])
+        next_key = None
+        if limit is not None and len(positions) > limit:
+            positions = positions[:limit]
+            next_key = key(positions[-1])
+        return [self.fragment(pos) for pos in positions], next_key
+
+
+# --- 카탈로그 게시/구독 ---
+# 읽는 쪽: 요청마다 mmap 한 current 값만 비교하고, 바뀌었으면 새 버전 파일을 매핑한다 (락 없음).
+# 쓰는 쪽: 멘토 변경 이벤트를 받으면 게시 스레드가 잠시 모았다가 디렉터리 잠금 아래에서 저장소를 다시 읽어
+# 새 버전 파일을 쓰고 current를 바꾼다. 저장소를 잠금 안에서 읽으므로 버전이 클수록 더 나중 상태다.
+# 다른 워커의 변경은 그 워커가 게시한 버전으로 반영된다.
+class MentorCatalog:
+    def __init__(self, loader: Callable[[], Iterable[dict]], directory: str = MENTOR_CATALOG_DIR,
+                 publish_delay_ms: float = MENTOR_CATALOG_PUBLISH_DELAY_MS):
+        self._loader = loader
+        self.directory = directory
+        self.publish_delay = publish_delay_ms / 1000
+        os.makedirs(directory, exist_ok=True)
+        self._pointer_path = os.path.join(directory, "current")
+        self._pointer: Optional[mmap.mmap] = None
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._publish_lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self.publishes = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot is not None else 0
+
+    # --- 읽기 ---
+    def current(self) -> Optional[CatalogSnapshot]:
+        # 아직 게시된 버전이 없으면 None (호출하는 쪽은 저장소에서 읽는다)
+        version = self._read_pointer()
+        snapshot = self._snapshot
+        if version and (snapshot is None or snapshot.version != version):
+            try:
+                fresh = CatalogSnapshot(self._path(version))
+            except (FileNotFoundError, ValueError):
+                # 그 사이 더 새 버전이 게시돼 지워졌거나 쓰는 중인 값을 읽음: 다음 요청에서 다시 본다
+                return snapshot
+            if fresh.version == version:
+                self._snapshot = snapshot = fresh
+        return snapshot
+
+    def _read_pointer(self) -> int:
+        if self._pointer is None:
+            try:
+                with open(self._pointer_path, "rb") as f:
+                    self._pointer = mmap.mmap(f.fileno(), _POINTER.size, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                return 0
+        return _POINTER.unpack_from(self._pointer)[0]
+
+    def _path(self, version: int) -> str:
+        return os.path.join(self.directory, f"catalog-{version:012d}.bin")
+
+    # --- 게시 ---
+    def on_user_event(self, event: str, user: dict):
+        if user.get("role") == "mentor":
+            self.schedule()
+
+    def schedule(self):
+        self._dirty.set()
+        with self._thread_lock:
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="mentor-catalog", daemon=True)
+                self._thread.start()
+
+    def publish(self) -> int:
+        with self._publish_lock, open(os.path.join(self.directory, "LOCK"), "a+b") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            fd = os.open(self._pointer_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                raw = os.pread(fd, _POINTER.size, 0)
+                version = (_POINTER.unpack(raw)[0] if len(raw) == _POINTER.size else 0) + 1
+                path = self._path(version)
+                with open(path + ".tmp", "wb") as f:
+                    f.writelines(build_catalog(self._loader(), version))
+                os.replace(path + ".tmp", path)
+                os.pwrite(fd, _POINTER.pack(version), 0)
+            finally:
+                os.close(fd)
+            for name in os.listdir(self.directory):
+                m = _CATALOG.match(name)
+                if m and int(m.group(1)) <= version - CATALOG_KEEP_VERSIONS:
+                    os.remove(os.path.join(self.directory, name))
+        self.publishes += 1
+        return version
+
+    def _run(self):
+        try:
+            while True:
+                self._dirty.wait()
+                if self._stop.is_set():
+                    return
+                if self._stop.wait(self.publish_delay):
+                    return
+                self._dirty.clear()
+                try:
+                    self.publish()
+                except Exception as e:
+                    # 저장소 잠김 등: 게시 스레드는 유지하고 잠시 뒤 다시 게시한다
+                    self.errors += 1
+                    self.last_error = str(e)
+                    self._dirty.set()
+                    if self._stop.wait(1.0):
+                        return
+        finally:
+            # 스레드가 끝나면 다음 schedule()이 새로 띄울 수 있게 한다
+            with self._thread_lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def close(self):
+        self._stop.set()
+        self._dirty.set()
+        with self._thread_lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+# --- 실시간 알림 설정 ---
+EVENT_BROKER = os.environ.get("EVENT_BROKER", "memory")
+EVENT_QUEUE_SIZE = int(os.environ.get("EVENT_QUEUE_SIZE", "100"))
+SSE_KEEPALIVE = float(os.environ.get("SSE_KEEPALIVE", "15"))
+
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+# --- 구독 ---
+# 구독자마다 자신의 이벤트 루프에 묶인 큐를 가진다. 발행은 스레드풀(sync 핸들러)에서도
+# 일어나므로 call_soon_threadsafe로 루프에 넘기고, 큐가 가득 차면 오래된 이벤트부터 버린다.
+class Subscription:
+    def __init__(self, broker: "Broker", channels: Iterable[str], maxsize: int = EVENT_QUEUE_SIZE):
+        self.broker = broker
+        self.channels = tuple(channels)
+        self.dropped = 0
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize)
+
+    def deliver(self, event: dict):
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # 루프가 이미 닫힌 구독 (연결 종료 중)
+            pass
+
+    def _put(self, event: dict):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- pub/sub 브로커 ---
+# 발행자(저장소 리스너)와 구독자(SSE 연결)는 이 인터페이스만 사용하므로
+# 여러 워커가 이벤트를 공유해야 하면 같은 인터페이스의 로컬 브로커 구현으로 바꾸면 된다.
+class Broker(ABC):
+    @abstractmethod
+    def publish(self, channel: str, event: dict):
+        raise NotImplementedError
+
+    @abstractmethod
+    def subscribe(self, channels: Iterable[str]) -> Subscription:
+        raise NotImplementedError
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription):
+        raise NotImplementedError
+
+
+# 같은 프로세스 안에서만 전달하는 브로커 (기본값, 단일 워커용)
+class InProcessBroker(Broker):
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    def publish(self, channel: str, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscribe(self, channels: Iterable[str]) -> Subscription:
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+
+def create_broker(kind: str = EVENT_BROKER) -> Broker:
+    if kind == "memory":
+        return InProcessBroker()
+    raise ValueError(f"Unknown event broker: {kind}")
+
+
+# --- 매칭 요청 알림 ---
+# MatchRequestStore 리스너: 생성/상태 변경을 멘토와 멘티 채널 양쪽에 발행한다.
+class MatchRequestNotifier:
+    def __init__(self, broker: Broker):
+        self.broker = broker
+
+    def on_match_event(self, event: str, match: dict):
+        if event == "create":
+            kind = "match_request.created"
+        elif event == "update":
+            kind = "match_request.updated"
+        else:
+            return
+        payload = {"type": kind, "matchRequest": dict(match)}
+        for user_id in {match["mentorId"], match["menteeId"]}:
+            self.broker.publish(user_channel(user_id), payload)
+
+
+def format_sse(event: dict) -> bytes:
+    data = json.dumps(event["matchRequest"], ensure_ascii=False)
+    return f"event: {event['type']}\ndata: {data}\n\n".encode()
+
+
+async def sse_stream(broker: Broker, channels: Iterable[str], keepalive: float = SSE_KEEPALIVE) -> AsyncIterator[bytes]:
+    # 구독은 응답 본문을 보내기 시작할 때 만든다. 응답이 시작되지 않고 버려지면 제너레이터도 실행되지 않으므로
+    # 구독이 남지 않고, 연결이 끊기면 StreamingResponse가 제너레이터를 취소해 finally에서 해제한다.
+    subscription = broker.subscribe(channels)
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            event = await subscription.get(timeout=keepalive)
+            # 이벤트가 없으면 프록시가 연결을 끊지 않도록 주석 줄을 보낸다
+            yield b": keepalive\n\n" if event is None else format_sse(event)
+    finally:
+        subscription.close()
@@ -0,0 +1,407 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Set, Tuple
+
+from fastapi.responses import FileResponse, Response
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# --- 프로필 이미지 저장/변환 설정 ---
+IMAGE_STORE = os.environ.get("IMAGE_STORE", "memory")  # memory | directory | blob
+IMAGE_STORE_PATH = os.environ.get("IMAGE_STORE_PATH", "data/images")
+THUMBNAIL_SIZES = (64, 128, 256)
+MEDIA_TYPES = {"jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+JPEG_QUALITY = 90
+WEBP_QUALITY = 80
+
+
+def variant_key(size, fmt: str) -> str:
+    # 예: "original.jpeg", "128.webp"
+    return f"{size}.{fmt}"
+
+
+# --- 이미지 헤더 파싱 ---
+# 포맷과 크기 확인에는 헤더만 필요하므로 Pillow로 디코딩하지 않고 직접 읽는다.
+class IncompleteImageHeader(ValueError):
+    pass
+
+
+# JPEG SOFn 마커 (DHT/JPG/DAC 제외)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _jpeg_size(data) -> Tuple[int, int]:
+    offset = 2
+    while True:
+        if offset + 4 > len(data):
+            raise IncompleteImageHeader("JPEG header is truncated")
+        if data[offset] != 0xFF:
+            raise ValueError("Invalid JPEG marker")
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            offset += 2
+            continue
+        if marker in (0xD9, 0xDA):
+            raise ValueError("JPEG has no frame header")
+        length = int.from_bytes(data[offset + 2:offset + 4], "big")
+        if length < 2:
+            raise ValueError("Invalid JPEG segment length")
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                raise IncompleteImageHeader("JPEG header is truncated")
+            height = int.from_bytes(data[offset + 5:offset + 7], "big")
+            width = int.from_bytes(data[offset + 7:offset + 9], "big")
+            return width, height
+        offset += 2 + length
+
+
+def sniff_image(data) -> Tuple[str, Optional[int], Optional[int]]:
+    # (포맷, 너비, 높이). jpeg/png 이외의 알려진 포맷은 크기 없이 포맷만 돌려준다.
+    if data[:3] == b"\xff\xd8\xff":
+        return ("jpeg",) + _jpeg_size(data)
+    if data[:8] == _PNG_SIGNATURE:
+        if len(data) < 24:
+            raise IncompleteImageHeader("PNG header is truncated")
+        if data[12:16] != b"IHDR":
+            raise ValueError("PNG has no IHDR chunk")
+        return "png", int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif", None, None
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp", None, None
+    if data[:2] == b"BM":
+        return "bmp", None, None
+    if data[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff", None, None
+    if len(data) < 12 and (_PNG_SIGNATURE.startswith(bytes(data[:8])) or bytes(data[:3]) in (b"\xff", b"\xff\xd8")):
+        raise IncompleteImageHeader("Image header is truncated")
+    raise ValueError("Unknown image format")
+
+
+# --- 콘텐츠 주소 기반 이미지 저장소 ---
+# sha256 digest를 키로 이미지 바이트를 보관한다. 백엔드는 IMAGE_STORE 설정으로 선택한다.
+class ImageStore(ABC):
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, digest: str):
+        raise NotImplementedError
+
+    def release(self, digest: str):
+        pass
+
+    def mark(self):
+        # gc의 since 기준점. 이후에 저장된 이미지는 live 목록에 없어도 지우지 않는다
+        return None
+
+    def gc(self, live_digests: Set[str], since=None) -> int:
+        # 참조되지 않는 이미지를 지우고 지운 수를 돌려준다 (메모리 저장소는 release 때 바로 지운다)
+        return 0
+
+    def response(self, digest: str, media_type: str, headers: dict) -> Optional[Response]:
+        data = self.get(digest)
+        if data is None:
+            return None
+        return Response(content=data, media_type=media_type, headers=headers)
+
+
+# 프로세스 힙에 보관 (테스트/단일 프로세스용). 같은 내용은 참조 횟수로 공유한다.
+class MemoryImageStore(ImageStore):
+    def __init__(self):
+        self._blobs: Dict[str, bytes] = {}
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest not in self._blobs:
+                self._blobs[digest] = data
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        return self._blobs.get(digest)
+
+    def release(self, digest: str):
+        with self._lock:
+            refs = self._refs.get(digest, 0) - 1
+            if refs > 0:
+                self._refs[digest] = refs
+            else:
+                self._refs.pop(digest, None)
+                self._blobs.pop(digest, None)
+
+
+# 디렉터리에 digest 이름의 파일로 저장하고 FileResponse(sendfile)로 응답한다.
+# 여러 워커가 같은 파일을 참조할 수 있으므로 release 시 삭제하지 않고 gc로 정리한다.
+class DirectoryImageStore(ImageStore):
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._iter_digests())
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        try:
+            # 이미 있으면 수정 시각만 갱신해 진행 중인 gc가 지우지 않게 한다
+            os.utime(path)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self.path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def response(self, digest: str, media_type: str, headers: dict) -> Optional[Response]:
+        path = self.path(digest)
+        if not os.path.exists(path):
+            return None
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    def mark(self) -> float:
+        return time.time()
+
+    def gc(self, live_digests: Set[str], since: Optional[float] = None) -> int:
+        removed = 0
+        for digest in list(self._iter_digests()):
+            if digest in live_digests:
+                continue
+            path = self.path(digest)
+            try:
+                if since is not None and os.stat(path).st_mtime >= since:
+                    continue
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _iter_digests(self) -> Iterator[str]:
+        for bucket in os.scandir(self.root):
+            if bucket.is_dir():
+                for entry in os.scandir(bucket.path):
+                    if not entry.name.startswith("tmp"):
+                        yield entry.name
+
+
+# 하나의 append-only blob 파일에 [digest(32B) | 길이(8B) | 데이터] 레코드로 추가하고,
+# 파일을 mmap 해서 복사 없이 memoryview 조각으로 응답한다.
+class BlobImageStore(ImageStore):
+    _HEADER = struct.Struct(">32sQ")
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a+b")
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._scanned = 0
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        with self._lock:
+            self._scan()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def put(self, data: bytes) -> str:
+        raw_digest = hashlib.sha256(data).digest()
+        digest = raw_digest.hex()
+        with self._lock:
+            self._lock_file()
+            try:
+                # 다른 워커가 추가한 레코드를 먼저 반영해 중복 기록을 피한다
+                self._scan()
+                if digest not in self._index:
+                    offset = self._file.seek(0, os.SEEK_END)
+                    self._file.write(self._HEADER.pack(raw_digest, len(data)) + data)
+                    self._file.flush()
+                    self._index[digest] = (offset + self._HEADER.size, len(data))
+                    self._scanned = offset + self._HEADER.size + len(data)
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+        return digest
+
+    def get(self, digest: str) -> Optional[memoryview]:
+        with self._lock:
+            entry = self._index.get(digest)
+            if entry is None:
+                self._reopen_if_replaced()
+                self._scan()
+                entry = self._index.get(digest)
+                if entry is None:
+                    return None
+            offset, length = entry
+            if self._map is None or len(self._map) < offset + length:
+                # 기존 매핑은 응답 중인 memoryview가 있을 수 있으므로 닫지 않고 GC에 맡긴다
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._map)[offset:offset + length]
+
+    def mark(self) -> int:
+        with self._lock:
+            self._reopen_if_replaced()
+            return os.fstat(self._file.fileno()).st_size
+
+    def gc(self, live_digests: Set[str], since: Optional[int] = None) -> int:
+        # 참조되는 레코드(와 since 이후에 추가된 레코드)만 새 파일에 옮겨 쓰고 바꿔 끼운다.
+        # 다른 워커는 다음 put이나 없는 digest 조회 때 파일이 바뀐 것을 보고 다시 연다
+        with self._lock:
+            self._lock_file()
+            try:
+                self._scan()
+                keep = sorted((entry, digest) for digest, entry in self._index.items()
+                              if digest in live_digests or (since is not None and entry[0] >= since))
+                removed = len(self._index) - len(keep)
+                if not removed:
+                    return 0
+                tmp = self.path + ".tmp"
+                with open(tmp, "wb") as out:
+                    for (offset, length), digest in keep:
+                        self._file.seek(offset)
+                        out.write(self._HEADER.pack(bytes.fromhex(digest), length) + self._file.read(length))
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(tmp, self.path)
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._reopen_if_replaced()
+            return removed
+
+    def _lock_file(self):
+        # gc가 파일을 바꿔 끼웠으면 새 파일을 열고 그 파일을 잠근다
+        while True:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            if not self._replaced():
+                return
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._reopen_if_replaced()
+
+    def _replaced(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _reopen_if_replaced(self):
+        if not self._replaced():
+            return
+        # 이전 매핑은 응답 중인 memoryview가 있을 수 있으므로 닫지 않고 GC에 맡긴다
+        self._file.close()
+        self._file = open(self.path, "a+b")
+        self._index = {}
+        self._scanned = 0
+        self._map = None
+        self._scan()
+
+    def _scan(self):
+        # 마지막으로 읽은 위치 이후에 추가된 레코드만 읽어 인덱스를 갱신한다
+        size = os.fstat(self._file.fileno()).st_size
+        offset = self._scanned
+        while offset + self._HEADER.size <= size:
+            self._file.seek(offset)
+            raw_digest, length = self._HEADER.unpack(self._file.read(self._HEADER.size))
+            end = offset + self._HEADER.size + length
+            if end > size:
+                break
+            self._index.setdefault(raw_digest.hex(), (offset + self._HEADER.size, length))
+            offset = end
+        self._scanned = offset
+
+
+def create_image_store(kind: str, path: str) -> ImageStore:
+    if kind == "memory":
+        return MemoryImageStore()
+    if kind == "directory":
+        return DirectoryImageStore(path)
+    if kind == "blob":
+        return BlobImageStore(path)
+    raise ValueError(f"Unknown image store: {kind}")
+
+
+def _encode(img: "Image.Image", fmt: str) -> bytes:
+    buf = BytesIO()
+    if fmt == "jpeg":
+        img.convert("RGB").save(buf, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    elif fmt == "png":
+        img.save(buf, "PNG", optimize=True)
+    else:
+        img.save(buf, "WEBP", quality=WEBP_QUALITY, method=4)
+    return buf.getvalue()
+
+
+def render_variants(image_bytes: bytes) -> Tuple[str, Dict[str, bytes]]:
+    # 업로드 시점에 한 번만 정규화(EXIF 회전 적용, 메타데이터 제거)하고
+    # 원본 포맷 + WebP로 원본/썸네일 변형을 모두 만든다.
+    # Pillow는 첫 업로드 때 불러온다 (워커 기동 시간/메모리 절약)
+    from PIL import Image, ImageOps
+    with Image.open(BytesIO(image_bytes)) as src:
+        fmt = src.format.lower()
+        img = ImageOps.exif_transpose(src)
+        img.load()
+    if img.mode not in ("RGB", "RGBA", "L", "LA"):
+        img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+    sized = {"original": img}
+    for size in THUMBNAIL_SIZES:
+        sized[str(size)] = img.resize((size, size), Image.LANCZOS)
+    variants = {}
+    for size, resized in sized.items():
+        variants[variant_key(size, fmt)] = _encode(resized, fmt)
+        variants[variant_key(size, "webp")] = _encode(resized, "webp")
+    return fmt, variants
+
+
+def store_variants(store: ImageStore, variants: Dict[str, bytes]) -> Dict[str, str]:
+    return {key: store.put(data) for key, data in variants.items()}
+
+
+def release_variants(store: ImageStore, digests: Optional[Dict[str, str]]):
+    for digest in (digests or {}).values():
+        store.release(digest)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match는 약한 비교를 사용한다 (RFC 9110 13.1.2)
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
@@ -0,0 +1,441 @@
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from store import MatchRequestStore, UserStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: 디렉터리 잠금 없이 동작
+    fcntl = None
+
+# --- 저널 설정 ---
+# 메모리 저장소의 변경을 저널에 남기고 주기적으로 스냅샷으로 압축한다 (STORAGE_BACKEND=memory 전용)
+JOURNAL_ENABLED = os.environ.get("JOURNAL_ENABLED", "0") == "1"
+JOURNAL_DIR = os.environ.get("JOURNAL_DIR", "data/journal")
+# 그룹 커밋: 이 시간 동안 쌓인 기록을 한 번의 write + fsync로 내린다
+JOURNAL_COMMIT_INTERVAL_MS = float(os.environ.get("JOURNAL_COMMIT_INTERVAL_MS", "5"))
+JOURNAL_FSYNC = os.environ.get("JOURNAL_FSYNC", "1") == "1"
+# 스냅샷 주기(초)와, 마지막 스냅샷 이후 기록이 이만큼 쌓였을 때만 스냅샷을 만든다
+JOURNAL_SNAPSHOT_INTERVAL = float(os.environ.get("JOURNAL_SNAPSHOT_INTERVAL", "300"))
+JOURNAL_SNAPSHOT_MIN_RECORDS = int(os.environ.get("JOURNAL_SNAPSHOT_MIN_RECORDS", "100000"))
+
+# --- 파일 형식 ---
+# 세그먼트(journal-<n>.log)와 스냅샷(snapshot-<n>.snap)은 MAGIC 뒤에 프레임을 이어 붙인다.
+# 프레임: op(1바이트) + 페이로드 길이(4) + crc32(4) + orjson 페이로드.
+# snapshot-<n>은 세그먼트 n 이전의 모든 변경을 담으므로 복구는 최신 스냅샷 + 세그먼트 n 이후를 재생한다.
+MAGIC = b"MMJ1"
+USER_PUT, USER_DELETE, MATCH_PUT, MATCH_DELETE, SNAPSHOT_META = 1, 2, 3, 4, 5
+_FRAME = struct.Struct("<BII")
+_SEGMENT = re.compile(r"^journal-(\d+)\.log$")
+_SNAPSHOT = re.compile(r"^snapshot-(\d+)\.snap$")
+SNAPSHOT_BATCH = 10_000
+
+
+class JournalCorrupted(Exception):
+    pass
+
+
+def encode_frame(op: int, payload: bytes) -> bytes:
+    return _FRAME.pack(op, len(payload), zlib.crc32(payload, op)) + payload
+
+
+def iter_frames(path: str) -> Iterator[Tuple[int, int, bytes]]:
+    # (프레임 끝 오프셋, op, 페이로드). 잘리거나 깨진 프레임을 만나면 그 시작 오프셋과 함께 JournalCorrupted
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < len(MAGIC):
+            if size:
+                raise JournalCorrupted(f"{path}: 0")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if buf[:len(MAGIC)] != MAGIC:
+                raise JournalCorrupted(f"{path}: bad magic")
+            offset = len(MAGIC)
+            while offset < size:
+                if offset + _FRAME.size > size:
+                    raise JournalCorrupted(f"{path}: {offset}")
+                op, length, crc = _FRAME.unpack_from(buf, offset)
+                end = offset + _FRAME.size + length
+                payload = buf[offset + _FRAME.size:end]
+                if end > size or zlib.crc32(payload, op) != crc:
+                    raise JournalCorrupted(f"{path}: {offset}")
+                yield end, op, payload
+                offset = end
+
+
+def _numbered(directory: str, pattern, names: Optional[List[str]] = None) -> List[Tuple[int, str]]:
+    found = []
+    for name in os.listdir(directory) if names is None else names:
+        m = pattern.match(name)
+        if m:
+            found.append((int(m.group(1)), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def _fsync_dir(directory: str):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fdatasync(fd: int):
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(fd)
+    else:
+        os.fsync(fd)
+
+
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+# --- 복구 ---
+# 스냅샷과 저널 꼬리를 이메일/id별 최종 상태로 접어 둔 뒤 저장소에 한 번에 적재한다.
+# 기록은 항상 레코드 전체 상태이므로 같은 변경이 스냅샷과 저널에 모두 있어도 결과가 같다.
+class RecoveredState:
+    def __init__(self):
+        self.users: Dict[str, dict] = {}
+        self.matches: Dict[int, dict] = {}
+        self.last_user_id = 0
+        self.last_match_id = 0
+        self.snapshot = 0
+        self.records = 0
+        # 마지막 스냅샷 이후 세그먼트에서 재생한 기록 수
+        self.tail_records = 0
+        self.truncated = 0
+
+    def apply(self, op: int, payload: bytes):
+        record = orjson.loads(payload)
+        if op == USER_PUT:
+            self.users[record["email"]] = record
+            self.last_user_id = max(self.last_user_id, record["id"])
+        elif op == USER_DELETE:
+            self.users.pop(record["email"], None)
+            self.last_user_id = max(self.last_user_id, record["id"])
+        elif op == MATCH_PUT:
+            self.matches[record["id"]] = record
+            self.last_match_id = max(self.last_match_id, record["id"])
+        elif op == MATCH_DELETE:
+            self.matches.pop(record["id"], None)
+            self.last_match_id = max(self.last_match_id, record["id"])
+        elif op == SNAPSHOT_META:
+            self.last_user_id = max(self.last_user_id, record["usersLastId"])
+            self.last_match_id = max(self.last_match_id, record["matchesLastId"])
+            return
+        self.records += 1
+
+
+def recover(directory: str, truncate: bool = True) -> RecoveredState:
+    state = RecoveredState()
+    # 스냅샷과 세그먼트를 한 번의 목록으로 고른다. 따로 나열하면 그 사이 만들어진 새 스냅샷이 지운
+    # 세그먼트를 모른 채 건너뛸 수 있다
+    names = os.listdir(directory)
+    snapshots = _numbered(directory, _SNAPSHOT, names)
+    if snapshots:
+        state.snapshot = snapshots[-1][0]
+    segments = [(n, path) for n, path in _numbered(directory, _SEGMENT, names) if n >= state.snapshot]
+    numbers = [n for n, _ in segments]
+    if numbers != list(range(state.snapshot, state.snapshot + len(numbers))) or (snapshots and not numbers):
+        raise JournalCorrupted(f"{directory}: missing journal segments after snapshot {state.snapshot}")
+    if snapshots:
+        for _, op, payload in iter_frames(snapshots[-1][1]):
+            state.apply(op, payload)
+    before = state.records
+    for i, (_, path) in enumerate(segments):
+        valid = len(MAGIC)
+        try:
+            for valid, op, payload in iter_frames(path):
+                state.apply(op, payload)
+        except JournalCorrupted:
+            # 마지막 세그먼트의 잘린 꼬리(쓰는 도중 종료)만 잘라 내고, 중간 세그먼트의 손상은 복구하지 않는다
+            if i != len(segments) - 1:
+                raise
+            state.truncated = os.path.getsize(path) - valid
+            if not truncate:
+                continue
+            with open(path, "r+b") as f:
+                if valid == len(MAGIC) and f.read(len(MAGIC)) != MAGIC:
+                    f.seek(0)
+                    f.write(MAGIC)
+                f.truncate(valid)
+                os.fsync(f.fileno())
+    state.tail_records = state.records - before
+    return state
+
+
+def read_state(directory: str, attempts: int = 3) -> RecoveredState:
+    # 실행 중인 서버의 저널을 잠그거나 고치지 않고 읽는다. 결과는 마지막으로 내려간 커밋 시점의 상태이며,
+    # 읽는 도중 스냅샷이 이전 세그먼트를 지우면 다시 읽는다.
+    for attempt in range(attempts):
+        try:
+            return recover(directory, truncate=False)
+        except (FileNotFoundError, JournalCorrupted):
+            if attempt == attempts - 1:
+                raise
+
+
+# --- 저널 ---
+# 저장소 리스너는 레코드를 프레임으로 인코딩해 대기 목록에 넣기만 하고 바로 돌아간다 (요청 스레드는 디스크를 기다리지 않음).
+# 쓰기 스레드가 대기 목록을 통째로 가져가 write + fsync 한 번으로 내리므로(그룹 커밋)
+# 장애 시 잃을 수 있는 범위는 마지막 커밋 이후 JOURNAL_COMMIT_INTERVAL_MS 남짓이다.
+# 스냅샷 스레드는 새 세그먼트로 넘긴 뒤 저장소 복사본을 스냅샷으로 쓰고, 그 이전 세그먼트/스냅샷을 지운다.
+class Journal:
+    def __init__(
+        self,
+        directory: str = JOURNAL_DIR,
+        commit_interval_ms: float = JOURNAL_COMMIT_INTERVAL_MS,
+        fsync: bool = JOURNAL_FSYNC,
+        snapshot_interval: float = JOURNAL_SNAPSHOT_INTERVAL,
+        snapshot_min_records: int = JOURNAL_SNAPSHOT_MIN_RECORDS,
+    ):
+        self.directory = directory
+        self.commit_interval = commit_interval_ms / 1000
+        self.fsync = fsync
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_min_records = snapshot_min_records
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: List[bytes] = []
+        self._writer_idle = False
+        self._closing = False
+        # 세그먼트 파일 교체와 쓰기를 직렬화 (대기 목록 추가는 이 락을 잡지 않는다)
+        self._file_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._fd: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+        self._threads: List[threading.Thread] = []
+        self.segment = 0
+        self.appended = 0
+        self.durable = 0
+        self.since_snapshot = 0
+        self.snapshots = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.recovered: Optional[RecoveredState] = None
+
+    @property
+    def pending(self) -> int:
+        return self.appended - self.durable
+
+    def open(self, users: UserStore, matches: MatchRequestStore) -> "Journal":
+        # 비어 있는 저장소에 복구한 상태를 적재하고, 이후 변경을 기록하기 시작한다
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_directory()
+        self._users, self._matches = users, matches
+        # 스냅샷을 쓰다가 종료되면 임시 파일이 남는다
+        for name in os.listdir(self.directory):
+            if name.startswith("snapshot-") and name.endswith(".snap.tmp"):
+                os.remove(os.path.join(self.directory, name))
+        try:
+            state = self.recovered = recover(self.directory)
+        except Exception:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            raise
+        users.insert_many(state.users.values())
+        matches.insert_many(state.matches.values())
+        users.ids.advance_to(state.last_user_id)
+        matches.ids.advance_to(state.last_match_id)
+        self.since_snapshot = state.tail_records
+        last = _numbered(self.directory, _SEGMENT)
+        self._open_segment(max(state.snapshot, last[-1][0] + 1 if last else 0))
+        users.subscribe(self.on_user_event)
+        matches.subscribe(self.on_match_event)
+        self._start(self._run_writer, "journal-writer")
+        if self.snapshot_interval > 0:
+            self._start(self._run_snapshots, "journal-snapshot")
+        return self
+
+    # --- 저장소 리스너 (저장소 락 안에서 호출되므로 인코딩 시점의 상태가 그대로 기록된다) ---
+    def on_user_event(self, event: str, user: dict):
+        if event == "delete":
+            self._append(encode_frame(USER_DELETE, orjson.dumps({"email": user["email"], "id": user["id"]})))
+        else:
+            self._append(encode_frame(USER_PUT, orjson.dumps(user)))
+
+    def on_match_event(self, event: str, match: dict):
+        if event == "delete":
+            self._append(encode_frame(MATCH_DELETE, orjson.dumps({"id": match["id"]})))
+        else:
+            self._append(encode_frame(MATCH_PUT, orjson.dumps(match)))
+
+    def _append(self, frame: bytes):
+        with self._cond:
+            # 닫은 뒤에는 쓰기 스레드가 없으므로 받지 않는다 (flush가 끝나지 않는 것을 막는다)
+            if self._closing:
+                return
+            self._pending.append(frame)
+            self.appended += 1
+            if self._writer_idle:
+                self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # 지금까지 기록한 변경이 디스크에 내려갈 때까지 기다린다
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self.appended
+            while self.durable < target:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def close(self):
+        if self._fd is None:
+            return
+        self._users.unsubscribe(self.on_user_event)
+        self._matches.unsubscribe(self.on_match_event)
+        self._stop.set()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        with self._file_lock:
+            os.close(self._fd)
+            self._fd = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    # --- 쓰기 스레드 ---
+    def _run_writer(self):
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._writer_idle = True
+                    self._cond.wait()
+                self._writer_idle = False
+                if not self._pending:
+                    return
+                closing = self._closing
+            # 잠깐 기다려 동시에 들어온 기록을 한 번의 fsync로 묶는다
+            if self.commit_interval and not closing:
+                time.sleep(self.commit_interval)
+            with self._cond:
+                batch, self._pending = self._pending, []
+                target = self.appended
+            if not self._write_batch(batch):
+                with self._cond:
+                    self._pending[:0] = batch
+                failures += 1
+                # 종료 중에도 몇 번은 다시 시도하고 포기한다
+                if self._stop.wait(1.0) and failures > 3:
+                    return
+                continue
+            failures = 0
+            with self._cond:
+                self.durable = target
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: List[bytes]) -> bool:
+        with self._file_lock:
+            offset = os.lseek(self._fd, 0, os.SEEK_END)
+            try:
+                _write_all(self._fd, b"".join(batch))
+                if self.fsync:
+                    _fdatasync(self._fd)
+            except OSError as e:
+                # 일부만 쓰인 프레임을 남기지 않도록 되돌리고 다시 시도한다
+                self.errors += 1
+                self.last_error = str(e)
+                try:
+                    os.ftruncate(self._fd, offset)
+                except OSError:
+                    pass
+                return False
+            self.since_snapshot += len(batch)
+            return True
+
+    def _open_segment(self, number: int):
+        path = os.path.join(self.directory, f"journal-{number:08d}.log")
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        if os.fstat(fd).st_size == 0:
+            _write_all(fd, MAGIC)
+            os.fsync(fd)
+            _fsync_dir(self.directory)
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = fd
+        self.segment = number
+
+    # --- 스냅샷 ---
+    def snapshot(self) -> str:
+        with self._snapshot_lock:
+            # 새 세그먼트로 넘긴 뒤의 변경은 모두 새 세그먼트에 남으므로, 복사본이 그 변경을 일부 포함해도
+            # 복구 시 새 세그먼트를 재생하면 같은 최종 상태가 된다
+            with self._file_lock:
+                if self.fsync:
+                    os.fsync(self._fd)
+                number = self.segment + 1
+                self._open_segment(number)
+                self.since_snapshot = 0
+            users, matches = self._users.records(), self._matches.records()
+            meta = {"usersLastId": self._users.ids.last, "matchesLastId": self._matches.ids.last}
+            path = os.path.join(self.directory, f"snapshot-{number:08d}.snap")
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(MAGIC + encode_frame(SNAPSHOT_META, orjson.dumps(meta)))
+                for op, records in ((USER_PUT, users), (MATCH_PUT, matches)):
+                    for i in range(0, len(records), SNAPSHOT_BATCH):
+                        f.write(b"".join(encode_frame(op, orjson.dumps(r)) for r in records[i:i + SNAPSHOT_BATCH]))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            _fsync_dir(self.directory)
+            for pattern in (_SNAPSHOT, _SEGMENT):
+                for n, old in _numbered(self.directory, pattern):
+                    if n < number:
+                        os.remove(old)
+            self.snapshots += 1
+            return path
+
+    def _run_snapshots(self):
+        while not self._stop.wait(self.snapshot_interval):
+            if self.since_snapshot < self.snapshot_min_records:
+                continue
+            try:
+                self.snapshot()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+
+    def _start(self, target, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _lock_directory(self):
+        # 같은 디렉터리를 두 프로세스가 동시에 쓰면 세그먼트가 섞이므로 거부한다 (워커 1개 전용)
+        self._lock_fd = os.open(os.path.join(self.directory, "LOCK"), os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            raise RuntimeError(f"Journal directory is in use by another process: {self.directory}")
+
+
+def open_journal(users, matches, directory: str = JOURNAL_DIR) -> Journal:
+    if not isinstance(users, UserStore) or not isinstance(matches, MatchRequestStore):
+        raise ValueError("Journal requires STORAGE_BACKEND=memory")
+    return Journal(directory).open(users, matches)
@@ -1,25 +1,126 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Response, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import RedirectResponse, StreamingResponse
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional, Union
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from fastapi.responses import PlainTextResponse, RedirectResponse, StreamingResponse
+from pydantic import BaseModel, EmailStr, Field
+from typing import Callable, Iterable, Iterator, List, Optional, Union
 from datetime import datetime, timedelta
 import base64
-from io import BytesIO
-from PIL import Image
+import json
+from bisect import bisect_right
+from contextlib import asynccontextmanager
+from store import SORT_KEYS, DEFAULT_ORDER, DuplicateKeyError, create_stores
+from passwords import PASSWORD_HASH_RETRY_AFTER, PasswordHasher, PoolOverloaded, get_context
+from token_cache import TokenCache
+from api_mode import API_MODE, LazyExecutor, endpoint, iterate_inline
+from events import MatchRequestNotifier, create_broker, sse_stream, user_channel
+from serialization import ProfileFragmentCache, dumps, json_array, json_response
+from ratelimit import (
+    RATE_LIMIT_LOGIN_EMAIL, RATE_LIMIT_LOGIN_IP, RATE_LIMIT_MATCH_USER, RATE_LIMIT_SIGNUP_IP, RateLimited, RateLimiter,
+    client_ip, create_rate_limit_backend,
+)
+from openapi_cache import install as install_openapi_cache
+from recommend import RECOMMEND_DEFAULT_LIMIT, MentorRecommender
+from search import MentorSearchIndex
+from journal import JOURNAL_ENABLED, open_journal
+from catalog import MENTOR_CATALOG_ENABLED, MentorCatalog
+from metrics import METRICS_ADMIN_TOKEN, Counter, Gauge, MetricsMiddleware, profiler, registry, span, spans
+from images import (
+    IMAGE_STORE, IMAGE_STORE_PATH, MEDIA_TYPES, THUMBNAIL_SIZES, IncompleteImageHeader, create_image_store, etag_matches,
+    release_variants, render_variants, sniff_image, store_variants, variant_key,
+)
 
-app = FastAPI(title="Mentor-Mentee Matching API")
+# 비밀번호 해시/검증은 전용 프로세스 풀에서 실행
+password_hasher = PasswordHasher()
+# API_MODE=async에서 이미지 변환 핸들러를 실행하는 전용 스레드 풀
+image_executor = LazyExecutor(name="image")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 미리 생성한 OpenAPI 스키마를 읽어 둔다 (첫 /openapi.json 요청에서 생성하지 않도록)
+    app.openapi()
+    # 시작 시점의 멘토 목록을 게시해 둔다 (게시 전에는 저장소에서 읽는다)
+    if mentor_catalog is not None:
+        mentor_catalog.schedule()
+    yield
+    password_hasher.shutdown()
+    image_executor.shutdown()
+    profiler.stop()
+    if journal is not None:
+        journal.close()
+    if mentor_catalog is not None:
+        mentor_catalog.close()
+
+app = FastAPI(title="Mentor-Mentee Matching API", lifespan=lifespan)
+install_openapi_cache(app)
 
 # JWT 설정
 SECRET_KEY = "your-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 프로필 이미지 업로드 제한
+MAX_IMAGE_BYTES = 1024 * 1024
+MAX_IMAGE_B64_LENGTH = 4 * -(-MAX_IMAGE_BYTES // 3)
+IMAGE_UPLOAD_CHUNK_SIZE = 64 * 1024
+# multipart 경계/파트 헤더 여유분. 본문 전체가 이보다 크면 파싱(임시 파일로 스풀) 전에 거절한다
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_BODY_LIMITS = {"/api/profile/image": MAX_IMAGE_BYTES + MULTIPART_OVERHEAD_BYTES}
+
+
+# --- 업로드 본문 크기 제한 ---
+# Starlette는 핸들러 실행 전에 multipart 본문 전체를 읽어 두므로, 크기 제한은 그보다 앞에서 건다.
+# Content-Length가 크면 본문을 읽지 않고 바로 거절하고, 길이가 없는(chunked) 본문은 읽은 양을 세어 중단한다.
+class UploadSizeLimitMiddleware:
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > limit:
+            response = Response(dumps({"detail": "이미지 크기는 1MB 이하여야 합니다."}), status_code=400,
+                                media_type="application/json")
+            await response(scope, receive, send)
+            return
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            if received > limit:
+                # FastAPI는 본문 파싱 중 발생한 HTTPException을 그대로 응답으로 돌려준다
+                raise HTTPException(status_code=400, detail="이미지 크기는 1MB 이하여야 합니다.")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadSizeLimitMiddleware, limits=UPLOAD_BODY_LIMITS)
+# 라우트별 지연 시간/상태 코드/처리 중 요청 수 (METRICS_ENABLED). 나중에 추가한 미들웨어가 바깥쪽에서 실행된다
+app.add_middleware(MetricsMiddleware)
+
+# 프로필 이미지 응답 캐시 설정 (인증이 필요한 리소스이므로 private)
+IMAGE_CACHE_CONTROL = "private, max-age=300"
+# /api/me는 매번 ETag로 재검증한다
+PROFILE_CACHE_CONTROL = "private, no-cache"
+
+# 목록 페이지네이션 설정
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 256
+
+MATCH_STATUS_PATTERN = "^(pending|accepted|rejected|cancelled)$"
+# 일괄 수락/거절/취소 한 번에 처리할 수 있는 최대 요청 수
+MAX_BULK_SIZE = 500
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
+# EventSource는 헤더를 지정할 수 없으므로 알림 스트림은 ?token= 으로도 인증한다
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/login", auto_error=False)
 
 # --- Pydantic Schemas (일부 예시) ---
 class SignupRequest(BaseModel):
@@ -95,105 +196,414 @@ class MatchRequestOutgoing(BaseModel):
     menteeId: int
     status: str
 
-# --- 유저 데이터 예시 (실제 구현시 DB로 대체) ---
-fake_users_db = {}
-fake_match_requests = {}
+class MentorRecommendation(BaseModel):
+    mentor: MentorProfile
+    score: float
+    matchedSkills: List[str]
+
+class MatchRequestBulk(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=MAX_BULK_SIZE)
+
+class MatchRequestBulkItem(BaseModel):
+    id: int
+    result: str  # ok, not_found, forbidden
+    matchRequest: Optional[MatchRequest] = None
+
+class MatchRequestBulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[MatchRequestBulkItem]
+
+# --- 유저/매칭 요청 저장소 (STORAGE_BACKEND: memory | sqlite) ---
+fake_users_db, fake_match_requests = create_stores()
+# 메모리 저장소 저널 (JOURNAL_ENABLED): 스냅샷 + 저널을 재생한 뒤 이후 변경을 기록한다.
+# 복구한 레코드가 알림/캐시 리스너로 흘러가지 않도록 다른 리스너보다 먼저 연다
+journal = open_journal(fake_users_db, fake_match_requests) if JOURNAL_ENABLED else None
+
+# 검증이 끝난 JWT claims 캐시 (유저 변경/삭제 시 무효화)
+token_cache = TokenCache()
+fake_users_db.subscribe(token_cache.on_user_event)
+
+# 유저별 프로필 JSON 조각(orjson) 캐시 (프로필 변경/삭제 시 무효화)
+profile_cache = ProfileFragmentCache()
+fake_users_db.subscribe(profile_cache.on_user_event)
+
+# 멘토 추천용 스킬 비트셋 행렬 (첫 추천 요청 때 만들고 이후 유저/매칭 요청 변경으로 증분 갱신)
+recommender = MentorRecommender(
+    lambda: (fake_users_db.iter_role("mentor"), fake_match_requests.iter_status("accepted")))
+fake_users_db.subscribe(recommender.on_user_event)
+fake_match_requests.subscribe(recommender.on_match_event)
+
+# 멘토 이름/소개글/스킬 역색인 (q= 검색, 첫 검색 때 만들고 프로필 변경 시 증분 갱신)
+search_index = MentorSearchIndex(lambda: fake_users_db.iter_role("mentor"))
+fake_users_db.subscribe(search_index.on_user_event)
+
+# 멀티 워커 공유 멘토 카탈로그 (MENTOR_CATALOG_ENABLED): 멘토 목록을 버전별 파일로 게시하고 모든 워커가 mmap 해서 읽는다.
+# 멘토 변경은 MENTOR_CATALOG_PUBLISH_DELAY_MS 뒤 새 버전으로 반영된다
+mentor_catalog = MentorCatalog(lambda: fake_users_db.iter_role("mentor")) if MENTOR_CATALOG_ENABLED else None
+if mentor_catalog is not None:
+    fake_users_db.subscribe(mentor_catalog.on_user_event)
+
+# 프로필 이미지 변형(원본/썸네일, 원본 포맷/WebP)을 콘텐츠 해시로 보관
+image_store = create_image_store(IMAGE_STORE, IMAGE_STORE_PATH)
+
+# 매칭 요청 생성/상태 변경을 관련 유저 채널로 발행 (EVENT_BROKER)
+event_broker = create_broker()
+fake_match_requests.subscribe(MatchRequestNotifier(event_broker).on_match_event)
+
+# 로그인/가입(bcrypt)과 매칭 요청 생성의 토큰 버킷 한도 (RATE_LIMIT_BACKEND: memory | sqlite)
+rate_limiter = (
+    RateLimiter(create_rate_limit_backend())
+    .limit("login_ip", RATE_LIMIT_LOGIN_IP)
+    .limit("login_email", RATE_LIMIT_LOGIN_EMAIL)
+    .limit("signup_ip", RATE_LIMIT_SIGNUP_IP)
+    .limit("match_user", RATE_LIMIT_MATCH_USER)
+)
+
+# 캐시/풀 상태는 스크레이프 시점에 읽어 온다
+registry.register(Gauge("app_cache_entries", "Entries held by in-process caches", ("cache",), collect=lambda: {
+    ("token",): token_cache.stats()["size"], ("profile",): profile_cache.stats()["size"]}))
+registry.register(Counter("app_cache_hits_total", "Cache lookups served from memory", ("cache",), collect=lambda: {
+    ("token",): token_cache.hits, ("profile",): profile_cache.hits}))
+registry.register(Counter("app_cache_misses_total", "Cache lookups that fell through", ("cache",), collect=lambda: {
+    ("token",): token_cache.misses, ("profile",): profile_cache.misses}))
+registry.register(Counter("app_rate_limited_total", "Requests rejected by rate limits", ("limit",), collect=lambda: {
+    (name,): n for name, n in rate_limiter.rejected.items()}))
+registry.register(Gauge("app_password_hash_pending", "Password hash jobs queued or running",
+                        collect=lambda: {(): password_hasher.pending}))
+if journal is not None:
+    registry.register(Gauge("app_journal_pending_records", "Journal records not yet written and synced",
+                            collect=lambda: {(): journal.pending}))
+    registry.register(Counter("app_journal_records_total", "Journal records written and synced",
+                              collect=lambda: {(): journal.durable}))
+if mentor_catalog is not None:
+    registry.register(Gauge("app_mentor_catalog_version", "Mentor catalog version mapped by this worker",
+                            collect=lambda: {(): mentor_catalog.version}))
 
 # --- JWT 유틸 함수 ---
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
+    from jose import jwt  # python-jose는 첫 토큰 발급/검증 때 불러온다
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_context().hash(password)
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+def authenticate(token: Optional[str]) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    if not token:
         raise credentials_exception
-    user = fake_users_db.get(email)
+    with span("auth"):
+        payload = token_cache.get(token)
+        if payload is None:
+            from jose import JWTError, jwt
+            try:
+                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+                if payload.get("sub") is None:
+                    raise credentials_exception
+            except JWTError:
+                raise credentials_exception
+            token_cache.put(token, payload)
+        user = fake_users_db.get(payload["sub"])
     if user is None:
         raise credentials_exception
     return user
 
+@endpoint
+def get_current_user(token: str = Depends(oauth2_scheme)):
+    return authenticate(token)
+
+@endpoint
+def get_stream_user(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    query_token: Optional[str] = Query(None, alias="token"),
+):
+    return authenticate(token or query_token)
+
+# --- 요청 제한 의존성 ---
+# 핸들러(bcrypt, 저장)보다 먼저 실행되도록 라우트의 dependencies로 붙인다.
+def check_rate(name: str, key: str):
+    try:
+        rate_limiter.check(name, key)
+    except RateLimited as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, please retry later",
+            headers={"Retry-After": e.retry_after_header},
+        )
+
+@endpoint
+def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    # 없는 이메일에도 bcrypt가 돌므로 IP와 이메일 양쪽으로 제한한다
+    check_rate("login_ip", client_ip(request.headers, request.client))
+    check_rate("login_email", form_data.username.strip().lower())
+
+@endpoint
+def limit_signup(request: Request):
+    check_rate("signup_ip", client_ip(request.headers, request.client))
+
+@endpoint
+def limit_match_create(current_user: dict = Depends(get_current_user)):
+    check_rate("match_user", str(current_user["id"]))
+
+def check_image_header(data) -> str:
+    # 헤더만 읽어 포맷/크기를 검사한다. 본문 디코딩은 저장 시점(render_variants)에 한 번만 수행
+    try:
+        fmt, w, h = sniff_image(data)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="이미지 파일이 올바르지 않습니다.")
+    if fmt not in ("jpeg", "png"):
+        raise HTTPException(status_code=400, detail="이미지는 .jpg 또는 .png 형식만 허용합니다.")
+    if w != h:
+        raise HTTPException(status_code=400, detail="이미지는 정사각형이어야 합니다.")
+    if w < 500 or w > 1000:
+        raise HTTPException(status_code=400, detail="이미지 해상도는 500x500~1000x1000 픽셀이어야 합니다.")
+    return fmt
+
 def validate_profile_image(image_b64: str):
+    with span("image_validate"):
+        return _validate_profile_image(image_b64)
+
+def _validate_profile_image(image_b64: str):
     try:
+        # 디코딩 전에 인코딩 길이로 1MB 초과 여부를 먼저 판단
+        encoded_len = len(image_b64)
+        if encoded_len > MAX_IMAGE_B64_LENGTH:
+            encoded_len -= sum(image_b64.count(c) for c in " \t\r\n")
+            if encoded_len > MAX_IMAGE_B64_LENGTH:
+                raise HTTPException(status_code=400, detail="이미지 크기는 1MB 이하여야 합니다.")
         image_bytes = base64.b64decode(image_b64)
         # 1MB 이하
-        if len(image_bytes) > 1024 * 1024:
+        if len(image_bytes) > MAX_IMAGE_BYTES:
             raise HTTPException(status_code=400, detail="이미지 크기는 1MB 이하여야 합니다.")
-        # 확장자 체크 (Pillow로 대체)
-        with Image.open(BytesIO(image_bytes)) as img:
-            ext = img.format.lower()
-            if ext not in ("jpeg", "png"):
-                raise HTTPException(status_code=400, detail="이미지는 .jpg 또는 .png 형식만 허용합니다.")
-            w, h = img.size
-            if w != h:
-                raise HTTPException(status_code=400, detail="이미지는 정사각형이어야 합니다.")
-            if w < 500 or w > 1000:
-                raise HTTPException(status_code=400, detail="이미지 해상도는 500x500~1000x1000 픽셀이어야 합니다.")
+        check_image_header(image_bytes)
         return image_bytes
     except HTTPException:
         raise
     except Exception:
         raise HTTPException(status_code=400, detail="이미지 파일이 올바르지 않습니다.")
 
+def read_profile_image_upload(upload: UploadFile) -> bytes:
+    with span("image_validate"):
+        return _read_profile_image_upload(upload)
+
+def _read_profile_image_upload(upload: UploadFile) -> bytes:
+    # 스풀된 multipart 파일을 청크 단위로 읽으며 헤더를 먼저 검사하고 1MB를 넘는 즉시 중단
+    # (본문 전체 크기는 UploadSizeLimitMiddleware가 파싱 전에 제한한다)
+    buf = bytearray()
+    checked = False
+    while True:
+        chunk = upload.file.read(IMAGE_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        buf += chunk
+        if len(buf) > MAX_IMAGE_BYTES:
+            raise HTTPException(status_code=400, detail="이미지 크기는 1MB 이하여야 합니다.")
+        if not checked:
+            try:
+                sniff_image(buf)
+            except IncompleteImageHeader:
+                continue  # 헤더가 모두 들어올 때까지 계속 읽음
+            except ValueError:
+                pass
+            check_image_header(buf)
+            checked = True
+    if not checked:
+        check_image_header(buf)
+    return bytes(buf)
+
+def process_profile_image(image_bytes: bytes):
+    try:
+        with span("image_render"):
+            fmt, variants = render_variants(image_bytes)
+    except Exception:
+        raise HTTPException(status_code=400, detail="이미지 파일이 올바르지 않습니다.")
+    return fmt, store_variants(image_store, variants)
+
+def profile_etag(user: dict) -> str:
+    # 저장할 때마다 오르는 유저 version으로 만든 약한 ETag (저장소 epoch로 재시작/DB 교체를 구분)
+    return f'W/"{fake_users_db.epoch}-{user["id"]}-{user.get("version", 0)}"'
+
+def profile_response(user: dict) -> Response:
+    with span("serialize"):
+        response = json_response(profile_cache.fragment(user))
+    response.headers["ETag"] = profile_etag(user)
+    response.headers["Cache-Control"] = PROFILE_CACHE_CONTROL
+    return response
+
+def apply_profile_image(user: dict, image: tuple):
+    # image는 process_profile_image 결과. 변환은 락 밖에서 끝내고 여기서는 교체만 한다
+    old_variants = user["profile"].get("image_variants")
+    user["profile"]["image_format"], user["profile"]["image_variants"] = image
+    release_variants(image_store, old_variants)
+
+# --- 목록 페이지네이션 / 스트리밍 유틸 ---
+def encode_cursor(order: str, key: tuple) -> str:
+    raw = json.dumps([order, list(key)], separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str], order: str, types: tuple) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_order, key = json.loads(raw)
+        key = tuple(key)
+        valid = len(key) == len(types) and all(isinstance(k, t) for k, t in zip(key, types))
+    except Exception:
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_order != order:
+        raise HTTPException(status_code=400, detail="Cursor does not match order_by")
+    return key
+
+def set_next_cursor(response: Response, request: Request, order: str, next_key: Optional[tuple]):
+    # 본문 스키마를 바꾸지 않도록 다음 커서는 헤더로 전달
+    if next_key is None:
+        return
+    cursor = encode_cursor(order, next_key)
+    response.headers["X-Next-Cursor"] = cursor
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=cursor)}>; rel="next"'
+
+def stream_items(encoded: Iterable[bytes], fmt: str) -> StreamingResponse:
+    # 전체 목록을 만들지 않고 항목 단위로 인코딩된 JSON을 바로 내보낸다.
+    # async 모드에서는 청크마다 스레드풀을 거치지 않도록 루프에서 순회한다.
+    def ndjson() -> Iterator[bytes]:
+        for item in encoded:
+            yield item + b"\n"
+
+    def array() -> Iterator[bytes]:
+        yield b"["
+        first = True
+        for item in encoded:
+            yield item if first else b"," + item
+            first = False
+        yield b"]"
+
+    chunks = ndjson() if fmt == "ndjson" else array()
+    if API_MODE == "async":
+        chunks = iterate_inline(chunks)
+    return StreamingResponse(chunks, media_type="application/x-ndjson" if fmt == "ndjson" else "application/json")
+
+def iter_pages(fetch: Callable[[Optional[tuple], int], tuple], after: Optional[tuple]) -> Iterator[dict]:
+    # keyset 방식으로 청크 단위 조회를 이어가므로 순회 중 변경이 있어도 안전하다.
+    while True:
+        items, next_key = fetch(after, STREAM_CHUNK_SIZE)
+        yield from items
+        if next_key is None:
+            return
+        after = next_key
+
+def list_page(request: Request, response: Response, fetch: Callable, order: str, after: Optional[tuple],
+              limit: Optional[int], stream: Optional[str], encode: Callable[[dict], bytes]):
+    # stream 지정 시 StreamingResponse, 아니면 현재 페이지의 레코드 리스트를 돌려준다.
+    if stream and limit is None:
+        return stream_items(map(encode, iter_pages(fetch, after)), stream)
+    items, next_key = fetch(after, limit)
+    if stream:
+        response = stream_items(map(encode, items), stream)
+        set_next_cursor(response, request, order, next_key)
+        return response
+    set_next_cursor(response, request, order, next_key)
+    return items
+
+def page_ranked(ranked: List[tuple], after: Optional[tuple], limit: Optional[int]):
+    # ranked는 (-점수, id) 오름차순. 정렬 뷰와 같은 keyset 방식으로 after 다음부터 limit개를 돌려준다
+    start = bisect_right(ranked, after) if after is not None else 0
+    keys = ranked[start:] if limit is None else ranked[start:start + limit + 1]
+    next_key = None
+    if limit is not None and len(keys) > limit:
+        keys = keys[:limit]
+        next_key = keys[-1]
+    mentors = [fake_users_db.get_by_id(mentor_id) for _, mentor_id in keys]
+    return [m for m in mentors if m is not None], next_key
+
+def outgoing_to_dict(m: dict) -> dict:
+    return {"id": m["id"], "mentorId": m["mentorId"], "menteeId": m["menteeId"], "status": m["status"]}
+
+def page_match_requests(field: str, user_id: int, after: Optional[tuple], limit: Optional[int], status: Optional[str] = None):
+    return fake_match_requests.page_by(field, user_id, after[0] if after else 0, limit, status)
+
+def service_unavailable():
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy, please retry later",
+        headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+    )
+
 # --- 엔드포인트 ---
-@app.post("/api/signup", status_code=201, responses={
+@app.post("/api/signup", status_code=201, dependencies=[Depends(limit_signup)], responses={
     400: {"model": ErrorResponse},
+    429: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
+    503: {"model": ErrorResponse},
 })
-def signup(req: SignupRequest):
+async def signup(req: SignupRequest):
     try:
         if req.email in fake_users_db:
             raise HTTPException(status_code=400, detail="User already exists")
-        fake_users_db[req.email] = {
-            "id": len(fake_users_db) + 1,
+        with span("password_hash"):
+            hashed_password = await password_hasher.hash(req.password)
+        # id 발급과 이메일 중복 검사는 저장소가 원자적으로 처리한다
+        fake_users_db.create(req.email, lambda user_id: {
+            "id": user_id,
             "email": req.email,
-            "hashed_password": get_password_hash(req.password),
+            "hashed_password": hashed_password,
             "name": req.name,
             "role": req.role,
             "profile": {
                 "name": req.name,
                 "bio": "",
-                "imageUrl": f"/images/{req.role}/" + str(len(fake_users_db) + 1),
+                "imageUrl": f"/images/{req.role}/{user_id}",
                 "skills": [] if req.role == "mentor" else None
             }
-        }
+        })
         return Response(status_code=201)
     except HTTPException as e:
         raise e
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="User already exists")
+    except PoolOverloaded:
+        raise service_unavailable()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/login", response_model=LoginResponse, responses={
+@app.post("/api/login", response_model=LoginResponse, dependencies=[Depends(limit_login)], responses={
     400: {"model": ErrorResponse},
     401: {"model": ErrorResponse},
+    429: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
+    503: {"model": ErrorResponse},
 })
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     try:
         user = fake_users_db.get(form_data.username)
-        if not user or not verify_password(form_data.password, user["hashed_password"]):
+        if not user:
             raise HTTPException(status_code=401, detail="Incorrect email or password")
+        with span("password_hash"):
+            valid, new_hash = await password_hasher.verify_and_update(form_data.password, user["hashed_password"])
+        if not valid:
+            raise HTTPException(status_code=401, detail="Incorrect email or password")
+        # bcrypt cost 설정이 바뀌었으면 로그인 시점에 새 cost로 다시 해시.
+        # 해시하는 동안 들어온 프로필 변경을 덮어쓰지 않도록 읽어 둔 user 대신 저장소의 최신 레코드에서 해시만 바꾼다
+        if new_hash:
+            fake_users_db.update(form_data.username, lambda u: u.update(hashed_password=new_hash))
         token = create_access_token({"sub": user["email"]})
         return {"token": token}
     except HTTPException as e:
         raise e
+    except PoolOverloaded:
+        raise service_unavailable()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -215,34 +625,18 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
             }
         }
     },
+    304: {"description": "Not Modified"},
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
-def get_me(current_user: dict = Depends(get_current_user)):
+@endpoint
+def get_me(request: Request, current_user: dict = Depends(get_current_user)):
     try:
-        if current_user["role"] == "mentor":
-            return MentorProfile(
-                id=current_user["id"],
-                email=current_user["email"],
-                role="mentor",
-                profile=MentorProfileDetails(
-                    name=current_user["profile"]["name"],
-                    bio=current_user["profile"].get("bio", ""),
-                    imageUrl=current_user["profile"].get("imageUrl", ""),
-                    skills=current_user["profile"].get("skills", [])
-                )
-            )
-        else:
-            return MenteeProfile(
-                id=current_user["id"],
-                email=current_user["email"],
-                role="mentee",
-                profile=MenteeProfileDetails(
-                    name=current_user["profile"]["name"],
-                    bio=current_user["profile"].get("bio", ""),
-                    imageUrl=current_user["profile"].get("imageUrl", "")
-                )
-            )
+        # 프로필이 바뀌지 않았으면 직렬화 없이 304로 응답
+        etag = profile_etag(current_user)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": PROFILE_CACHE_CONTROL})
+        return profile_response(current_user)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -252,64 +646,106 @@ def get_me(current_user: dict = Depends(get_current_user)):
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
+@endpoint(offload=image_executor)
 def update_profile(
     data: dict,  # Union 대신 dict로 받고 내부에서 분기 처리
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        user = fake_users_db.get(current_user["email"])
-        if not user:
+        if current_user["email"] not in fake_users_db:
             raise HTTPException(status_code=401, detail="User not found")
-        # 이미지 저장(메모리)
+        # 문자열이 아닌 이름/스킬이 저장되면 멘토 정렬 뷰의 키를 비교할 수 없으므로 저장 전에 거절한다
+        skills = data.get("skills")
+        if not all(isinstance(data.get(field, ""), str) for field in ("name", "bio")) or \
+                (skills is not None and not (isinstance(skills, list) and all(isinstance(s, str) for s in skills))):
+            raise HTTPException(status_code=400, detail="Invalid profile")
         image = data.get("image")
         if image:
-            image_bytes = validate_profile_image(image)
-            user["profile"]["image_bytes"] = image_bytes
-        user["profile"]["name"] = data.get("name", user["profile"]["name"])
-        user["profile"]["bio"] = data.get("bio", user["profile"].get("bio", ""))
-        if user["role"] == "mentor":
-            user["profile"]["skills"] = data.get("skills", user["profile"].get("skills", []))
-            return MentorProfile(
-                id=user["id"],
-                email=user["email"],
-                role="mentor",
-                profile=MentorProfileDetails(
-                    name=user["profile"]["name"],
-                    bio=user["profile"].get("bio", ""),
-                    imageUrl=user["profile"].get("imageUrl", ""),
-                    skills=user["profile"].get("skills", [])
-                )
-            )
-        else:
-            return MenteeProfile(
-                id=user["id"],
-                email=user["email"],
-                role="mentee",
-                profile=MenteeProfileDetails(
-                    name=user["profile"]["name"],
-                    bio=user["profile"].get("bio", ""),
-                    imageUrl=user["profile"].get("imageUrl", "")
-                )
-            )
+            image = process_profile_image(validate_profile_image(image))
+
+        def apply(user: dict):
+            if image:
+                apply_profile_image(user, image)
+            user["profile"]["name"] = data.get("name", user["profile"]["name"])
+            user["profile"]["bio"] = data.get("bio", user["profile"].get("bio", ""))
+            if user["role"] == "mentor":
+                user["profile"]["skills"] = data.get("skills", user["profile"].get("skills", []))
+
+        user = fake_users_db.update(current_user["email"], apply)
+        if not user:
+            # 변환하는 사이 유저가 삭제되면 저장해 둔 변형을 프로필이 참조하지 않으므로 되돌린다
+            if image:
+                release_variants(image_store, image[1])
+            raise HTTPException(status_code=401, detail="User not found")
+        return profile_response(user)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.put("/api/profile/image", responses={
+    200: {"model": MentorProfile},  # MentorProfile 또는 MenteeProfile 중 하나로 지정
+    400: {"model": ErrorResponse},
+    401: {"model": ErrorResponse},
+    500: {"model": ErrorResponse},
+})
+@endpoint(offload=image_executor)
+def upload_profile_image(
+    image: UploadFile = File(...),  # base64 없이 multipart로 원본 바이트 업로드
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        if current_user["email"] not in fake_users_db:
+            raise HTTPException(status_code=401, detail="User not found")
+        processed = process_profile_image(read_profile_image_upload(image))
+        user = fake_users_db.update(current_user["email"], lambda user: apply_profile_image(user, processed))
+        if not user:
+            release_variants(image_store, processed[1])
+            raise HTTPException(status_code=401, detail="User not found")
+        return profile_response(user)
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/images/{role}/{id}", responses={
-    200: {"content": {"image/jpeg": {}}},
+    200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}},
+    304: {"description": "Not Modified"},
     401: {"model": ErrorResponse},
+    404: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
-def get_profile_image(role: str, id: int, current_user: dict = Depends(get_current_user)):
+@endpoint
+def get_profile_image(
+    role: str,
+    id: int,
+    request: Request,
+    size: str = Query("original", pattern="^(original|" + "|".join(map(str, THUMBNAIL_SIZES)) + ")$"),
+    format: Optional[str] = Query(None, pattern="^webp$"),
+    current_user: dict = Depends(get_current_user)
+):
     try:
-        for user in fake_users_db.values():
-            if user["role"] == role and user["id"] == id:
-                image_bytes = user["profile"].get("image_bytes")
-                if not image_bytes:
-                    raise HTTPException(status_code=404, detail="No image found")
-                return StreamingResponse(BytesIO(image_bytes), media_type="image/jpeg")
-        raise HTTPException(status_code=404, detail="User not found")
+        user = fake_users_db.get_by_role(role, id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        variants = user["profile"].get("image_variants")
+        if not variants:
+            raise HTTPException(status_code=404, detail="No image found")
+        # format 미지정 시 업로드된 원본 포맷(jpeg/png)으로 응답
+        fmt = format or user["profile"]["image_format"]
+        digest = variants.get(variant_key(size, fmt))
+        if not digest:
+            raise HTTPException(status_code=404, detail="No image found")
+        headers = {"ETag": f'"{digest}"', "Cache-Control": IMAGE_CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        # 백엔드에 따라 메모리 bytes, FileResponse(sendfile), mmap 조각으로 응답
+        response = image_store.response(digest, MEDIA_TYPES[fmt], headers)
+        if response is None:
+            raise HTTPException(status_code=404, detail="No image found")
+        return response
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -318,57 +754,107 @@ def get_profile_image(role: str, id: int, current_user: dict = Depends(get_curre
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
-def get_mentors(skill: Optional[str] = None, order_by: Optional[str] = None, current_user: dict = Depends(get_current_user)):
+@endpoint
+def get_mentors(
+    request: Request,
+    response: Response,
+    skill: Optional[str] = None,
+    order_by: Optional[str] = None,
+    match: str = Query("any", pattern="^(any|all)$"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[str] = Query(None, pattern="^(ndjson|json)$"),
+    q: Optional[str] = Query(None, max_length=200),
+    current_user: dict = Depends(get_current_user)
+):
     try:
         if current_user["role"] != "mentee":
             raise HTTPException(status_code=401, detail="Only mentee can access mentor list")
-        mentors = [u for u in fake_users_db.values() if u["role"] == "mentor"]
-        if skill:
-            mentors = [m for m in mentors if skill in (m["profile"].get("skills") or [])]
-        if order_by == "skill":
-            mentors.sort(key=lambda m: (m["profile"].get("skills") or [""])[0])
-        elif order_by == "name":
-            mentors.sort(key=lambda m: m["profile"].get("name", ""))
+        # skill은 콤마로 여러 개 지정 가능 (match=any: OR, match=all: AND, 대소문자 무시)
+        skills = skill.split(",") if skill else None
+        encode = profile_cache.fragment
+        if q:
+            # 이름/소개글/스킬 전문 검색: BM25 관련도 순 (마지막 단어는 접두어 일치), order_by는 무시
+            order = "relevance"
+            after = decode_cursor(cursor, order, (float, int))
+            with span("search"):
+                ranked = [(-score, mentor_id) for score, mentor_id in search_index.search(q, skills, match)]
+            fetch = lambda after, limit: page_ranked(ranked, after, limit)
         else:
-            mentors.sort(key=lambda m: m["id"])
-        result = [MentorProfile(
-            id=m["id"],
-            email=m["email"],
-            role="mentor",
-            profile=MentorProfileDetails(
-                name=m["profile"]["name"],
-                bio=m["profile"].get("bio", ""),
-                imageUrl=m["profile"].get("imageUrl", ""),
-                skills=m["profile"].get("skills", [])
-            )
-        ) for m in mentors]
-        return result
+            order = order_by if order_by in SORT_KEYS else DEFAULT_ORDER
+            after = decode_cursor(cursor, order, (int, int) if order == "id" else (str, int))
+            catalog = mentor_catalog.current() if mentor_catalog is not None else None
+            if catalog is not None:
+                # 공유 카탈로그는 프로필 JSON 조각을 바로 돌려준다 (스트리밍 중에도 같은 버전을 읽는다)
+                fetch = lambda after, limit: catalog.page(skills, match, order, after, limit)
+                encode = bytes
+            else:
+                fetch = lambda after, limit: fake_users_db.mentors.page(skills, match, order, after, limit)
+        mentors = list_page(request, response, fetch, order, after, limit, stream, encode)
+        if stream:
+            return mentors
+        # 캐시된 유저별 JSON 조각을 이어 붙여 모델 생성/검증 없이 바로 응답한다
+        with span("serialize"):
+            return json_response(json_array(map(encode, mentors)), response)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/mentors/recommendations", response_model=List[MentorRecommendation], responses={
+    401: {"model": ErrorResponse},
+    500: {"model": ErrorResponse},
+})
+@endpoint
+def recommend_mentors(
+    skills: Optional[str] = None,
+    bio: Optional[str] = Query(None, max_length=2000),
+    limit: int = Query(RECOMMEND_DEFAULT_LIMIT, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    try:
+        if current_user["role"] != "mentee":
+            raise HTTPException(status_code=401, detail="Only mentee can access mentor list")
+        # skills는 콤마로 여러 개 지정, bio는 자유 텍스트(스킬 이름이 나오면 낮은 가중치로 반영)
+        wanted = skills.split(",") if skills else []
+        ranked = recommender.recommend(wanted, bio, limit)
+        with span("serialize"):
+            items = []
+            for mentor_id, score in ranked:
+                mentor = fake_users_db.get_by_id(mentor_id)
+                if mentor is None:
+                    continue
+                matched = recommender.matched_skills(mentor, wanted, bio)
+                items.append(b'{"mentor":%s,"score":%s,"matchedSkills":%s}' % (
+                    profile_cache.fragment(mentor), dumps(score), dumps(matched)))
+            return json_response(json_array(items))
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # --- 매칭 요청 관련 엔드포인트 ---
-@app.post("/api/match-requests", response_model=MatchRequest, responses={
+@app.post("/api/match-requests", response_model=MatchRequest, dependencies=[Depends(limit_match_create)], responses={
     400: {"model": ErrorResponse},
     401: {"model": ErrorResponse},
+    429: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
+@endpoint
 def create_match_request(req: MatchRequestCreate, current_user: dict = Depends(get_current_user)):
     try:
         if current_user["role"] != "mentee":
             raise HTTPException(status_code=401, detail="Only mentee can send match requests")
-        mentor = next((u for u in fake_users_db.values() if u["id"] == req.mentorId and u["role"] == "mentor"), None)
+        mentor = fake_users_db.get_by_role("mentor", req.mentorId)
         if not mentor:
             raise HTTPException(status_code=400, detail="Mentor not found")
-        match_id = len(fake_match_requests) + 1
-        match = {
+        return fake_match_requests.create(lambda match_id: {
             "id": match_id,
             "mentorId": req.mentorId,
             "menteeId": req.menteeId,
             "message": req.message,
             "status": "pending"
-        }
-        fake_match_requests[match_id] = match
-        return match
+        })
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -378,11 +864,24 @@ def create_match_request(req: MatchRequestCreate, current_user: dict = Depends(g
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
-def get_incoming_match_requests(current_user: dict = Depends(get_current_user)):
+@endpoint
+def get_incoming_match_requests(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[str] = Query(None, pattern="^(ndjson|json)$"),
+    status_filter: Optional[str] = Query(None, alias="status", pattern=MATCH_STATUS_PATTERN),
+    current_user: dict = Depends(get_current_user)
+):
     try:
         if current_user["role"] != "mentor":
             raise HTTPException(status_code=401, detail="Only mentor can view incoming requests")
-        return [m for m in fake_match_requests.values() if m["mentorId"] == current_user["id"]]
+        after = decode_cursor(cursor, "id", (int,))
+        fetch = lambda after, limit: page_match_requests("mentorId", current_user["id"], after, limit, status_filter)
+        return list_page(request, response, fetch, "id", after, limit, stream, dumps)
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -390,27 +889,55 @@ def get_incoming_match_requests(current_user: dict = Depends(get_current_user)):
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
-def get_outgoing_match_requests(current_user: dict = Depends(get_current_user)):
+@endpoint
+def get_outgoing_match_requests(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[str] = Query(None, pattern="^(ndjson|json)$"),
+    status_filter: Optional[str] = Query(None, alias="status", pattern=MATCH_STATUS_PATTERN),
+    current_user: dict = Depends(get_current_user)
+):
     try:
         if current_user["role"] != "mentee":
             raise HTTPException(status_code=401, detail="Only mentee can view outgoing requests")
-        return [MatchRequestOutgoing(**{k: v for k, v in m.items() if k in ["id", "mentorId", "menteeId", "status"]}) for m in fake_match_requests.values() if m["menteeId"] == current_user["id"]]
+        after = decode_cursor(cursor, "id", (int,))
+        fetch = lambda after, limit: page_match_requests("menteeId", current_user["id"], after, limit, status_filter)
+        matches = list_page(request, response, fetch, "id", after, limit, stream, lambda m: dumps(outgoing_to_dict(m)))
+        if stream:
+            return matches
+        return [MatchRequestOutgoing(**outgoing_to_dict(m)) for m in matches]
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/match-requests/events", responses={
+    200: {"content": {"text/event-stream": {}}, "description": "match_request.created / match_request.updated 이벤트 스트림"},
+    401: {"model": ErrorResponse},
+})
+async def match_request_events(current_user: dict = Depends(get_stream_user)):
+    # 폴링 대신 본인이 멘토/멘티인 매칭 요청의 생성·상태 변경을 SSE로 받는다
+    return StreamingResponse(
+        sse_stream(event_broker, [user_channel(current_user["id"])]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.put("/api/match-requests/{id}/accept", response_model=MatchRequest, responses={
     404: {"model": ErrorResponse},
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
+@endpoint
 def accept_match_request(id: int, current_user: dict = Depends(get_current_user)):
     try:
         if current_user["role"] != "mentor":
             raise HTTPException(status_code=401, detail="Only mentor can accept requests")
-        match = fake_match_requests.get(id)
+        match = fake_match_requests.update(id, lambda match: match.update(status="accepted"))
         if not match:
             raise HTTPException(status_code=404, detail="Match request not found")
-        match["status"] = "accepted"
         return match
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -420,14 +947,14 @@ def accept_match_request(id: int, current_user: dict = Depends(get_current_user)
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
+@endpoint
 def reject_match_request(id: int, current_user: dict = Depends(get_current_user)):
     try:
         if current_user["role"] != "mentor":
             raise HTTPException(status_code=401, detail="Only mentor can reject requests")
-        match = fake_match_requests.get(id)
+        match = fake_match_requests.update(id, lambda match: match.update(status="rejected"))
         if not match:
             raise HTTPException(status_code=404, detail="Match request not found")
-        match["status"] = "rejected"
         return match
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -437,22 +964,143 @@ def reject_match_request(id: int, current_user: dict = Depends(get_current_user)
     401: {"model": ErrorResponse},
     500: {"model": ErrorResponse},
 })
+@endpoint
 def cancel_match_request(id: int, current_user: dict = Depends(get_current_user)):
     try:
         if current_user["role"] != "mentee":
             raise HTTPException(status_code=401, detail="Only mentee can cancel requests")
-        match = fake_match_requests.get(id)
+        match = fake_match_requests.update(id, lambda match: match.update(status="cancelled"))
         if not match:
             raise HTTPException(status_code=404, detail="Match request not found")
-        match["status"] = "cancelled"
         return match
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- 매칭 요청 일괄 처리 ---
+# 인증 한 번으로 여러 요청의 상태를 바꾸고 항목별 결과를 한 응답으로 돌려준다.
+# 단건 엔드포인트와 달리 본인이 멘토(수락/거절) 또는 멘티(취소)인 요청만 변경한다.
+def bulk_update_status(ids: List[int], owner_field: str, user_id: int, new_status: str) -> dict:
+    forbidden = set()
+
+    def change(match: dict) -> bool:
+        if match[owner_field] != user_id:
+            forbidden.add(match["id"])
+            return False
+        match["status"] = new_status
+        return True
+
+    matches = fake_match_requests.update_many(ids, change)
+    results = []
+    for match_id, match in matches.items():
+        if match is None:
+            results.append({"id": match_id, "result": "not_found"})
+        elif match_id in forbidden:
+            results.append({"id": match_id, "result": "forbidden"})
+        else:
+            results.append({"id": match_id, "result": "ok", "matchRequest": match})
+    succeeded = sum(1 for item in results if item["result"] == "ok")
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+@app.post("/api/match-requests/bulk/accept", response_model=MatchRequestBulkResponse, responses={
+    401: {"model": ErrorResponse},
+    500: {"model": ErrorResponse},
+})
+@endpoint
+def bulk_accept_match_requests(req: MatchRequestBulk, current_user: dict = Depends(get_current_user)):
+    try:
+        if current_user["role"] != "mentor":
+            raise HTTPException(status_code=401, detail="Only mentor can accept requests")
+        return bulk_update_status(req.ids, "mentorId", current_user["id"], "accepted")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/match-requests/bulk/reject", response_model=MatchRequestBulkResponse, responses={
+    401: {"model": ErrorResponse},
+    500: {"model": ErrorResponse},
+})
+@endpoint
+def bulk_reject_match_requests(req: MatchRequestBulk, current_user: dict = Depends(get_current_user)):
+    try:
+        if current_user["role"] != "mentor":
+            raise HTTPException(status_code=401, detail="Only mentor can reject requests")
+        return bulk_update_status(req.ids, "mentorId", current_user["id"], "rejected")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/match-requests/bulk/cancel", response_model=MatchRequestBulkResponse, responses={
+    401: {"model": ErrorResponse},
+    500: {"model": ErrorResponse},
+})
+@endpoint
+def bulk_cancel_match_requests(req: MatchRequestBulk, current_user: dict = Depends(get_current_user)):
+    try:
+        if current_user["role"] != "mentee":
+            raise HTTPException(status_code=401, detail="Only mentee can cancel requests")
+        return bulk_update_status(req.ids, "menteeId", current_user["id"], "cancelled")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# --- 메트릭 / 프로파일러 ---
+@app.get("/metrics", include_in_schema=False)
+@endpoint
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@endpoint
+def require_admin(request: Request):
+    # METRICS_ADMIN_TOKEN이 없으면 디버그 엔드포인트 자체를 숨긴다
+    if not METRICS_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if request.headers.get("X-Admin-Token") != METRICS_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+def debug_state() -> dict:
+    return {"profiler": profiler.enabled, "slow_ms": profiler.slow_ms, "spans": spans.enabled}
+
+@app.post("/debug/profiler", include_in_schema=False, dependencies=[Depends(require_admin)])
+@endpoint
+def toggle_debug(
+    profile: Optional[bool] = None,
+    slow_ms: Optional[float] = Query(None, ge=0),
+    span_timers: Optional[bool] = Query(None, alias="spans"),
+):
+    if slow_ms is not None:
+        profiler.slow_ms = slow_ms
+    if profile is True:
+        profiler.start()
+    elif profile is False:
+        profiler.stop()
+    if span_timers is not None:
+        spans.enabled = span_timers
+    return debug_state()
+
+@app.get("/debug/profiles", include_in_schema=False, dependencies=[Depends(require_admin)])
+@endpoint
+def list_profiles():
+    return {**debug_state(), "profiles": [
+        {k: v for k, v in p.items() if k != "folded"} for p in reversed(profiler.profiles)]}
+
+@app.get("/debug/profiles/{id}", include_in_schema=False, dependencies=[Depends(require_admin)])
+@endpoint
+def get_profile(id: int):
+    # folded stack 텍스트 (flamegraph.pl, speedscope에 바로 넣을 수 있음)
+    for p in profiler.profiles:
+        if p["id"] == id:
+            return PlainTextResponse(p["folded"])
+    raise HTTPException(status_code=404, detail="Profile not found")
+
 @app.get("/", include_in_schema=False)
+@endpoint
 def root():
     return RedirectResponse(url="/swagger-ui")
 
 @app.get("/swagger-ui", include_in_schema=False)
+@endpoint
 def swagger_ui():
     return get_swagger_ui_html(openapi_url="/openapi.json", title="Swagger UI")
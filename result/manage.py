@@ -0,0 +1,419 @@
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+
+from images import IMAGE_STORE, IMAGE_STORE_PATH, create_image_store
+from journal import JOURNAL_DIR, JOURNAL_ENABLED, open_journal, read_state
+from passwords import PASSWORD_HASH_WORKERS, hash_password
+from store import SQLITE_PATH, STORAGE_BACKEND, DuplicateKeyError, create_stores
+
+# --- 가져오기/내보내기 설정 ---
+# API를 거치지 않고 저장소에 직접 배치 단위로 적재한다. 입력은 한 줄(행)씩 읽어 배치 크기만큼만 메모리에 둔다.
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "10000"))
+USER_FIELDS = ["id", "email", "name", "role", "hashed_password", "bio", "skills"]
+MATCH_FIELDS = ["id", "mentorId", "menteeId", "message", "status"]
+ROLES = ("mentor", "mentee")
+MATCH_STATUSES = ("pending", "accepted", "rejected", "cancelled")
+# 서버 가입과 id가 겹친 행을 새 id로 다시 넣는 횟수
+INSERT_RETRIES = 5
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+# --- 입출력 형식 (NDJSON / CSV) ---
+def detect_format(path: str, fmt: Optional[str]) -> str:
+    return fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+
+
+@contextmanager
+def open_input(path: str):
+    if path == "-":
+        yield io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+        return
+    with open(path, encoding="utf-8", newline="") as f:
+        yield f
+
+
+@contextmanager
+def open_output(path: str):
+    if path == "-":
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+    with open(path, "wb") as f:
+        yield f
+
+
+def read_rows(f, fmt: str) -> Iterator[Tuple[int, dict]]:
+    # (줄 번호, 행). CSV 값은 모두 문자열이므로 변환은 *_from_row에서 한다
+    if fmt == "csv":
+        for line, row in enumerate(csv.DictReader(f), 2):
+            yield line, row
+        return
+    for line, text in enumerate(f, 1):
+        if text.strip():
+            try:
+                yield line, orjson.loads(text)
+            except orjson.JSONDecodeError:
+                yield line, None
+
+
+def write_rows(f, fmt: str, fields: List[str], rows: Iterable[dict]) -> int:
+    count = 0
+    if fmt == "csv":
+        text = io.TextIOWrapper(f, encoding="utf-8", newline="", write_through=True)
+        writer = csv.DictWriter(text, fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: ",".join(v) if isinstance(v, list) else v for k, v in row.items()})
+            count += 1
+        text.detach()
+        return count
+    for row in rows:
+        f.write(orjson.dumps(row) + b"\n")
+        count += 1
+    return count
+
+
+def batches(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+# --- 행 <-> 레코드 ---
+def _optional_int(value, field: str) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise InvalidRow(f"{field} must be an integer")
+
+
+def _required(row: dict, field: str) -> str:
+    value = row.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise InvalidRow(f"{field} is required")
+    return value.strip()
+
+
+def user_from_row(row: Optional[dict]) -> dict:
+    # 가입 API와 같은 모양의 유저. 평문 password는 해시 전까지 "password" 키에 둔다
+    if not isinstance(row, dict):
+        raise InvalidRow("not an object")
+    email = _required(row, "email")
+    if "@" not in email:
+        raise InvalidRow("invalid email")
+    role = _required(row, "role")
+    if role not in ROLES:
+        raise InvalidRow("role must be mentor or mentee")
+    skills = row.get("skills") or []
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(",") if s.strip()]
+    user = {
+        "id": _optional_int(row.get("id"), "id"),
+        "email": email,
+        "hashed_password": row.get("hashed_password") or None,
+        "name": _required(row, "name"),
+        "role": role,
+        "profile": {"bio": row.get("bio") or "", "skills": skills if role == "mentor" else None},
+    }
+    if not user["hashed_password"]:
+        user["password"] = _required(row, "password")
+    return user
+
+
+def finish_user(user: dict, user_id: int) -> dict:
+    user["id"] = user_id
+    user["profile"] = {"name": user["name"], "bio": user["profile"]["bio"], "imageUrl": f"/images/{user['role']}/{user_id}",
+                       "skills": user["profile"]["skills"]}
+    return user
+
+
+def user_to_row(user: dict) -> dict:
+    profile = user["profile"]
+    return {"id": user["id"], "email": user["email"], "name": user["name"], "role": user["role"],
+            "hashed_password": user["hashed_password"], "bio": profile.get("bio", ""),
+            "skills": profile.get("skills") or []}
+
+
+def match_from_row(row: Optional[dict]) -> dict:
+    if not isinstance(row, dict):
+        raise InvalidRow("not an object")
+    status = row.get("status") or "pending"
+    if status not in MATCH_STATUSES:
+        raise InvalidRow(f"status must be one of {', '.join(MATCH_STATUSES)}")
+    mentor_id, mentee_id = _optional_int(row.get("mentorId"), "mentorId"), _optional_int(row.get("menteeId"), "menteeId")
+    if mentor_id is None or mentee_id is None:
+        raise InvalidRow("mentorId and menteeId are required")
+    return {"id": _optional_int(row.get("id"), "id"), "mentorId": mentor_id, "menteeId": mentee_id,
+            "message": row.get("message") or "", "status": status}
+
+
+def match_to_row(match: dict) -> dict:
+    return {field: match[field] for field in MATCH_FIELDS}
+
+
+# --- 가져오기 ---
+# 배치마다 검증 -> 이미 있는 키 제외 -> (필요하면) 프로세스 풀에서 bcrypt -> id 발급 -> insert_many 한 번.
+# 잘못된 행은 줄 번호와 함께 보고하고 건너뛴다. 실행 중인 서버가 같은 키를 먼저 넣어 배치가 충돌하면
+# 그 배치만 한 건씩 다시 넣는다.
+class Importer:
+    def __init__(self, users, matches, batch_size: int = IMPORT_BATCH_SIZE, workers: int = PASSWORD_HASH_WORKERS,
+                 errors=None):
+        self.users = users
+        self.matches = matches
+        self.batch_size = batch_size
+        self.workers = workers
+        self.errors = errors
+        self.skipped = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # (role, 유저 id) -> 존재 여부. 매칭 요청마다 유저를 다시 읽지 않도록 기억한다
+        self._roles: Dict[Tuple[str, int], bool] = {}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def skip(self, line: int, reason: str):
+        self.skipped += 1
+        print(f"line {line}: skipped: {reason}", file=self.errors or sys.stderr)
+
+    def hash_passwords(self, passwords: List[str]) -> List[str]:
+        if self.workers <= 1 or len(passwords) <= 1:
+            return [hash_password(p) for p in passwords]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        chunk = max(1, len(passwords) // (self.workers * 4))
+        return list(self._pool.map(hash_password, passwords, chunksize=chunk))
+
+    def has_role(self, role: str, user_id: int) -> bool:
+        key = (role, user_id)
+        known = self._roles.get(key)
+        if known is None:
+            known = self._roles[key] = self.users.get_by_role(role, user_id) is not None
+        return known
+
+    def import_users(self, rows: Iterable[Tuple[int, dict]]) -> int:
+        imported = 0
+        for batch in batches(rows, self.batch_size):
+            valid: List[Tuple[int, dict]] = []
+            seen = set()
+            for line, row in batch:
+                try:
+                    user = user_from_row(row)
+                except InvalidRow as e:
+                    self.skip(line, str(e))
+                    continue
+                if user["email"] in seen or user["email"] in self.users:
+                    self.skip(line, f"{user['email']} already exists")
+                    continue
+                seen.add(user["email"])
+                valid.append((line, user))
+            plain = [user for _, user in valid if "password" in user]
+            for user, hashed in zip(plain, self.hash_passwords([u.pop("password") for u in plain])):
+                user["hashed_password"] = hashed
+            imported += self._insert(valid, self.users, finish_user)
+        return imported
+
+    def import_matches(self, rows: Iterable[Tuple[int, dict]]) -> int:
+        imported = 0
+        for batch in batches(rows, self.batch_size):
+            valid: List[Tuple[int, dict]] = []
+            for line, row in batch:
+                try:
+                    match = match_from_row(row)
+                except InvalidRow as e:
+                    self.skip(line, str(e))
+                    continue
+                if not self.has_role("mentor", match["mentorId"]):
+                    self.skip(line, f"mentor {match['mentorId']} not found")
+                elif not self.has_role("mentee", match["menteeId"]):
+                    self.skip(line, f"mentee {match['menteeId']} not found")
+                elif match["id"] is not None and match["id"] in self.matches:
+                    self.skip(line, f"match request {match['id']} already exists")
+                else:
+                    valid.append((line, match))
+            imported += self._insert(valid, self.matches, lambda match, match_id: dict(match, id=match_id))
+        return imported
+
+    def _insert(self, valid: List[Tuple[int, dict]], store, finish: Callable[[dict, int], dict]) -> int:
+        # id가 없는 행은 저장소의 마지막 id 다음부터 차례로 붙인다
+        explicit = max([0] + [record["id"] for _, record in valid if record["id"] is not None])
+        auto = [record["id"] is None for _, record in valid]
+        next_id = max(store.last_id(), explicit)
+        records = []
+        for (_, record), assign in zip(valid, auto):
+            record_id = record["id"]
+            if assign:
+                next_id += 1
+                record_id = next_id
+            records.append(finish(record, record_id))
+        try:
+            return store.insert_many(records)
+        except DuplicateKeyError:
+            inserted = 0
+            for (line, _), record, assign in zip(valid, records, auto):
+                inserted += self._insert_one(line, record, assign, explicit, store, finish)
+            return inserted
+
+    def _insert_one(self, line: int, record: dict, assign: bool, explicit: int, store,
+                    finish: Callable[[dict, int], dict]) -> int:
+        # 실행 중인 서버가 가입을 받으며 같은 id를 먼저 썼을 수 있다.
+        # 입력에 id가 없던 행은 새 id로 다시 넣고, 이메일이나 입력에 적힌 id가 겹칠 때만 건너뛴다
+        for _ in range(INSERT_RETRIES):
+            try:
+                return store.insert_many([record])
+            except DuplicateKeyError as e:
+                if not assign or ("email" in record and record["email"] in store):
+                    self.skip(line, f"duplicate key {e}")
+                    return 0
+                record = finish(record, max(store.last_id(), explicit) + 1)
+        self.skip(line, "no free id")
+        return 0
+
+
+# --- 저장소 열기 ---
+@contextmanager
+def open_stores(args, write: bool):
+    # 메모리 백엔드는 저널 디렉터리가 곧 저장소다. 쓰기는 디렉터리 잠금이 필요하므로 서버를 멈춘 뒤 실행한다
+    if args.backend == "sqlite":
+        users, matches = create_stores("sqlite", args.sqlite_path)
+        try:
+            yield users, matches
+        finally:
+            users.db.close()
+        return
+    if not args.journal:
+        raise SystemExit("memory backend has nothing to import into or export from; set JOURNAL_ENABLED=1")
+    if not write:
+        yield None, None
+        return
+    users, matches = create_stores("memory")
+    journal = open_journal(users, matches, args.journal_dir)
+    try:
+        yield users, matches
+        if journal.since_snapshot >= journal.snapshot_min_records:
+            journal.snapshot()
+    finally:
+        journal.close()
+
+
+@contextmanager
+def point_in_time(args, users, matches):
+    # (유저 목록, 매칭 요청 목록)을 같은 시점 기준으로 돌려준다. 서버는 계속 쓸 수 있다
+    if args.backend == "sqlite":
+        with users.db.read_snapshot() as conn:
+            yield users.values(conn), matches.values(conn)
+        return
+    # 메모리 백엔드는 스냅샷과 저널을 모두 재생해 정렬하므로 전체 상태를 메모리에 올린다 (서버와 같은 크기)
+    state = read_state(args.journal_dir)
+    yield (sorted(state.users.values(), key=lambda u: u["id"]),
+           sorted(state.matches.values(), key=lambda m: m["id"]))
+
+
+# --- 명령 ---
+def cmd_import(args) -> int:
+    started = time.perf_counter()
+    with open_stores(args, write=True) as (users, matches):
+        importer = Importer(users, matches, args.batch_size, args.workers)
+        try:
+            for kind, path in (("users", args.users), ("matches", args.matches)):
+                if not path:
+                    continue
+                with open_input(path) as f:
+                    rows = read_rows(f, detect_format(path, args.format))
+                    count = importer.import_users(rows) if kind == "users" else importer.import_matches(rows)
+                print(f"{kind}: imported {count}", file=sys.stderr)
+        finally:
+            importer.close()
+    print(f"skipped {importer.skipped}, {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 1 if importer.skipped else 0
+
+
+def cmd_export(args) -> int:
+    with open_stores(args, write=False) as (users, matches):
+        with point_in_time(args, users, matches) as (user_rows, match_rows):
+            for kind, path, fields, records, to_row in (
+                ("users", args.users, USER_FIELDS, user_rows, user_to_row),
+                ("matches", args.matches, MATCH_FIELDS, match_rows, match_to_row),
+            ):
+                if not path:
+                    continue
+                with open_output(path) as f:
+                    count = write_rows(f, detect_format(path, args.format), fields, map(to_row, records))
+                print(f"{kind}: exported {count}", file=sys.stderr)
+    return 0
+
+
+def cmd_gc_images(args) -> int:
+    # 어떤 유저 프로필도 가리키지 않는 이미지 변형을 지운다. 서버는 계속 실행해도 된다
+    if args.image_store == "memory":
+        print("memory image store releases images on replace; nothing to collect", file=sys.stderr)
+        return 0
+    store = create_image_store(args.image_store, args.image_store_path)
+    since = store.mark()
+    # 업로드는 변형을 저장한 뒤 프로필을 바꾸므로, 기준점 직전에 저장된 변형이 프로필에 반영될 때까지 기다린다
+    time.sleep(args.grace)
+    live = set()
+    with open_stores(args, write=False) as (users, matches):
+        with point_in_time(args, users, matches) as (user_rows, _):
+            for user in user_rows:
+                live.update((user["profile"].get("image_variants") or {}).values())
+    removed = store.gc(live, since)
+    print(f"images: removed {removed}, referenced {len(live)}", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="유저/매칭 요청 대량 가져오기/내보내기 (NDJSON, CSV), 이미지 정리")
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default=STORAGE_BACKEND)
+    parser.add_argument("--sqlite-path", default=SQLITE_PATH)
+    parser.add_argument("--journal-dir", default=JOURNAL_DIR)
+    parser.add_argument("--journal", action=argparse.BooleanOptionalAction, default=JOURNAL_ENABLED,
+                        help="memory 백엔드의 저널 디렉터리 사용 (기본: JOURNAL_ENABLED)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("import", "파일에서 저장소로"), ("export", "저장소에서 파일로 (한 시점 기준)")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("--users", metavar="FILE", help="유저 파일 (- 는 표준 입출력)")
+        sub.add_argument("--matches", metavar="FILE", help="매칭 요청 파일 (- 는 표준 입출력)")
+        sub.add_argument("--format", choices=("ndjson", "csv"), help="기본: 확장자가 .csv면 csv, 아니면 ndjson")
+        if name == "import":
+            sub.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+            sub.add_argument("--workers", type=int, default=PASSWORD_HASH_WORKERS,
+                             help="평문 password 해시 프로세스 수 (1이면 현재 프로세스에서)")
+    sub = commands.add_parser("gc-images", help="참조되지 않는 프로필 이미지 정리 (blob 파일은 압축)")
+    sub.add_argument("--image-store", choices=("memory", "directory", "blob"), default=IMAGE_STORE)
+    sub.add_argument("--image-store-path", default=IMAGE_STORE_PATH)
+    sub.add_argument("--grace", type=float, default=5.0,
+                     help="기준점 이후 유저 목록을 읽기 전에 기다리는 시간(초). 진행 중인 업로드보다 길게")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "gc-images":
+        return cmd_gc_images(args)
+    if not args.users and not args.matches:
+        build_parser().error("--users or --matches is required")
+    return cmd_import(args) if args.command == "import" else cmd_export(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
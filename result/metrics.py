@@ -0,0 +1,328 @@
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import Counter as FrameCounter, deque
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+
+# --- 메트릭 설정 ---
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+# 하위 구간(span) 타이머는 기본으로 끄고 필요할 때만 켠다 (런타임 토글 가능)
+METRICS_SPANS = os.environ.get("METRICS_SPANS", "0") == "1"
+# 비어 있으면 /debug/* 엔드포인트를 노출하지 않는다
+METRICS_ADMIN_TOKEN = os.environ.get("METRICS_ADMIN_TOKEN", "")
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "500"))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "20"))
+
+# 초 단위 히스토그램 버킷 (Prometheus 기본값과 같은 구간)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# --- 메트릭 타입 ---
+# 라벨 값 튜플별로 값을 보관하고 Prometheus 텍스트 형식(0.0.4)으로 내보낸다.
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+# Counter/Gauge 공통: 직접 갱신하거나, collect 콜백으로 스크레이프 시점에 값을 읽어 온다 (캐시 통계 등)
+class _Value(Metric):
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 collect: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        if self._collect is not None:
+            items = list(self._collect().items())
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}" for labels, value in items
+        ]
+
+
+class Counter(_Value):
+    kind = "counter"
+
+
+class Gauge(_Value):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 -> [버킷별 개수..., +Inf 개수, 합계]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            slots = self._values.get(labels)
+            if slots is None:
+                slots = self._values[labels] = [0] * (len(self.buckets) + 2)
+            slots[i] += 1
+            slots[-1] += value
+
+    def count(self, *labels: str) -> int:
+        slots = self._values.get(labels)
+        return int(sum(slots[:-1])) if slots else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(slots)) for labels, slots in self._values.items()]
+        lines = self.header()
+        for labels, slots in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), slots[:-1]):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {int(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(slots[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {int(cumulative)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")))
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")))
+IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method",)))
+SPAN_LATENCY = registry.register(Histogram(
+    "app_span_duration_seconds", "Time spent in instrumented hot-path sections", ("span",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)))
+
+
+# --- 하위 구간 타이머 ---
+# spans.enabled가 꺼져 있으면 공유 no-op 객체를 돌려주므로 호출 비용은 속성 조회 한 번이다.
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        SPAN_LATENCY.observe(time.perf_counter() - self.start, self.name)
+        return False
+
+
+class SpanSwitch:
+    def __init__(self, enabled: bool = METRICS_SPANS):
+        self.enabled = enabled
+
+
+spans = SpanSwitch()
+_NOOP = _NoopSpan()
+
+
+def span(name: str):
+    return _Span(name) if spans.enabled else _NOOP
+
+
+# --- 샘플링 프로파일러 ---
+# 켜져 있는 동안 별도 스레드가 interval마다 모든 스레드의 스택을 샘플링해 진행 중인 요청에 붙인다.
+# 요청이 slow_ms보다 오래 걸리면 folded stack 형식(flamegraph.pl / speedscope 입력)으로 최근 N개를 보관한다.
+# 동시에 처리 중인 요청은 같은 샘플을 공유하므로, 느린 요청 하나를 격리해 볼 때 가장 정확하다.
+class SamplingProfiler:
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS, slow_ms: float = PROFILE_SLOW_MS,
+                 keep: int = PROFILE_KEEP):
+        self.interval = interval_ms / 1000
+        self.slow_ms = slow_ms
+        self.profiles: "deque[dict]" = deque(maxlen=keep)
+        self._active: Dict[int, FrameCounter] = {}
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._active.clear()
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def begin(self) -> Optional[int]:
+        if self._thread is None:
+            return None
+        token = next(self._ids)
+        with self._lock:
+            self._active[token] = FrameCounter()
+        return token
+
+    def end(self, token: Optional[int], method: str, path: str, duration: float):
+        if token is None:
+            return
+        with self._lock:
+            samples = self._active.pop(token, None)
+        if samples is None or duration * 1000 < self.slow_ms:
+            return
+        self.profiles.append({
+            "id": token,
+            "method": method,
+            "path": path,
+            "duration_ms": round(duration * 1000, 3),
+            "samples": sum(samples.values()),
+            "folded": "\n".join(f"{stack} {n}" for stack, n in samples.most_common()),
+        })
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                targets = list(self._active.values())
+            stacks = [_fold(top) for ident, top in sys._current_frames().items() if ident != own]
+            with self._lock:
+                for samples in targets:
+                    samples.update(stacks)
+
+
+def _fold(frame) -> str:
+    # 루트부터 "함수 (파일:시작줄)"을 ;로 이은 folded stack. 함수 단위로 합쳐지도록 시작 줄을 쓴다
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+profiler = SamplingProfiler()
+
+
+# --- ASGI 미들웨어 ---
+# BaseHTTPMiddleware 대신 순수 ASGI로 감싸 요청당 오버헤드를 최소화한다.
+# route 라벨은 라우팅 후 scope["route"]의 경로 템플릿을 써서 id별로 시계열이 늘지 않게 한다.
+class MetricsMiddleware:
+    def __init__(self, app, enabled: bool = METRICS_ENABLED):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+        token = profiler.begin()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            IN_FLIGHT.dec(method)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.observe(duration, method, route)
+            REQUESTS.inc(method, route, str(status_code))
+            profiler.end(token, method, scope.get("path", ""), duration)
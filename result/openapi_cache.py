@@ -0,0 +1,53 @@
+import os
+import sys
+from typing import Optional
+
+import orjson
+from fastapi import FastAPI
+
+# --- 미리 생성한 OpenAPI 스키마 ---
+# FastAPI는 첫 /openapi.json 요청 때 모든 라우트/모델을 훑어 스키마를 만든다.
+# 배포 전에 `python openapi_cache.py`로 파일을 만들어 두면 기동 시 읽기만 한다 (파일이 없으면 기존처럼 생성).
+# 라우트/모델을 바꾸면 다시 생성해야 하며, tests/test_startup.py가 파일이 최신인지 확인한다.
+OPENAPI_CACHE = os.environ.get("OPENAPI_CACHE", "1") == "1"
+OPENAPI_CACHE_PATH = os.environ.get(
+    "OPENAPI_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "openapi.generated.json"))
+
+
+def load(path: str = OPENAPI_CACHE_PATH) -> Optional[dict]:
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def build(app: FastAPI) -> dict:
+    # 캐시를 거치지 않고 현재 라우트로 새로 만든다
+    app.openapi_schema = None
+    return FastAPI.openapi(app)
+
+
+def write(app: FastAPI, path: str = OPENAPI_CACHE_PATH) -> dict:
+    schema = build(app)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2) + b"\n")
+    return schema
+
+
+def install(app: FastAPI, path: str = OPENAPI_CACHE_PATH, enabled: bool = OPENAPI_CACHE):
+    def openapi() -> dict:
+        if app.openapi_schema is None:
+            schema = load(path) if enabled else None
+            app.openapi_schema = schema if schema is not None else FastAPI.openapi(app)
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+if __name__ == "__main__":
+    from main import app
+
+    target = sys.argv[1] if len(sys.argv) > 1 else OPENAPI_CACHE_PATH
+    schema = write(app, target)
+    print(f"wrote {len(schema['paths'])} paths to {target}")
@@ -0,0 +1,112 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# --- 비밀번호 해시 설정 ---
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "64"))
+PASSWORD_HASH_RETRY_AFTER = int(os.environ.get("PASSWORD_HASH_RETRY_AFTER", "1"))
+
+_contexts: Dict[int, "CryptContext"] = {}
+
+
+def get_context(rounds: int = BCRYPT_ROUNDS) -> "CryptContext":
+    # min/max를 설정값으로 고정해 cost가 다른 기존 해시는 needs_update 대상이 된다.
+    # passlib/bcrypt는 처음 해시할 때(보통 워커 프로세스 안에서) 불러온다.
+    context = _contexts.get(rounds)
+    if context is None:
+        from passlib.context import CryptContext
+        context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        _contexts[rounds] = context
+    return context
+
+
+# 워커 프로세스에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 둔다)
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    return get_context(rounds).hash(password)
+
+
+def verify_and_update(password: str, hashed_password: str, rounds: int = BCRYPT_ROUNDS) -> Tuple[bool, Optional[str]]:
+    return get_context(rounds).verify_and_update(password, hashed_password)
+
+
+class PoolOverloaded(Exception):
+    pass
+
+
+# --- 해시 전용 워커 풀 ---
+# 크기가 제한된 프로세스 풀에서 bcrypt를 실행하고,
+# 대기 중인 작업이 max_pending 이상이면 즉시 PoolOverloaded로 거절한다.
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING,
+                 rounds: int = BCRYPT_ROUNDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        # 스레드가 여럿인 서버 프로세스를 fork 하면 다른 스레드가 잡고 있던 락이 자식에 복사되므로 spawn으로 띄운다
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=max(1, self.workers),
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _discard(self, executor: Executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PoolOverloaded()
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                executor = self._get_executor()
+                try:
+                    return await loop.run_in_executor(executor, fn, *args)
+                except BrokenProcessPool:
+                    # 워커 하나가 죽으면(OOM 등) 풀 전체를 쓸 수 없으므로 버리고 새 풀에서 한 번 더 시도한다
+                    self._discard(executor)
+                    if attempt:
+                        raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run(verify_and_update, password, hashed_password, self.rounds)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
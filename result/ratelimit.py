@@ -0,0 +1,180 @@
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+
+# --- 요청 제한 설정 ---
+# 한도는 "개수/초" 형식 (예: "10/60"은 60초에 10번, 순간적으로는 최대 10번까지 허용). 비우거나 0이면 해당 한도를 끈다.
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.environ.get("RATE_LIMIT_SQLITE_PATH", os.environ.get("SQLITE_PATH", "data/app.db"))
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000"))
+# 리버스 프록시 뒤에서만 켠다. 켜면 X-Forwarded-For의 첫 주소를 클라이언트 IP로 쓴다
+RATE_LIMIT_TRUST_PROXY = os.environ.get("RATE_LIMIT_TRUST_PROXY", "0") == "1"
+RATE_LIMIT_LOGIN_IP = os.environ.get("RATE_LIMIT_LOGIN_IP", "30/60")
+RATE_LIMIT_LOGIN_EMAIL = os.environ.get("RATE_LIMIT_LOGIN_EMAIL", "10/60")
+RATE_LIMIT_SIGNUP_IP = os.environ.get("RATE_LIMIT_SIGNUP_IP", "10/60")
+RATE_LIMIT_MATCH_USER = os.environ.get("RATE_LIMIT_MATCH_USER", "30/60")
+
+
+class Rate(NamedTuple):
+    capacity: float
+    per_second: float
+
+
+def parse_rate(value: str) -> Optional[Rate]:
+    if not value or value.strip() == "0":
+        return None
+    count, _, period = value.partition("/")
+    capacity, seconds = float(count), float(period or 1)
+    if capacity <= 0 or seconds <= 0:
+        return None
+    return Rate(capacity, capacity / seconds)
+
+
+def _refill(tokens: float, updated: float, now: float, rate: Rate) -> float:
+    return min(rate.capacity, tokens + max(0.0, now - updated) * rate.per_second)
+
+
+def _retry_after(tokens: float, rate: Rate) -> float:
+    # 토큰 1개가 찰 때까지 남은 시간 (0이면 허용)
+    return 0.0 if tokens >= 1 else (1 - tokens) / rate.per_second
+
+
+# --- 토큰 버킷 백엔드 ---
+# acquire는 버킷에서 토큰 1개를 꺼내면 0을, 모자라면 다시 시도할 수 있을 때까지의 초를 돌려준다.
+class RateLimitBackend(ABC):
+    @abstractmethod
+    def acquire(self, key: str, rate: Rate) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        raise NotImplementedError
+
+
+# 프로세스 내부 버킷. 키 수가 max_keys를 넘으면 가장 오래 쓰지 않은 버킷부터 버린다
+# (버려진 버킷은 다음 요청에서 가득 찬 상태로 다시 만들어진다).
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, rate: Rate) -> float:
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens = rate.capacity if bucket is None else _refill(bucket[0], bucket[1], now, rate)
+            wait = _retry_after(tokens, rate)
+            if not wait:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# 여러 워커 프로세스가 같은 파일의 버킷을 공유한다 (STORAGE_BACKEND=sqlite와 같은 DB를 써도 된다).
+# 시각은 프로세스 간에 비교할 수 있도록 wall clock을 쓴다.
+class SQLiteRateLimitBackend(RateLimitBackend):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS rate_limits (
+        key TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated REAL NOT NULL
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db, clock: Callable[[], float] = time.time):
+        self.db = db
+        self.clock = clock
+        db.connection().executescript(self.SCHEMA)
+
+    def acquire(self, key: str, rate: Rate) -> float:
+        now = self.clock()
+        with self.db.transaction() as conn:
+            row = conn.execute("SELECT tokens, updated FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            tokens = rate.capacity if row is None else _refill(row[0], row[1], now, rate)
+            wait = _retry_after(tokens, rate)
+            if not wait:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO rate_limits (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+        return wait
+
+    def prune(self, older_than: float):
+        # 오래 쓰지 않은 버킷(이미 가득 찼을 것)을 정리한다
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM rate_limits WHERE updated < ?", (self.clock() - older_than,))
+
+    def clear(self):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM rate_limits")
+
+
+def create_rate_limit_backend(kind: str = RATE_LIMIT_BACKEND, path: str = RATE_LIMIT_SQLITE_PATH) -> RateLimitBackend:
+    if kind == "memory":
+        return InMemoryRateLimitBackend()
+    if kind == "sqlite":
+        from sqlite_store import SQLiteDatabase
+        return SQLiteRateLimitBackend(SQLiteDatabase(path))
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+class RateLimited(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(name)
+        self.name = name
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+# --- 이름 붙은 한도 ---
+# check(key)는 한도를 넘으면 RateLimited를 던진다. 거절 횟수는 메트릭으로 내보낸다.
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend, enabled: bool = RATE_LIMIT_ENABLED):
+        self.backend = backend
+        self.enabled = enabled
+        self.rates: Dict[str, Optional[Rate]] = {}
+        self.rejected: Dict[str, int] = {}
+
+    def limit(self, name: str, rate: str) -> "RateLimiter":
+        self.rates[name] = parse_rate(rate)
+        self.rejected.setdefault(name, 0)
+        return self
+
+    def check(self, name: str, key: str):
+        rate = self.rates[name]
+        if not self.enabled or rate is None:
+            return
+        wait = self.backend.acquire(f"{name}:{key}", rate)
+        if wait:
+            self.rejected[name] += 1
+            raise RateLimited(name, wait)
+
+
+def client_ip(headers, client, trust_proxy: bool = RATE_LIMIT_TRUST_PROXY) -> str:
+    if trust_proxy:
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return client.host if client else "unknown"
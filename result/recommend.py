@@ -0,0 +1,231 @@
+import math
+import os
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from store import normalize_skill
+
+# --- 멘토 추천 설정 ---
+RECOMMEND_DEFAULT_LIMIT = int(os.environ.get("RECOMMEND_DEFAULT_LIMIT", "10"))
+# 소개글에서 찾은 스킬은 직접 고른 스킬보다 낮은 가중치로 반영한다
+RECOMMEND_BIO_WEIGHT = float(os.environ.get("RECOMMEND_BIO_WEIGHT", "0.5"))
+INITIAL_MENTORS = 1024
+INITIAL_SKILLS = 64
+
+_WORD = re.compile(r"[\w+#.]+")
+
+
+def bio_terms(bio: str) -> Set[str]:
+    # 소개글의 단어와 연속한 두 단어("spring boot")를 정규화해 스킬 후보로 쓴다
+    words = [w.strip(".") for w in _WORD.findall(bio.casefold())]
+    words = [w for w in words if w]
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+# --- 멘토 x 스킬 비트셋 행렬 ---
+# 스킬마다 멘토 열을 1비트로 표시한 행(np.packbits 형식)을 두고, 질의에 나온 스킬 행만 펼쳐
+# 가중치 벡터와 곱해 모든 멘토 점수를 한 번에 계산한다. 가중치는 희소한 스킬일수록 큰 IDF.
+# 수락된 매칭이 있는 멘토(한 번에 한 명만 수락 가능)는 같은 계산에서 마스크로 제외한다.
+# 유저/매칭 요청 저장소 리스너로 증분 갱신하며, 행렬은 첫 추천 요청 때 저장소에서 한 번 만든다.
+# numpy도 그때 불러온다 (기동 시간 절약).
+class MentorRecommender:
+    def __init__(self, loader: Callable[[], Tuple[Iterable[dict], Iterable[dict]]]):
+        # loader() -> (멘토 목록, 수락된 매칭 요청 목록)
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._built = False
+        # 행렬을 만드는 동안 들어온 변경 (만든 뒤 순서대로 반영)
+        self._events_lock = threading.Lock()
+        self._queued: Optional[List[tuple]] = None
+        self._skills: Dict[str, int] = {}
+        self._columns: Dict[int, int] = {}
+        self._mentor_skills: Dict[int, Set[int]] = {}
+        self._free: List[int] = []
+        self._used = 0
+        # 수락된 매칭 요청 id -> 멘토 id, 멘토 id -> 수락된 요청 수
+        self._accepted_matches: Dict[int, int] = {}
+        self._accepted_by_mentor: Dict[int, int] = {}
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            import numpy as np
+            self._bits = np.zeros((INITIAL_SKILLS, INITIAL_MENTORS // 8), dtype=np.uint8)
+            self._df = np.zeros(INITIAL_SKILLS, dtype=np.int32)
+            self._ids = np.zeros(INITIAL_MENTORS, dtype=np.int64)
+            self._available = np.zeros(INITIAL_MENTORS, dtype=bool)
+            with self._events_lock:
+                self._queued = []
+            try:
+                mentors, accepted = self._loader()
+                for match in accepted:
+                    self._set_accepted(match, True)
+                for mentor in mentors:
+                    self._put(mentor)
+                while True:
+                    with self._events_lock:
+                        queued, self._queued = self._queued, []
+                        if not queued:
+                            self._built = True
+                            return
+                    for apply, event, record in queued:
+                        apply(event, record)
+            finally:
+                with self._events_lock:
+                    self._queued = None
+
+    # --- 저장소 리스너 ---
+    # 만들기 전에는 무시하고(만들 때 저장소의 현재 상태를 읽는다), 만드는 중에는 대기열에 넣는다.
+    # 리스너는 저장소 락 안에서 불리고 만드는 쪽은 self._lock을 잡은 채 저장소를 읽으므로 여기서 self._lock을 기다리지 않는다.
+    def on_user_event(self, event: str, user: dict):
+        if self._accept(self._apply_user, event, user):
+            with self._lock:
+                self._apply_user(event, user)
+
+    def on_match_event(self, event: str, match: dict):
+        if self._accept(self._apply_match, event, match):
+            with self._lock:
+                self._apply_match(event, match)
+
+    def _accept(self, apply: Callable[[str, dict], None], event: str, record: dict) -> bool:
+        with self._events_lock:
+            if self._built:
+                return True
+            if self._queued is not None:
+                self._queued.append((apply, event, record))
+            return False
+
+    def _apply_user(self, event: str, user: dict):
+        if event == "delete" or user.get("role") != "mentor":
+            self._remove(user["id"])
+        else:
+            self._put(user)
+
+    def _apply_match(self, event: str, match: dict):
+        self._set_accepted(match, event != "delete" and match.get("status") == "accepted")
+
+    # --- 질의 ---
+    def query_weights(self, skills: Iterable[str], bio: Optional[str] = None) -> Dict[int, float]:
+        # 스킬 행 -> 가중치. 알 수 없는 스킬은 어떤 멘토와도 겹치지 않으므로 버린다.
+        weights: Dict[int, float] = {}
+        total = len(self._columns)
+        candidates = [(normalize_skill(s), 1.0) for s in skills if s.strip()]
+        if bio:
+            candidates += [(term, RECOMMEND_BIO_WEIGHT) for term in bio_terms(bio)]
+        for skill, scale in candidates:
+            row = self._skills.get(skill)
+            if row is None or not self._df[row]:
+                continue
+            idf = math.log((1 + total) / (1 + int(self._df[row]))) + 1
+            weights[row] = max(weights.get(row, 0.0), scale * idf)
+        return weights
+
+    def recommend(self, skills: Iterable[str], bio: Optional[str] = None,
+                  limit: int = RECOMMEND_DEFAULT_LIMIT) -> List[Tuple[int, float]]:
+        # [(멘토 id, 점수)]. 점수는 질의 가중치 합 대비 겹친 가중치 비율(0~1), 높은 순 / 같으면 id 순
+        import numpy as np
+        self.ensure_built()
+        with self._lock:
+            weights = self.query_weights(skills, bio)
+            if not weights or limit <= 0:
+                return []
+            rows = np.fromiter(weights, dtype=np.intp, count=len(weights))
+            w = np.fromiter(weights.values(), dtype=np.float32, count=len(weights)) / sum(weights.values())
+            hits = np.unpackbits(self._bits[rows, : -(-self._used // 8)], axis=1, count=self._used)
+            scores = w @ hits
+            scores[~self._available[: self._used]] = 0
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                # limit번째 점수와 같은 멘토는 모두 남겨 아래 정렬에서 id 순으로 자른다
+                top = scores[candidates]
+                cut = -np.partition(-top, limit - 1)[limit - 1]
+                candidates = candidates[top >= cut]
+            ids = self._ids[candidates]
+            order = np.lexsort((ids, -scores[candidates]))[:limit]
+            return [(int(ids[i]), round(float(scores[candidates[i]]), 6)) for i in order]
+
+    def matched_skills(self, mentor: dict, skills: Iterable[str], bio: Optional[str] = None) -> List[str]:
+        wanted = {normalize_skill(s) for s in skills if s.strip()}
+        if bio:
+            wanted |= bio_terms(bio)
+        return [s for s in (mentor["profile"].get("skills") or []) if normalize_skill(s) in wanted]
+
+    # --- 내부 갱신 (self._lock 안에서 호출) ---
+    def _put(self, mentor: dict):
+        mentor_id = mentor["id"]
+        rows = {self._skill_row(normalize_skill(s)) for s in (mentor["profile"].get("skills") or []) if s.strip()}
+        column = self._columns.get(mentor_id)
+        if column is None:
+            column = self._free.pop() if self._free else self._next_column()
+            self._columns[mentor_id] = column
+            self._ids[column] = mentor_id
+            self._mentor_skills[mentor_id] = set()
+        old = self._mentor_skills[mentor_id]
+        byte, mask = column >> 3, 0x80 >> (column & 7)
+        for row in old - rows:
+            self._bits[row, byte] &= ~mask & 0xFF
+            self._df[row] -= 1
+        for row in rows - old:
+            self._bits[row, byte] |= mask
+            self._df[row] += 1
+        self._mentor_skills[mentor_id] = rows
+        self._available[column] = not self._accepted_by_mentor.get(mentor_id)
+
+    def _remove(self, mentor_id: int):
+        column = self._columns.pop(mentor_id, None)
+        if column is None:
+            return
+        byte, mask = column >> 3, 0x80 >> (column & 7)
+        for row in self._mentor_skills.pop(mentor_id):
+            self._bits[row, byte] &= ~mask & 0xFF
+            self._df[row] -= 1
+        self._ids[column] = 0
+        self._available[column] = False
+        self._free.append(column)
+
+    def _set_accepted(self, match: dict, accepted: bool):
+        was = match["id"] in self._accepted_matches
+        if accepted == was:
+            return
+        mentor_id = self._accepted_matches.pop(match["id"]) if was else match["mentorId"]
+        count = self._accepted_by_mentor.get(mentor_id, 0) + (1 if accepted else -1)
+        if accepted:
+            self._accepted_matches[match["id"]] = mentor_id
+        if count:
+            self._accepted_by_mentor[mentor_id] = count
+        else:
+            self._accepted_by_mentor.pop(mentor_id, None)
+        column = self._columns.get(mentor_id)
+        if column is not None:
+            self._available[column] = not count
+
+    def _skill_row(self, skill: str) -> int:
+        row = self._skills.get(skill)
+        if row is None:
+            import numpy as np
+            row = self._skills[skill] = len(self._skills)
+            if row >= len(self._df):
+                self._bits = np.concatenate([self._bits, np.zeros_like(self._bits)])
+                self._df = np.concatenate([self._df, np.zeros_like(self._df)])
+        return row
+
+    def _next_column(self) -> int:
+        column = self._used
+        if column >= len(self._ids):
+            import numpy as np
+            self._bits = np.concatenate([self._bits, np.zeros_like(self._bits)], axis=1)
+            self._ids = np.concatenate([self._ids, np.zeros_like(self._ids)])
+            self._available = np.concatenate([self._available, np.zeros_like(self._available)])
+        self._used += 1
+        return column
@@ -0,0 +1,206 @@
+import math
+import os
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from store import normalize_skill
+
+# --- 멘토 검색 설정 ---
+# BM25 파라미터와 필드 가중치 (이름 > 스킬 > 소개글)
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"name": 3.0, "skills": 2.0, "bio": 1.0}
+# 입력 중인 마지막 단어를 접두어로 확장할 때 최대 몇 개의 색인어까지 볼지
+SEARCH_PREFIX_EXPANSIONS = int(os.environ.get("SEARCH_PREFIX_EXPANSIONS", "32"))
+
+_HANGUL = "가-힣"
+_TOKEN = re.compile(rf"([{_HANGUL}]+)|([^\W{_HANGUL}]+[+#]*)")
+
+
+def tokenize(text: str) -> List[List[str]]:
+    # 단어별 색인어 목록. 영문/숫자는 단어 그대로, 한글은 조사가 붙어도 찾을 수 있도록 음절 bigram으로 자른다
+    # ("파이썬을" -> 파이, 이썬, 썬을). 한 음절 단어는 그대로 둔다.
+    words = []
+    for hangul, other in _TOKEN.findall(text.casefold()):
+        if other:
+            words.append([other])
+        elif len(hangul) == 1:
+            words.append([hangul])
+        else:
+            words.append([hangul[i:i + 2] for i in range(len(hangul) - 1)])
+    return words
+
+
+def document_terms(mentor: dict) -> Dict[str, float]:
+    # 색인어 -> 필드 가중치를 반영한 빈도
+    profile = mentor["profile"]
+    fields = {
+        "name": profile.get("name", ""),
+        "bio": profile.get("bio", ""),
+        "skills": " ".join(normalize_skill(s) for s in (profile.get("skills") or [])),
+    }
+    terms: Dict[str, float] = {}
+    for field, text in fields.items():
+        weight = FIELD_WEIGHTS[field]
+        for word in tokenize(text or ""):
+            for term in word:
+                terms[term] = terms.get(term, 0.0) + weight
+    return terms
+
+
+# --- 멘토 역색인 ---
+# 색인어 -> {멘토 id: 가중 빈도} posting과 접두어 확장용 정렬된 색인어 목록을 증분으로 유지한다.
+# 질의의 모든 색인어(마지막 단어는 접두어 확장 중 하나)를 포함한 멘토만 BM25로 점수를 매기며,
+# 가장 희소한 색인어의 posting부터 교집합을 좁히므로 비용은 전체 멘토 수가 아니라 후보 수에 비례한다.
+# 유저 저장소 리스너로 갱신하고, 색인은 첫 검색 때 저장소에서 한 번 만든다.
+class MentorSearchIndex:
+    def __init__(self, loader: Callable[[], Iterable[dict]]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._built = False
+        # 색인을 만드는 동안 들어온 변경 (만든 뒤 순서대로 반영)
+        self._events_lock = threading.Lock()
+        self._queued: Optional[List[Tuple[str, dict]]] = None
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []
+        self._docs: Dict[int, Dict[str, float]] = {}
+        self._lengths: Dict[int, float] = {}
+        self._skills: Dict[int, Set[str]] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            with self._events_lock:
+                self._queued = []
+            try:
+                for mentor in self._loader():
+                    self._put(mentor)
+                while True:
+                    with self._events_lock:
+                        queued, self._queued = self._queued, []
+                        if not queued:
+                            self._built = True
+                            return
+                    for event, user in queued:
+                        self._apply(event, user)
+            finally:
+                with self._events_lock:
+                    self._queued = None
+
+    def on_user_event(self, event: str, user: dict):
+        # 만들기 전에는 무시하고, 만드는 중에는 대기열에 넣는다 (MentorRecommender와 같은 방식)
+        with self._events_lock:
+            if not self._built:
+                if self._queued is not None:
+                    self._queued.append((event, user))
+                return
+        with self._lock:
+            self._apply(event, user)
+
+    def _apply(self, event: str, user: dict):
+        self._remove(user["id"])
+        if event != "delete" and user.get("role") == "mentor":
+            self._put(user)
+
+    def search(self, query: str, skills: Optional[Iterable[str]] = None, match: str = "any",
+               prefix: bool = True) -> List[Tuple[float, int]]:
+        # [(점수, 멘토 id)] 점수 높은 순, 같으면 id 순. skills가 있으면 get_mentors와 같은 방식으로 거른다
+        self.ensure_built()
+        wanted = {normalize_skill(s) for s in (skills or []) if s.strip()}
+        with self._lock:
+            groups = self._query_groups(query, prefix)
+            if not groups or not self._docs:
+                return []
+            groups.sort(key=lambda group: sum(len(p) for _, p in group))
+            candidates = set().union(*(p.keys() for _, p in groups[0]))
+            for group in groups[1:]:
+                if len(group) == 1:
+                    candidates &= group[0][1].keys()
+                else:
+                    candidates &= set().union(*(p.keys() for _, p in group))
+                if not candidates:
+                    return []
+            if wanted:
+                test = wanted.issubset if match == "all" else wanted.intersection
+                candidates = {d for d in candidates if test(self._skills[d])}
+            count = len(self._docs)
+            average = self._total_length / count
+            results = []
+            for doc in candidates:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[doc] / average)
+                score = 0.0
+                for group in groups:
+                    best = 0.0
+                    for idf, postings in group:
+                        tf = postings.get(doc)
+                        if tf:
+                            best = max(best, idf * tf * (BM25_K1 + 1) / (tf + norm))
+                    score += best
+                results.append((round(score, 6), doc))
+            results.sort(key=lambda r: (-r[0], r[1]))
+            return results
+
+    def _query_groups(self, query: str, prefix: bool) -> List[List[Tuple[float, Dict[int, float]]]]:
+        # 색인어마다 (idf, posting) 후보 목록. 마지막 색인어는 접두어로 확장한다.
+        terms = list(dict.fromkeys(term for word in tokenize(query) for term in word))
+        groups = []
+        count = len(self._docs)
+        for i, term in enumerate(terms):
+            if prefix and i == len(terms) - 1:
+                expansions = self._expand(term)
+            else:
+                expansions = [term] if term in self._postings else []
+            if not expansions:
+                return []
+            groups.append([(self._idf(len(self._postings[t]), count), self._postings[t]) for t in expansions])
+        return groups
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect_left(self._terms, prefix)
+        expansions = []
+        for term in self._terms[start:start + SEARCH_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+    @staticmethod
+    def _idf(df: int, count: int) -> float:
+        return math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+    # --- 내부 갱신 (self._lock 안에서 호출) ---
+    def _put(self, mentor: dict):
+        mentor_id = mentor["id"]
+        terms = document_terms(mentor)
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[mentor_id] = tf
+        self._docs[mentor_id] = terms
+        self._lengths[mentor_id] = length = sum(terms.values())
+        self._total_length += length
+        self._skills[mentor_id] = {normalize_skill(s) for s in (mentor["profile"].get("skills") or [])}
+
+    def _remove(self, mentor_id: int):
+        terms = self._docs.pop(mentor_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[mentor_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+        self._total_length -= self._lengths.pop(mentor_id)
+        del self._skills[mentor_id]
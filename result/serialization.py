@@ -0,0 +1,91 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Tuple
+
+import orjson
+from fastapi.responses import Response
+
+# --- 프로필 JSON 조각 캐시 설정 ---
+PROFILE_CACHE_SIZE = int(os.environ.get("PROFILE_CACHE_SIZE", "50000"))
+
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj)
+
+
+def profile_dict(user: dict) -> dict:
+    # MentorProfile / MenteeProfile 스키마와 같은 모양 (멘티는 skills 없음)
+    profile = user["profile"]
+    details = {
+        "name": profile["name"],
+        "bio": profile.get("bio", ""),
+        "imageUrl": profile.get("imageUrl", ""),
+    }
+    if user["role"] == "mentor":
+        details["skills"] = profile.get("skills", [])
+    return {"id": user["id"], "email": user["email"], "role": user["role"], "profile": details}
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def json_response(body: bytes, response: Response = None) -> Response:
+    # 직접 만든 Response를 반환하면 FastAPI가 주입한 response의 헤더(X-Next-Cursor 등)를 합치지 않으므로 옮겨 준다
+    result = Response(content=body, media_type="application/json")
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
+
+
+# --- 유저별 프로필 JSON 조각 캐시 ---
+# 유저 id를 키로 (버전, profile_dict를 orjson으로 인코딩한 바이트)를 LRU로 보관한다.
+# 저장할 때마다 올라가는 유저 version이 일치할 때만 재사용하므로 오래된 사본이나
+# 다른 워커의 변경으로 만든 조각이 섞이지 않는다. 변경/삭제 리스너는 메모리만 정리한다.
+class ProfileFragmentCache:
+    def __init__(self, max_size: int = PROFILE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def fragment(self, user: dict) -> bytes:
+        user_id, version = user["id"], user.get("version", 0)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        data = dumps(profile_dict(user))
+        if self.max_size > 0:
+            with self._lock:
+                entry = self._entries.get(user_id)
+                # 더 새 버전이 먼저 저장됐으면 덮어쓰지 않는다
+                if entry is None or entry[0] <= version:
+                    self._entries[user_id] = (version, data)
+                    self._entries.move_to_end(user_id)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+        return data
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def on_user_event(self, event: str, user: dict):
+        if event == "delete":
+            self.invalidate(user["id"])
@@ -0,0 +1,479 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from store import DEFAULT_ORDER, SORT_KEYS, DuplicateKeyError, Observable, next_version, normalize_skill
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    role TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    first_skill TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_role_id ON users(role, id);
+CREATE INDEX IF NOT EXISTS idx_users_role_name ON users(role, name, id);
+CREATE INDEX IF NOT EXISTS idx_users_role_first_skill ON users(role, first_skill, id);
+CREATE TABLE IF NOT EXISTS mentor_skills (
+    skill TEXT NOT NULL,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    PRIMARY KEY (skill, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_mentor_skills_user ON mentor_skills(user_id);
+CREATE TABLE IF NOT EXISTS match_requests (
+    id INTEGER PRIMARY KEY,
+    mentor_id INTEGER NOT NULL,
+    mentee_id INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_match_mentor ON match_requests(mentor_id, id);
+CREATE INDEX IF NOT EXISTS idx_match_mentee ON match_requests(mentee_id, id);
+CREATE INDEX IF NOT EXISTS idx_match_mentor_status ON match_requests(mentor_id, status, id);
+CREATE INDEX IF NOT EXISTS idx_match_mentee_status ON match_requests(mentee_id, status, id);
+CREATE INDEX IF NOT EXISTS idx_match_status ON match_requests(status, id);
+"""
+
+# IN (...) 한 번에 넣는 바인딩 변수 수 (오래된 SQLite의 변수 개수 한도 999 이하)
+SQL_IN_CHUNK = 500
+
+# order_by -> 정렬 컬럼 (메모리 저장소의 SORT_KEYS와 같은 순서)
+SORT_COLUMNS = {"id": "id", "name": "name", "skill": "first_skill"}
+assert set(SORT_COLUMNS) == set(SORT_KEYS)
+
+
+# --- SQLite 연결 풀 ---
+# sqlite3 연결은 스레드 간 공유가 안전하지 않으므로 스레드마다 하나씩 열어 재사용한다.
+# 같은 SQL 문자열은 연결별 statement 캐시(cached_statements)로 한 번만 컴파일된다.
+class SQLiteDatabase:
+    def __init__(self, path: str, cached_statements: int = 256):
+        self.path = path
+        self.cached_statements = cached_statements
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, cached_statements=self.cached_statements, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        # 쓰기 락을 처음부터 잡아(BEGIN IMMEDIATE) 여러 워커 프로세스 사이의 read-modify-write를 직렬화한다.
+        conn = self.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+
+    @contextmanager
+    def read_snapshot(self) -> Iterator[sqlite3.Connection]:
+        # 한 시점의 읽기 전용 뷰. WAL에서는 첫 읽기 시점의 스냅샷을 트랜잭션 끝까지 보며 쓰기를 막지 않는다.
+        # 풀과 별개의 연결을 써서 같은 스레드의 다른 쓰기와 섞이지 않게 한다.
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            conn.execute("BEGIN")
+            conn.execute("SELECT COUNT(*) FROM meta").fetchone()
+            yield conn
+        finally:
+            conn.rollback()
+            conn.close()
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+def _load(row) -> Optional[dict]:
+    return json.loads(row[0]) if row else None
+
+
+# --- 멘토 조회 ---
+# 메모리 MentorIndex.page와 같은 의미의 조회를 인덱스를 타는 SQL로 수행한다.
+class SQLiteMentorIndex:
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def __len__(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM users WHERE role = 'mentor'").fetchone()[0]
+
+    def query(self, skills: Optional[Iterable[str]] = None, match: str = "any", order_by: Optional[str] = None) -> List[dict]:
+        return self.page(skills, match, order_by)[0]
+
+    def page(
+        self,
+        skills: Optional[Iterable[str]] = None,
+        match: str = "any",
+        order_by: Optional[str] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[tuple]]:
+        order = order_by if order_by in SORT_KEYS else DEFAULT_ORDER
+        column = SORT_COLUMNS[order]
+        skills = sorted({normalize_skill(s) for s in (skills or []) if s.strip()})
+        sql = f"SELECT data, {column}, id FROM users WHERE role = 'mentor'"
+        params: list = []
+        if skills:
+            marks = ",".join("?" * len(skills))
+            sql += f" AND id IN (SELECT user_id FROM mentor_skills WHERE skill IN ({marks})"
+            if match == "all":
+                sql += " GROUP BY user_id HAVING COUNT(*) = ?"
+                params += skills + [len(skills)]
+            else:
+                params += skills
+            sql += ")"
+        if after is not None:
+            sql += f" AND ({column}, id) > (?, ?)"
+            params += list(after)
+        sql += f" ORDER BY {column}, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        rows = self.db.connection().execute(sql, params).fetchall()
+        next_key = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_key = (rows[-1][1], rows[-1][2])
+        return [json.loads(row[0]) for row in rows], next_key
+
+
+# --- SQLite 유저 저장소 ---
+# UserStore와 같은 인터페이스. 조회 결과는 매번 새 dict이므로 변경 후 save()가 필요하다.
+class SQLiteUserStore(Observable, MutableMapping):
+    def __init__(self, db: SQLiteDatabase):
+        super().__init__()
+        self.db = db
+        self.mentors = SQLiteMentorIndex(db)
+        # DB 파일마다 한 번 정해져 모든 워커가 같은 값을 쓴다 (프로필 ETag 구분용)
+        with db.transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)", (secrets.token_hex(4),))
+            self.epoch = conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+
+    def __getitem__(self, email: str) -> dict:
+        user = self.get(email)
+        if user is None:
+            raise KeyError(email)
+        return user
+
+    def __setitem__(self, email: str, user: dict):
+        with self.db.transaction() as conn:
+            rows = conn.execute("SELECT data FROM users WHERE email = ? OR id = ?", (email, user["id"])).fetchall()
+            previous = [_load(row) for row in rows]
+            conn.execute("DELETE FROM users WHERE email = ? OR id = ?", (email, user["id"]))
+            user["version"] = next_version(user, *previous)
+            self._insert(conn, email, user)
+        self._emit("update" if previous else "create", user)
+
+    def __delitem__(self, email: str):
+        with self.db.transaction() as conn:
+            user = _load(conn.execute("SELECT data FROM users WHERE email = ?", (email,)).fetchone())
+            if user is None:
+                raise KeyError(email)
+            conn.execute("DELETE FROM users WHERE email = ?", (email,))
+        self._emit("delete", user)
+
+    def create(self, email: str, factory: Callable[[int], dict]) -> dict:
+        with self.db.transaction() as conn:
+            if conn.execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone():
+                raise DuplicateKeyError(email)
+            user_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM users").fetchone()[0]
+            user = factory(user_id)
+            user["version"] = next_version(user)
+            self._insert(conn, email, user)
+        self._emit("create", user)
+        return user
+
+    def update(self, email: str, fn: Callable[[dict], None]) -> Optional[dict]:
+        with self.db.transaction() as conn:
+            user = _load(conn.execute("SELECT data FROM users WHERE email = ?", (email,)).fetchone())
+            if user is None:
+                return None
+            fn(user)
+            self._update(conn, user)
+        self._emit("update", user)
+        return user
+
+    def insert_many(self, users: Iterable[dict]) -> int:
+        # 대량 적재(시드/가져오기)용. 한 트랜잭션으로 넣고, 이미 있는 이메일/id가 있으면 전부 취소한다.
+        users = list(users)
+        for user in users:
+            user["version"] = next_version(user)
+        try:
+            with self.db.transaction() as conn:
+                for user in users:
+                    self._insert(conn, user["email"], user)
+        except sqlite3.IntegrityError as e:
+            raise DuplicateKeyError(str(e))
+        for user in users:
+            self._emit("create", user)
+        return len(users)
+
+    def __iter__(self) -> Iterator[str]:
+        for (email,) in self.db.connection().execute("SELECT email FROM users ORDER BY id"):
+            yield email
+
+    def __len__(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def __contains__(self, email) -> bool:
+        return self.db.connection().execute("SELECT 1 FROM users WHERE email = ?", (email,)).fetchone() is not None
+
+    def get(self, email: str, default=None) -> Optional[dict]:
+        user = _load(self.db.connection().execute("SELECT data FROM users WHERE email = ?", (email,)).fetchone())
+        return default if user is None else user
+
+    def clear(self):
+        users = list(self.values())
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM users")
+        for user in users:
+            self._emit("delete", user)
+
+    def save(self, user: dict):
+        with self.db.transaction() as conn:
+            self._update(conn, user)
+        self._emit("update", user)
+
+    def get_by_id(self, user_id: int) -> Optional[dict]:
+        return _load(self.db.connection().execute("SELECT data FROM users WHERE id = ?", (user_id,)).fetchone())
+
+    def get_by_role(self, role: str, user_id: int) -> Optional[dict]:
+        row = self.db.connection().execute("SELECT data FROM users WHERE id = ? AND role = ?", (user_id, role)).fetchone()
+        return _load(row)
+
+    def iter_role(self, role: str) -> Iterator[dict]:
+        for (data,) in self.db.connection().execute("SELECT data FROM users WHERE role = ? ORDER BY id", (role,)):
+            yield json.loads(data)
+
+    def count_role(self, role: str) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM users WHERE role = ?", (role,)).fetchone()[0]
+
+    def values(self, conn: Optional[sqlite3.Connection] = None):
+        # conn을 주면 그 연결(예: read_snapshot)에서 읽는다
+        for (data,) in (conn or self.db.connection()).execute("SELECT data FROM users ORDER BY id"):
+            yield json.loads(data)
+
+    def last_id(self) -> int:
+        return self.db.connection().execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0]
+
+    def _insert(self, conn: sqlite3.Connection, email: str, user: dict):
+        conn.execute(
+            "INSERT INTO users (id, email, role, name, first_skill, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (user["id"], email, user["role"], *self._sort_values(user), json.dumps(user)),
+        )
+        self._write_skills(conn, user)
+
+    def _update(self, conn: sqlite3.Connection, user: dict):
+        # 오래된 사본을 저장하더라도 버전은 DB에 있는 값보다 커지게 한다
+        row = conn.execute("SELECT json_extract(data, '$.version') FROM users WHERE id = ?", (user["id"],)).fetchone()
+        stored = row[0] if row and row[0] is not None else 0
+        user["version"] = max(stored, user.get("version", 0)) + 1
+        conn.execute(
+            "UPDATE users SET name = ?, first_skill = ?, data = ? WHERE id = ?",
+            (*self._sort_values(user), json.dumps(user), user["id"]),
+        )
+        conn.execute("DELETE FROM mentor_skills WHERE user_id = ?", (user["id"],))
+        self._write_skills(conn, user)
+
+    @staticmethod
+    def _sort_values(user: dict) -> Tuple[str, str]:
+        if user["role"] != "mentor":
+            return "", ""
+        return SORT_KEYS["name"](user)[0], SORT_KEYS["skill"](user)[0]
+
+    @staticmethod
+    def _write_skills(conn: sqlite3.Connection, user: dict):
+        if user["role"] != "mentor":
+            return
+        skills = {normalize_skill(s) for s in (user["profile"].get("skills") or []) if s.strip()}
+        conn.executemany(
+            "INSERT INTO mentor_skills (skill, user_id) VALUES (?, ?)",
+            [(skill, user["id"]) for skill in skills],
+        )
+
+
+# --- SQLite 매칭 요청 저장소 ---
+class SQLiteMatchRequestStore(Observable, MutableMapping):
+    _COLUMNS = "id, mentor_id, mentee_id, message, status"
+    _FIELDS = {"mentorId": "mentor_id", "menteeId": "mentee_id"}
+
+    def __init__(self, db: SQLiteDatabase):
+        super().__init__()
+        self.db = db
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        return {"id": row[0], "mentorId": row[1], "menteeId": row[2], "message": row[3], "status": row[4]}
+
+    def __getitem__(self, match_id: int) -> dict:
+        match = self.get(match_id)
+        if match is None:
+            raise KeyError(match_id)
+        return match
+
+    def __setitem__(self, match_id: int, match: dict):
+        with self.db.transaction() as conn:
+            existed = conn.execute("DELETE FROM match_requests WHERE id = ?", (match_id,)).rowcount > 0
+            self._insert(conn, match_id, match)
+        self._emit("update" if existed else "create", match)
+
+    def __delitem__(self, match_id: int):
+        with self.db.transaction() as conn:
+            row = conn.execute(f"SELECT {self._COLUMNS} FROM match_requests WHERE id = ?", (match_id,)).fetchone()
+            if row is None:
+                raise KeyError(match_id)
+            conn.execute("DELETE FROM match_requests WHERE id = ?", (match_id,))
+        self._emit("delete", self._to_dict(row))
+
+    def create(self, factory: Callable[[int], dict]) -> dict:
+        with self.db.transaction() as conn:
+            match_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM match_requests").fetchone()[0]
+            match = factory(match_id)
+            self._insert(conn, match_id, match)
+        self._emit("create", match)
+        return match
+
+    def update(self, match_id: int, fn: Callable[[dict], None]) -> Optional[dict]:
+        with self.db.transaction() as conn:
+            row = conn.execute(f"SELECT {self._COLUMNS} FROM match_requests WHERE id = ?", (match_id,)).fetchone()
+            if row is None:
+                return None
+            match = self._to_dict(row)
+            fn(match)
+            self._update(conn, match)
+        self._emit("update", match)
+        return match
+
+    def update_many(self, match_ids: Iterable[int], fn: Callable[[dict], bool]) -> Dict[int, Optional[dict]]:
+        # 한 트랜잭션에서 IN 조회 한 번(청크 단위)과 executemany로 처리한다
+        match_ids = list(dict.fromkeys(match_ids))
+        results: Dict[int, Optional[dict]] = dict.fromkeys(match_ids)
+        changed = []
+        with self.db.transaction() as conn:
+            for start in range(0, len(match_ids), SQL_IN_CHUNK):
+                chunk = match_ids[start:start + SQL_IN_CHUNK]
+                sql = f"SELECT {self._COLUMNS} FROM match_requests WHERE id IN ({','.join('?' * len(chunk))})"
+                for row in conn.execute(sql, chunk):
+                    match = results[row[0]] = self._to_dict(row)
+                    if fn(match):
+                        changed.append(match)
+            conn.executemany(
+                "UPDATE match_requests SET mentor_id = ?, mentee_id = ?, message = ?, status = ? WHERE id = ?",
+                [(m["mentorId"], m["menteeId"], m["message"], m["status"], m["id"]) for m in changed],
+            )
+        for match in changed:
+            self._emit("update", match)
+        return results
+
+    def insert_many(self, matches: Iterable[dict]) -> int:
+        matches = list(matches)
+        try:
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    f"INSERT INTO match_requests ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                    [(m["id"], m["mentorId"], m["menteeId"], m["message"], m["status"]) for m in matches],
+                )
+        except sqlite3.IntegrityError as e:
+            raise DuplicateKeyError(str(e))
+        for match in matches:
+            self._emit("create", match)
+        return len(matches)
+
+    def __iter__(self) -> Iterator[int]:
+        for (match_id,) in self.db.connection().execute("SELECT id FROM match_requests ORDER BY id"):
+            yield match_id
+
+    def __len__(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM match_requests").fetchone()[0]
+
+    def get(self, match_id: int, default=None) -> Optional[dict]:
+        row = self.db.connection().execute(
+            f"SELECT {self._COLUMNS} FROM match_requests WHERE id = ?", (match_id,)
+        ).fetchone()
+        return default if row is None else self._to_dict(row)
+
+    def values(self, conn: Optional[sqlite3.Connection] = None):
+        for row in (conn or self.db.connection()).execute(f"SELECT {self._COLUMNS} FROM match_requests ORDER BY id"):
+            yield self._to_dict(row)
+
+    def last_id(self) -> int:
+        return self.db.connection().execute("SELECT COALESCE(MAX(id), 0) FROM match_requests").fetchone()[0]
+
+    def clear(self):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM match_requests")
+
+    def save(self, match: dict):
+        with self.db.transaction() as conn:
+            self._update(conn, match)
+        self._emit("update", match)
+
+    def _insert(self, conn: sqlite3.Connection, match_id: int, match: dict):
+        conn.execute(
+            f"INSERT INTO match_requests ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+            (match_id, match["mentorId"], match["menteeId"], match["message"], match["status"]),
+        )
+
+    @staticmethod
+    def _update(conn: sqlite3.Connection, match: dict):
+        conn.execute(
+            "UPDATE match_requests SET mentor_id = ?, mentee_id = ?, message = ?, status = ? WHERE id = ?",
+            (match["mentorId"], match["menteeId"], match["message"], match["status"], match["id"]),
+        )
+
+    def iter_status(self, status: str) -> Iterator[dict]:
+        sql = f"SELECT {self._COLUMNS} FROM match_requests WHERE status = ? ORDER BY id"
+        for row in self.db.connection().execute(sql, (status,)):
+            yield self._to_dict(row)
+
+    def count_status(self, status: str) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM match_requests WHERE status = ?", (status,)).fetchone()[0]
+
+    def page_by(
+        self,
+        field: str,
+        user_id: int,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[tuple]]:
+        column = self._FIELDS[field]
+        sql = f"SELECT {self._COLUMNS} FROM match_requests WHERE {column} = ? AND id > ?"
+        params: list = [user_id, after_id]
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        items = [self._to_dict(row) for row in self.db.connection().execute(sql, params)]
+        if limit is not None and len(items) > limit:
+            items = items[:limit]
+            return items, (items[-1]["id"],)
+        return items, None
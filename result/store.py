@@ -0,0 +1,575 @@
+import os
+import secrets
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# --- 저장소 설정 ---
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "memory")  # memory | sqlite
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "data/app.db")
+LOCK_STRIPES = int(os.environ.get("LOCK_STRIPES", "64"))
+
+
+class DuplicateKeyError(Exception):
+    pass
+
+
+# --- 동시성 유틸 ---
+# 단조 증가 id 발급기. 외부에서 id를 지정해 넣은 레코드가 있으면 advance_to로 건너뛴다.
+class IdSequence:
+    def __init__(self, start: int = 0):
+        self._last = start
+        self._lock = threading.Lock()
+
+    @property
+    def last(self) -> int:
+        return self._last
+
+    def next(self) -> int:
+        with self._lock:
+            self._last += 1
+            return self._last
+
+    def advance_to(self, value: int):
+        with self._lock:
+            if value > self._last:
+                self._last = value
+
+
+def next_version(user: dict, *previous: Optional[dict]) -> int:
+    # 새 유저는 1(또는 가져온 값)부터, 기존 유저를 덮어쓰면 이전 버전보다 크게 한다.
+    old = max((p.get("version", 0) for p in previous if p), default=None)
+    if old is None:
+        return user.get("version") or 1
+    return max(old, user.get("version", 0)) + 1
+
+
+# 키 해시로 고른 락 하나만 잡아 서로 다른 키의 변경은 병렬로 진행되게 한다.
+class StripedLock:
+    def __init__(self, stripes: int = LOCK_STRIPES):
+        self._locks = [threading.Lock() for _ in range(max(1, stripes))]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock_for(self, key) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+
+# --- 멘토 목록 정렬 키 ---
+# 각 키는 (정렬값, id) 튜플이며 id가 동일 값 사이의 순서를 고정한다.
+SORT_KEYS = {
+    "id": lambda m: (m["id"], m["id"]),
+    "name": lambda m: (m["profile"].get("name", ""), m["id"]),
+    "skill": lambda m: ((m["profile"].get("skills") or [""])[0], m["id"]),
+}
+DEFAULT_ORDER = "id"
+
+
+def normalize_skill(skill: str) -> str:
+    return skill.strip().casefold()
+
+
+# --- 멘토 인덱스 ---
+# 스킬 -> 멘토 id 역색인과 order_by 별 정렬 뷰를 증분으로 유지한다.
+class MentorIndex:
+    def __init__(self):
+        self._mentors: Dict[int, dict] = {}
+        self._by_skill: Dict[str, Set[int]] = {}
+        # id -> (정규화된 스킬 집합, order_by 별 정렬 키)
+        self._entries: Dict[int, Tuple[Set[str], Dict[str, tuple]]] = {}
+        self._views: Dict[str, List[tuple]] = {order: [] for order in SORT_KEYS}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._mentors)
+
+    def add(self, mentor: dict):
+        with self._lock:
+            self._add(mentor)
+
+    def remove(self, mentor_id: int):
+        with self._lock:
+            self._remove(mentor_id)
+
+    def _add(self, mentor: dict):
+        # 실패할 수 있는 계산(스킬 정규화, 정렬 키)을 끝낸 뒤에 기존 항목을 바꾼다
+        mentor_id = mentor["id"]
+        skills = {normalize_skill(s) for s in (mentor["profile"].get("skills") or []) if s.strip()}
+        keys = {order: key(mentor) for order, key in SORT_KEYS.items()}
+        old, previous = self._entries.get(mentor_id), self._mentors.get(mentor_id)
+        self._remove(mentor_id)
+        try:
+            self._insert(mentor, skills, keys)
+        except Exception:
+            # 다른 키와 비교할 수 없는 정렬 키(문자열이 아닌 이름 등)면 이전 항목을 되돌린다
+            if old is not None:
+                self._insert(previous, *old)
+            raise
+
+    def _insert(self, mentor: dict, skills: Set[str], keys: Dict[str, tuple]):
+        mentor_id = mentor["id"]
+        inserted = []
+        try:
+            for order, key in keys.items():
+                insort(self._views[order], key)
+                inserted.append(order)
+        except Exception:
+            for order in inserted:
+                self._discard_key(order, keys[order])
+            raise
+        for skill in skills:
+            self._by_skill.setdefault(skill, set()).add(mentor_id)
+        self._entries[mentor_id] = (skills, keys)
+        self._mentors[mentor_id] = mentor
+
+    def _remove(self, mentor_id: int):
+        entry = self._entries.pop(mentor_id, None)
+        if entry is None:
+            return
+        skills, keys = entry
+        for skill in skills:
+            ids = self._by_skill[skill]
+            ids.discard(mentor_id)
+            if not ids:
+                del self._by_skill[skill]
+        for order, key in keys.items():
+            self._discard_key(order, key)
+        del self._mentors[mentor_id]
+
+    def _discard_key(self, order: str, key: tuple):
+        view = self._views[order]
+        i = bisect_left(view, key)
+        if i < len(view) and view[i] == key:
+            del view[i]
+
+    def clear(self):
+        with self._lock:
+            self._mentors.clear()
+            self._by_skill.clear()
+            self._entries.clear()
+            for view in self._views.values():
+                view.clear()
+
+    def matching_ids(self, skills: Iterable[str], match: str = "any") -> Set[int]:
+        sets = [self._by_skill.get(normalize_skill(s), set()) for s in skills]
+        if not sets:
+            return set(self._mentors)
+        if match == "all":
+            sets.sort(key=len)
+            result = set(sets[0])
+            for ids in sets[1:]:
+                result &= ids
+                if not result:
+                    break
+            return result
+        return set().union(*sets)
+
+    def query(self, skills: Optional[Iterable[str]] = None, match: str = "any", order_by: Optional[str] = None) -> List[dict]:
+        return self.page(skills, match, order_by)[0]
+
+    def page(
+        self,
+        skills: Optional[Iterable[str]] = None,
+        match: str = "any",
+        order_by: Optional[str] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[tuple]]:
+        # after 키 다음부터 limit 개를 돌려주고, 더 남아 있으면 마지막 키를 함께 돌려준다.
+        with self._lock:
+            order = order_by if order_by in SORT_KEYS else DEFAULT_ORDER
+            view = self._views[order]
+            skills = [s for s in (skills or []) if s.strip()]
+            end = None if limit is None else limit + 1
+            if not skills:
+                start = bisect_right(view, after) if after is not None else 0
+                keys = view[start:] if end is None else view[start:start + end]
+            else:
+                ids = self.matching_ids(skills, match)
+                # 결과가 전체보다 충분히 작으면 결과만 정렬, 아니면 정렬 뷰를 순회
+                if len(ids) * 8 < len(view):
+                    keys = sorted(self._entries[i][1][order] for i in ids)
+                    start = bisect_right(keys, after) if after is not None else 0
+                    keys = keys[start:] if end is None else keys[start:start + end]
+                else:
+                    start = bisect_right(view, after) if after is not None else 0
+                    keys = list(islice((key for key in islice(view, start, None) if key[-1] in ids), end))
+            next_key = None
+            if limit is not None and len(keys) > limit:
+                keys = keys[:limit]
+                next_key = keys[-1]
+            return [self._mentors[key[-1]] for key in keys], next_key
+
+
+# 저장소 변경 이벤트 리스너: listener(event, record), event는 "create" / "update" / "delete"
+Listener = Callable[[str, dict], None]
+
+
+class Observable:
+    def __init__(self):
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener):
+        # 다른 스레드가 순회 중인 목록을 바꾸지 않도록 새 목록으로 교체한다
+        self._listeners = [l for l in self._listeners if l != listener]
+
+    def _emit(self, event: str, record: dict):
+        for listener in self._listeners:
+            listener(event, record)
+
+
+# --- 유저 저장소 ---
+# 이메일을 기본 키로 하는 dict 인터페이스를 그대로 유지하면서
+# id 기본 인덱스와 role 보조 인덱스를 함께 관리한다.
+# 인덱스 구조 변경은 저장소 락으로, 유저 단위 read-modify-write는 이메일별 스트라이프 락으로 보호한다.
+class UserStore(Observable, MutableMapping):
+    def __init__(self, stripes: int = LOCK_STRIPES):
+        super().__init__()
+        self._by_email: Dict[str, dict] = {}
+        self._by_id: Dict[int, dict] = {}
+        self._by_role: Dict[str, Dict[int, dict]] = {}
+        self._lock = threading.RLock()
+        self._stripes = StripedLock(stripes)
+        self.ids = IdSequence()
+        self.mentors = MentorIndex()
+        # 프로필 ETag에 포함해 저장소가 새로 만들어지면(메모리 백엔드 재시작) 이전 버전과 겹치지 않게 한다
+        self.epoch = secrets.token_hex(4)
+
+    def __getitem__(self, email: str) -> dict:
+        return self._by_email[email]
+
+    def __setitem__(self, email: str, user: dict):
+        with self._lock:
+            old = self._by_email.get(email)
+            if old is not None:
+                self._unindex(old)
+            user["version"] = next_version(user, old)
+            self._by_email[email] = user
+            self._index(user)
+            self._emit("create" if old is None else "update", user)
+
+    def __delitem__(self, email: str):
+        with self._lock:
+            user = self._by_email.pop(email)
+            self._unindex(user)
+            self._emit("delete", user)
+
+    def create(self, email: str, factory: Callable[[int], dict]) -> dict:
+        # 이메일 중복 확인, id 발급, 저장을 하나의 원자적 단계로 수행한다.
+        with self._lock:
+            if email in self._by_email:
+                raise DuplicateKeyError(email)
+            user = factory(self.ids.next())
+            self[email] = user
+            return user
+
+    def update(self, email: str, fn: Callable[[dict], None]) -> Optional[dict]:
+        # 유저 하나를 스트라이프 락 아래에서 읽고 fn으로 변경한 뒤 저장한다.
+        with self._stripes.lock_for(email):
+            user = self.get(email)
+            if user is None:
+                return None
+            fn(user)
+            self.save(user)
+            return user
+
+    def insert_many(self, users: Iterable[dict]) -> int:
+        # 대량 적재(시드/가져오기)용. 이미 있는 이메일/id가 하나라도 있으면 아무것도 넣지 않는다.
+        users = list(users)
+        with self._lock:
+            emails, ids = set(self._by_email), set(self._by_id)
+            for user in users:
+                if user["email"] in emails or user["id"] in ids:
+                    raise DuplicateKeyError(user["email"])
+                emails.add(user["email"])
+                ids.add(user["id"])
+            for user in users:
+                self[user["email"]] = user
+        return len(users)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_email)
+
+    def __len__(self) -> int:
+        return len(self._by_email)
+
+    def __contains__(self, email) -> bool:
+        return email in self._by_email
+
+    def get(self, email: str, default=None) -> Optional[dict]:
+        return self._by_email.get(email, default)
+
+    def clear(self):
+        with self._lock:
+            users = list(self._by_email.values())
+            self._by_email.clear()
+            self._by_id.clear()
+            self._by_role.clear()
+            self.mentors.clear()
+            for user in users:
+                self._emit("delete", user)
+
+    def save(self, user: dict):
+        # 프로필/자격 증명 변경 후 호출해 버전을 올리고 보조 인덱스를 갱신한 뒤 리스너에 알린다.
+        with self._lock:
+            user["version"] = user.get("version", 0) + 1
+            if user["role"] == "mentor":
+                self.mentors.add(user)
+            self._emit("update", user)
+
+    def records(self) -> List[dict]:
+        # 현재 유저 목록의 복사본 (스냅샷/내보내기용)
+        with self._lock:
+            return list(self._by_email.values())
+
+    def last_id(self) -> int:
+        return self.ids.last
+
+    def get_by_id(self, user_id: int) -> Optional[dict]:
+        return self._by_id.get(user_id)
+
+    def get_by_role(self, role: str, user_id: int) -> Optional[dict]:
+        return self._by_role.get(role, {}).get(user_id)
+
+    def iter_role(self, role: str) -> Iterator[dict]:
+        # 색인 빌드/게시 스레드가 순회하는 동안 가입이 들어와도 깨지지 않도록 락 안에서 복사한다
+        with self._lock:
+            members = list(self._by_role.get(role, {}).values())
+        return iter(members)
+
+    def count_role(self, role: str) -> int:
+        return len(self._by_role.get(role, {}))
+
+    def _index(self, user: dict):
+        self.ids.advance_to(user["id"])
+        self._by_id[user["id"]] = user
+        self._by_role.setdefault(user["role"], {})[user["id"]] = user
+        if user["role"] == "mentor":
+            self.mentors.add(user)
+
+    def _unindex(self, user: dict):
+        if self._by_id.get(user["id"]) is user:
+            del self._by_id[user["id"]]
+        members = self._by_role.get(user["role"])
+        if members is not None and members.get(user["id"]) is user:
+            del members[user["id"]]
+            if user["role"] == "mentor":
+                self.mentors.remove(user["id"])
+
+
+# --- 매칭 요청 저장소 ---
+# id를 키로 하는 dict 인터페이스. 상태 변경 후에는 save()로 저장소에 알린다.
+# 멘토별/멘티별 id 정렬 리스트와 상태별 id 집합을 보조 인덱스로 유지한다.
+# 수락/거절/취소 같은 상태 변경은 요청 id별 스트라이프 락 아래에서 update()로 수행한다.
+class MatchRequestStore(Observable, MutableMapping):
+    INDEXED_FIELDS = ("mentorId", "menteeId")
+
+    def __init__(self, stripes: int = LOCK_STRIPES):
+        super().__init__()
+        self._lock = threading.RLock()
+        self._stripes = StripedLock(stripes)
+        self.ids = IdSequence()
+        self._by_id: Dict[int, dict] = {}
+        self._by_field: Dict[str, Dict[int, List[int]]] = {field: {} for field in self.INDEXED_FIELDS}
+        self._by_status: Dict[str, Set[int]] = {}
+        # 상태 필터 목록용: field -> (유저 id, 상태) -> 정렬된 요청 id
+        self._by_field_status: Dict[str, Dict[Tuple[int, str], List[int]]] = {field: {} for field in self.INDEXED_FIELDS}
+        # save() 시 이전 상태 인덱스를 지우기 위해 마지막으로 색인한 상태를 기억
+        self._indexed_status: Dict[int, str] = {}
+
+    def __getitem__(self, match_id: int) -> dict:
+        return self._by_id[match_id]
+
+    def __setitem__(self, match_id: int, match: dict):
+        with self._lock:
+            old = self._by_id.get(match_id)
+            if old is not None:
+                self._unindex(old)
+            self._by_id[match_id] = match
+            self._index(match)
+            self._emit("create" if old is None else "update", match)
+
+    def __delitem__(self, match_id: int):
+        with self._lock:
+            match = self._by_id.pop(match_id)
+            self._unindex(match)
+            self._emit("delete", match)
+
+    def create(self, factory: Callable[[int], dict]) -> dict:
+        with self._lock:
+            match = factory(self.ids.next())
+            self[match["id"]] = match
+            return match
+
+    def update(self, match_id: int, fn: Callable[[dict], None]) -> Optional[dict]:
+        # 같은 요청에 대한 동시 변경만 직렬화하고, fn이 예외를 던지면 저장하지 않는다.
+        with self._stripes.lock_for(match_id):
+            match = self.get(match_id)
+            if match is None:
+                return None
+            fn(match)
+            self.save(match)
+            return match
+
+    def update_many(self, match_ids: Iterable[int], fn: Callable[[dict], bool]) -> Dict[int, Optional[dict]]:
+        # 일괄 변경: id마다 update와 같이 락을 잡고, fn이 True를 돌려준 요청만 저장한다.
+        # 결과는 id -> 요청(없으면 None). 한 번에 락 하나만 잡으므로 순서와 관계없이 교착하지 않는다.
+        results: Dict[int, Optional[dict]] = {}
+        for match_id in match_ids:
+            if match_id in results:
+                continue
+            with self._stripes.lock_for(match_id):
+                match = results[match_id] = self.get(match_id)
+                if match is not None and fn(match):
+                    self.save(match)
+        return results
+
+    def insert_many(self, matches: Iterable[dict]) -> int:
+        matches = list(matches)
+        with self._lock:
+            ids = set(self._by_id)
+            for match in matches:
+                if match["id"] in ids:
+                    raise DuplicateKeyError(str(match["id"]))
+                ids.add(match["id"])
+            for match in matches:
+                self[match["id"]] = match
+        return len(matches)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, match_id: int, default=None) -> Optional[dict]:
+        return self._by_id.get(match_id, default)
+
+    def clear(self):
+        with self._lock:
+            matches = list(self._by_id.values())
+            self._by_id.clear()
+            for index in self._by_field.values():
+                index.clear()
+            for index in self._by_field_status.values():
+                index.clear()
+            self._by_status.clear()
+            self._indexed_status.clear()
+            for match in matches:
+                self._emit("delete", match)
+
+    def save(self, match: dict):
+        with self._lock:
+            self._set_status_index(match)
+            self._emit("update", match)
+
+    def records(self) -> List[dict]:
+        with self._lock:
+            return list(self._by_id.values())
+
+    def last_id(self) -> int:
+        return self.ids.last
+
+    def iter_status(self, status: str) -> Iterator[dict]:
+        with self._lock:
+            matches = [self._by_id[i] for i in sorted(self._by_status.get(status, ()))]
+        return iter(matches)
+
+    def count_status(self, status: str) -> int:
+        return len(self._by_status.get(status, ()))
+
+    def page_by(
+        self,
+        field: str,
+        user_id: int,
+        after_id: int = 0,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[tuple]]:
+        # field는 "mentorId" 또는 "menteeId". 해당 유저의 요청만 id 순으로 after_id 다음부터 limit 개
+        with self._lock:
+            # 상태를 지정하면 (유저, 상태)별 id 목록을 써서 다른 상태의 요청을 건너뛰며 읽지 않는다
+            if status is None:
+                ids = self._by_field[field].get(user_id, [])
+            else:
+                ids = self._by_field_status[field].get((user_id, status), [])
+            start = bisect_right(ids, after_id)
+            end = None if limit is None else start + limit + 1
+            items = [self._by_id[i] for i in ids[start:end]]
+        if limit is not None and len(items) > limit:
+            items = items[:limit]
+            return items, (items[-1]["id"],)
+        return items, None
+
+    def _index(self, match: dict):
+        self.ids.advance_to(match["id"])
+        for field, index in self._by_field.items():
+            _insert_id(index, match[field], match["id"])
+        self._set_status_index(match)
+
+    def _unindex(self, match: dict):
+        match_id = match["id"]
+        for field, index in self._by_field.items():
+            _delete_id(index, match[field], match_id)
+        old_status = self._indexed_status.pop(match_id, None)
+        if old_status is not None:
+            self._discard_status(match, old_status)
+
+    def _set_status_index(self, match: dict):
+        match_id, status = match["id"], match["status"]
+        old_status = self._indexed_status.get(match_id)
+        if old_status == status:
+            return
+        if old_status is not None:
+            self._discard_status(match, old_status)
+        self._by_status.setdefault(status, set()).add(match_id)
+        for field, index in self._by_field_status.items():
+            _insert_id(index, (match[field], status), match_id)
+        self._indexed_status[match_id] = status
+
+    def _discard_status(self, match: dict, status: str):
+        match_id = match["id"]
+        ids = self._by_status.get(status)
+        if ids is not None:
+            ids.discard(match_id)
+            if not ids:
+                del self._by_status[status]
+        for field, index in self._by_field_status.items():
+            _delete_id(index, (match[field], status), match_id)
+
+
+# 정렬된 id 목록 인덱스. id는 대부분 증가 순으로 들어오므로 끝에 붙이는 경우를 먼저 처리한다
+def _insert_id(index: dict, key, match_id: int):
+    ids = index.setdefault(key, [])
+    if not ids or ids[-1] < match_id:
+        ids.append(match_id)
+    else:
+        insort(ids, match_id)
+
+
+def _delete_id(index: dict, key, match_id: int):
+    ids = index.get(key)
+    if ids is None:
+        return
+    i = bisect_left(ids, match_id)
+    if i < len(ids) and ids[i] == match_id:
+        del ids[i]
+    if not ids:
+        del index[key]
+
+
+def create_stores(backend: str = STORAGE_BACKEND, path: str = SQLITE_PATH):
+    # (유저 저장소, 매칭 요청 저장소). sqlite는 여러 워커 프로세스가 같은 파일을 공유한다.
+    if backend == "memory":
+        return UserStore(), MatchRequestStore()
+    if backend == "sqlite":
+        from sqlite_store import SQLiteDatabase, SQLiteMatchRequestStore, SQLiteUserStore
+        db = SQLiteDatabase(path)
+        return SQLiteUserStore(db), SQLiteMatchRequestStore(db)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,13 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# --- 테스트 공용 데이터 ---
+# 테스트 파일마다 이메일 접두어를 달리해 전역 저장소(main.fake_users_db)에서 서로 겹치지 않게 한다
+def make_mentor(id, name=None, skills=(), bio="", prefix="m"):
+    name = name or f"멘토{id}"
+    email = f"{prefix}{id}@example.com"
+    return {
+        "id": id, "email": email, "hashed_password": "", "name": name, "role": "mentor",
+        "profile": {"name": name, "bio": bio, "imageUrl": f"/images/mentor/{id}", "skills": list(skills)},
+    }
@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import inspect
+import threading
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from api_mode import LazyExecutor, endpoint, iterate_inline
+
+def test_sync_mode_keeps_handler():
+    def handler():
+        return 1
+    assert endpoint(handler, mode="sync") is handler
+    with pytest.raises(ValueError):
+        endpoint(handler, mode="threads")
+
+def test_async_mode_runs_inline_or_offloaded():
+    executor = LazyExecutor(workers=1, name="test-offload")
+    app = FastAPI()
+
+    @endpoint(mode="async")
+    def current_user(token: str = "anonymous"):
+        return {"name": token, "thread": threading.current_thread().name}
+
+    @app.get("/inline")
+    @endpoint(mode="async")
+    def inline(user: dict = Depends(current_user)):
+        return {"user": user, "thread": threading.current_thread().name}
+
+    @app.get("/offloaded/{value}")
+    @endpoint(offload=executor, mode="async")
+    def offloaded(value: int):
+        if value < 0:
+            raise HTTPException(status_code=400, detail="negative")
+        return {"value": value, "thread": threading.current_thread().name}
+
+    assert inspect.iscoroutinefunction(inline)
+    assert list(inspect.signature(inline).parameters) == ["user"]
+    try:
+        with TestClient(app) as client:
+            res = client.get("/inline", params={"token": "kim"}).json()
+            # 의존성과 핸들러 모두 이벤트 루프 스레드에서 실행된다
+            assert res["user"]["name"] == "kim"
+            assert res["thread"] == res["user"]["thread"]
+            assert not res["thread"].startswith("AnyIO")
+
+            res = client.get("/offloaded/3").json()
+            assert res["value"] == 3 and res["thread"].startswith("test-offload")
+            assert client.get("/offloaded/-1").status_code == 400
+    finally:
+        executor.shutdown()
+
+def test_iterate_inline():
+    async def collect():
+        return [chunk async for chunk in iterate_inline(iter([b"a", b"b"]))]
+    assert asyncio.run(collect()) == [b"a", b"b"]
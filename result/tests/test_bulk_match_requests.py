@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token
+
+client = TestClient(app)
+
+def add_user(id, role):
+    email = f"bulk{id}@example.com"
+    main.fake_users_db[email] = {
+        "id": id, "email": email, "hashed_password": "", "name": f"u{id}", "role": role,
+        "profile": {"name": f"u{id}", "bio": "", "imageUrl": f"/images/{role}/{id}", "skills": [] if role == "mentor" else None},
+    }
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+def add_match(mentor_id, mentee_id):
+    return main.fake_match_requests.create(lambda id: {
+        "id": id, "mentorId": mentor_id, "menteeId": mentee_id, "message": "hi", "status": "pending"})["id"]
+
+def test_bulk_accept_reject_and_cancel():
+    mentor = add_user(80001, "mentor")
+    other_mentor = add_user(80002, "mentor")
+    mentee = add_user(80003, "mentee")
+    mine = [add_match(80001, 80003) for _ in range(3)]
+    theirs = add_match(80002, 80003)
+
+    resp = client.post("/api/match-requests/bulk/accept", headers=mentor, json={"ids": [mine[0], mine[1], theirs, 99999999]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["succeeded"], body["failed"]) == (2, 2)
+    assert [(r["id"], r["result"]) for r in body["results"]] == [
+        (mine[0], "ok"), (mine[1], "ok"), (theirs, "forbidden"), (99999999, "not_found")]
+    assert body["results"][0]["matchRequest"]["status"] == "accepted"
+    assert body["results"][2]["matchRequest"] is None
+    assert main.fake_match_requests[theirs]["status"] == "pending"
+
+    resp = client.post("/api/match-requests/bulk/reject", headers=other_mentor, json={"ids": [theirs]})
+    assert resp.json()["succeeded"] == 1 and main.fake_match_requests[theirs]["status"] == "rejected"
+
+    resp = client.post("/api/match-requests/bulk/cancel", headers=mentee, json={"ids": mine})
+    assert resp.json()["succeeded"] == 3
+    assert {main.fake_match_requests[id]["status"] for id in mine} == {"cancelled"}
+
+def test_bulk_requires_role_and_bounded_ids():
+    mentee = add_user(80004, "mentee")
+    assert client.post("/api/match-requests/bulk/accept", headers=mentee, json={"ids": [1]}).status_code == 401
+    assert client.post("/api/match-requests/bulk/cancel", headers=mentee, json={"ids": []}).status_code == 422
+    too_many = list(range(main.MAX_BULK_SIZE + 1))
+    assert client.post("/api/match-requests/bulk/cancel", headers=mentee, json={"ids": too_many}).status_code == 422
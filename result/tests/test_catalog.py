@@ -0,0 +1,134 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import sqlite3
+import time
+
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token
+from catalog import MentorCatalog
+from serialization import dumps, profile_dict
+from store import MentorIndex, UserStore
+from conftest import make_mentor
+
+client = TestClient(app)
+
+SKILLS = ["Python", "go", "React", "Java", "Kafka", "Rust"]
+
+def make_users(count, seed=7):
+    rng = random.Random(seed)
+    users = UserStore()
+    for id in range(1, count + 1):
+        name = rng.choice(["김", "Alice", "bob", "이", "Zed"]) + str(rng.randint(0, 5))
+        mentor = make_mentor(id, name, rng.sample(SKILLS, rng.randint(0, 3)), f"소개 {id}", prefix="cat")
+        users[mentor["email"]] = mentor
+    return users
+
+def pages(fetch, limit):
+    items, after = [], None
+    while True:
+        page, after = fetch(after, limit)
+        items.append(page)
+        if after is None:
+            return items
+
+def test_catalog_pages_match_mentor_index(tmp_path):
+    users = make_users(200)
+    index = MentorIndex()
+    for mentor in users.iter_role("mentor"):
+        index.add(mentor)
+    catalog = MentorCatalog(lambda: users.iter_role("mentor"), str(tmp_path))
+    assert catalog.current() is None
+    assert catalog.publish() == 1
+    snapshot = catalog.current()
+    assert len(snapshot) == 200
+
+    for skills in (None, ["python"], ["Python", "rust"], ["KAFKA", "go", "java"], ["없음"]):
+        for match in ("any", "all"):
+            for order in ("id", "name", "skill", "unknown"):
+                for limit in (None, 1, 7, 500):
+                    expected = pages(lambda after, limit: index.page(skills, match, order, after, limit), limit)
+                    got = pages(lambda after, limit: snapshot.page(skills, match, order, after, limit), limit)
+                    assert got == [[dumps(profile_dict(m)) for m in page] for page in expected]
+                    assert snapshot.page(skills, match, order, None, limit)[1] == index.page(skills, match, order, None, limit)[1]
+
+def test_readers_map_new_versions(tmp_path):
+    users = make_users(20)
+    writer = MentorCatalog(lambda: users.iter_role("mentor"), str(tmp_path), publish_delay_ms=0)
+    users.subscribe(writer.on_user_event)
+    # 다른 워커: 게시하지 않고 읽기만 한다
+    reader = MentorCatalog(lambda: [], str(tmp_path))
+    writer.publish()
+    first = reader.current()
+    assert first.version == 1 and reader.current() is first
+
+    users.update("cat3@example.com", lambda u: u["profile"].update(name="바뀐 이름"))
+    deadline = time.time() + 5
+    while reader.current().version == 1 and time.time() < deadline:
+        time.sleep(0.01)
+    fragments, _ = reader.current().page(order_by="id", limit=3)
+    assert "바뀐 이름".encode() in fragments[2]
+    # 이전 버전을 읽던 요청은 그대로 끝까지 읽을 수 있다
+    assert first.page(order_by="id", limit=3)[0][2] == dumps(profile_dict(make_users(20)["cat3@example.com"]))
+
+    for _ in range(4):
+        writer.publish()
+    writer.close()
+    # 최근 버전 파일만 남긴다
+    assert sorted(f for f in os.listdir(tmp_path) if f.startswith("catalog-")) == [
+        f"catalog-{v:012d}.bin" for v in (4, 5, 6)]
+    assert reader.current().version == 6
+
+def test_publisher_survives_loader_errors(tmp_path):
+    users = make_users(5)
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    def loader():
+        if failures:
+            raise failures.pop()
+        return users.iter_role("mentor")
+
+    catalog = MentorCatalog(loader, str(tmp_path), publish_delay_ms=0)
+    catalog.schedule()
+    deadline = time.time() + 5
+    while catalog.current() is None and time.time() < deadline:
+        time.sleep(0.01)
+    # 실패한 게시는 세고 스레드는 살아남아 다시 게시한다
+    assert catalog.errors == 1 and "locked" in catalog.last_error
+    assert catalog.publishes == 1 and len(catalog.current()) == 5
+    users.update("cat1@example.com", lambda u: u["profile"].update(name="다시"))
+    catalog.schedule()
+    while catalog.current().version == 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert catalog.current().version == 2
+    catalog.close()
+    assert catalog._thread is None
+
+def test_get_mentors_served_from_catalog(tmp_path, monkeypatch):
+    for id, name, skills in ((92001, "카탈로그 멘토", ["Fortran"]), (92002, "Catalog Mentor", ["Fortran", "Go"])):
+        mentor = make_mentor(id, name, skills, f"소개 {id}", prefix="cat")
+        main.fake_users_db[mentor["email"]] = mentor
+    mentee_email = "cat-mentee@example.com"
+    main.fake_users_db[mentee_email] = {
+        "id": 92003, "email": mentee_email, "hashed_password": "", "name": "멘티", "role": "mentee",
+        "profile": {"name": "멘티", "bio": "", "imageUrl": "/images/mentee/92003", "skills": None},
+    }
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': mentee_email})}"}
+    urls = ["/api/mentors?skill=fortran", "/api/mentors?skill=fortran,go&match=all", "/api/mentors?order_by=name&limit=1",
+            "/api/mentors?skill=fortran&stream=ndjson", "/api/mentors?skill=fortran&limit=1&stream=json"]
+    expected = [client.get(url, headers=headers) for url in urls]
+
+    catalog = MentorCatalog(lambda: main.fake_users_db.iter_role("mentor"), str(tmp_path))
+    catalog.publish()
+    monkeypatch.setattr(main, "mentor_catalog", catalog)
+    for url, before in zip(urls, expected):
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200 and resp.content == before.content
+        assert resp.headers.get("X-Next-Cursor") == before.headers.get("X-Next-Cursor")
+    cursor = expected[2].headers["X-Next-Cursor"]
+    second = client.get(f"/api/mentors?order_by=name&limit=1&cursor={cursor}", headers=headers)
+    monkeypatch.setattr(main, "mentor_catalog", None)
+    assert second.content == client.get(f"/api/mentors?order_by=name&limit=1&cursor={cursor}", headers=headers).content
@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from store import DuplicateKeyError, IdSequence, StripedLock, create_stores
+
+THREADS = 8
+
+@pytest.fixture(params=["memory", "sqlite"])
+def stores(request, tmp_path):
+    users, matches = create_stores(request.param, str(tmp_path / "app.db"))
+    yield users, matches
+    if request.param == "sqlite":
+        users.db.close()
+
+def make_user(email):
+    return lambda id: {
+        "id": id, "email": email, "hashed_password": "", "name": email, "role": "mentor",
+        "profile": {"name": email, "bio": "", "imageUrl": f"/images/mentor/{id}", "skills": []},
+    }
+
+def test_id_sequence_and_striped_lock():
+    ids = IdSequence()
+    ids.advance_to(10)
+    assert ids.next() == 11 and ids.last == 11
+    ids.advance_to(5)
+    assert ids.next() == 12
+    stripes = StripedLock(4)
+    assert stripes.lock_for("a") is stripes.lock_for("a")
+
+def test_concurrent_creates_get_unique_ids(stores):
+    users, matches = stores
+    emails = [f"c{i}@example.com" for i in range(200)]
+    with ThreadPoolExecutor(THREADS) as pool:
+        created = list(pool.map(lambda email: users.create(email, make_user(email)), emails))
+        new_matches = list(pool.map(lambda i: matches.create(lambda id: {
+            "id": id, "mentorId": 1, "menteeId": 2, "message": str(i), "status": "pending",
+        }), range(200)))
+
+    assert sorted(u["id"] for u in created) == list(range(1, 201))
+    assert len(users) == 200
+    assert sorted(m["id"] for m in new_matches) == list(range(1, 201))
+    assert matches.count_status("pending") == 200
+
+def test_duplicate_email_is_rejected_once(stores):
+    users, _ = stores
+    email = "dup@example.com"
+
+    def attempt(_):
+        try:
+            users.create(email, make_user(email))
+            return True
+        except DuplicateKeyError:
+            return False
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(attempt, range(50)))
+    assert results.count(True) == 1
+    assert len(users) == 1
+
+def test_concurrent_updates_are_not_lost(stores):
+    users, matches = stores
+    email = "counter@example.com"
+    users.create(email, make_user(email))
+    match = matches.create(lambda id: {"id": id, "mentorId": 1, "menteeId": 2, "message": "0", "status": "pending"})
+
+    def bump_user(_):
+        users.update(email, lambda u: u["profile"]["skills"].append("s"))
+
+    def bump_match(_):
+        matches.update(match["id"], lambda m: m.update(message=str(int(m["message"]) + 1)))
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(bump_user, range(100)))
+        list(pool.map(bump_match, range(100)))
+
+    assert len(users[email]["profile"]["skills"]) == 100
+    assert matches[match["id"]]["message"] == "100"
+    assert users.update("missing@example.com", lambda u: None) is None
+    assert matches.update(9999, lambda m: None) is None
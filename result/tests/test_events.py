@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import threading
+from fastapi.testclient import TestClient
+import main
+from main import app
+from events import InProcessBroker, MatchRequestNotifier, sse_stream, user_channel
+
+client = TestClient(app)
+
+def test_broker_fans_out_across_threads():
+    async def scenario():
+        broker = InProcessBroker(queue_size=2)
+        notifier = MatchRequestNotifier(broker)
+        with broker.subscribe([user_channel(1)]) as mentor, broker.subscribe([user_channel(2)]) as mentee:
+            match = {"id": 7, "mentorId": 1, "menteeId": 2, "message": "hi", "status": "pending"}
+            # sync 핸들러처럼 스레드풀에서 발행해도 구독자 루프로 전달된다
+            thread = threading.Thread(target=notifier.on_match_event, args=("create", match))
+            thread.start()
+            thread.join()
+            notifier.on_match_event("update", dict(match, status="accepted"))
+            notifier.on_match_event("delete", match)
+            assert (await mentor.get(1))["type"] == "match_request.created"
+            assert (await mentee.get(1))["type"] == "match_request.created"
+            assert (await mentor.get(1))["matchRequest"]["status"] == "accepted"
+            assert await mentee.get(1) is not None
+            assert await mentor.get(0.01) is None
+            assert broker.subscriber_count(user_channel(1)) == 1
+        assert broker.subscriber_count(user_channel(1)) == 0
+
+        # 느린 구독자는 오래된 이벤트부터 버린다
+        with broker.subscribe(["c"]) as slow:
+            for i in range(3):
+                broker.publish("c", {"n": i})
+            await asyncio.sleep(0)
+            assert [(await slow.get(1))["n"] for _ in range(2)] == [1, 2]
+            assert slow.dropped == 1
+
+    asyncio.run(scenario())
+
+def test_sse_stream_format_and_keepalive():
+    async def scenario():
+        broker = InProcessBroker()
+        stream = sse_stream(broker, ["c"], keepalive=0.01)
+        # 응답이 시작되기 전에는 구독하지 않는다
+        assert broker.subscriber_count("c") == 0
+        assert (await stream.__anext__()).startswith(b"retry:")
+        assert broker.subscriber_count("c") == 1
+        assert await stream.__anext__() == b": keepalive\n\n"
+        broker.publish("c", {"type": "match_request.created", "matchRequest": {"id": 1, "message": "안녕"}})
+        chunk = (await stream.__anext__()).decode()
+        assert chunk.startswith("event: match_request.created\ndata: ")
+        assert json.loads(chunk.split("data: ", 1)[1]) == {"id": 1, "message": "안녕"}
+        await stream.aclose()
+        assert broker.subscriber_count("c") == 0
+
+    asyncio.run(scenario())
+
+def test_store_changes_are_published():
+    async def scenario():
+        with main.event_broker.subscribe([user_channel(90001)]) as mentor:
+            created = await asyncio.to_thread(main.fake_match_requests.create, lambda id: {
+                "id": id, "mentorId": 90001, "menteeId": 90002, "message": "m", "status": "pending",
+            })
+            await asyncio.to_thread(main.fake_match_requests.update, created["id"], lambda m: m.update(status="rejected"))
+            first, second = await mentor.get(1), await mentor.get(1)
+            assert first["matchRequest"]["id"] == created["id"]
+            assert second["type"] == "match_request.updated"
+            assert second["matchRequest"]["status"] == "rejected"
+
+    asyncio.run(scenario())
+
+def test_event_stream_requires_token():
+    assert client.get("/api/match-requests/events").status_code == 401
+    assert client.get("/api/match-requests/events", params={"token": "bad"}).status_code == 401
@@ -0,0 +1,188 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import base64
+from io import BytesIO
+from fastapi.testclient import TestClient
+from PIL import Image
+from main import app, fake_users_db, create_access_token, image_store
+
+client = TestClient(app)
+
+def make_image(size, fmt):
+    buf = BytesIO()
+    Image.new("RGB", (size, size), (30, 120, 200)).save(buf, fmt)
+    return base64.b64encode(buf.getvalue()).decode()
+
+def add_user(id, role):
+    email = f"image{id}@example.com"
+    fake_users_db[email] = {
+        "id": id, "email": email, "hashed_password": "", "name": "img", "role": role,
+        "profile": {"name": "img", "bio": "", "imageUrl": f"/images/{role}/{id}", "skills": []},
+    }
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+def test_variants_etag_and_304():
+    headers = add_user(50000, "mentor")
+    resp = client.put("/api/profile", headers=headers, json={"name": "img", "bio": "", "image": make_image(600, "PNG"), "skills": []})
+    assert resp.status_code == 200
+
+    resp = client.get("/api/images/mentor/50000", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "image/png"
+    assert "private" in resp.headers["cache-control"]
+    etag = resp.headers["etag"]
+    with Image.open(BytesIO(resp.content)) as img:
+        assert img.size == (600, 600)
+
+    resp = client.get("/api/images/mentor/50000?size=128&format=webp", headers=headers)
+    assert resp.headers["content-type"] == "image/webp"
+    assert resp.headers["etag"] != etag
+    with Image.open(BytesIO(resp.content)) as img:
+        assert img.format == "WEBP" and img.size == (128, 128)
+
+    resp = client.get("/api/images/mentor/50000", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    assert client.get("/api/images/mentor/50000?size=99", headers=headers).status_code == 422
+    assert client.get("/api/images/mentee/50000", headers=headers).status_code == 404
+
+def test_reupload_releases_old_variants():
+    headers = add_user(50001, "mentee")
+    client.put("/api/profile", headers=headers, json={"name": "img", "bio": "", "image": make_image(500, "JPEG")})
+    blobs = len(image_store)
+    client.put("/api/profile", headers=headers, json={"name": "img", "bio": "", "image": make_image(700, "JPEG")})
+    assert len(image_store) == blobs
+    resp = client.get("/api/images/mentee/50001?size=64", headers=headers)
+    assert resp.headers["content-type"] == "image/jpeg"
+
+def test_variants_released_when_user_deleted_during_upload(monkeypatch):
+    import main
+
+    process = main.process_profile_image
+    headers = add_user(50006, "mentor")
+
+    def process_then_delete(image_bytes):
+        # 변환하는 사이 유저가 탈퇴한 상황
+        result = process(image_bytes)
+        fake_users_db.pop("image50006@example.com", None)
+        return result
+
+    monkeypatch.setattr(main, "process_profile_image", process_then_delete)
+    blobs = len(image_store)
+    resp = client.put("/api/profile", headers=headers, json={"name": "img", "bio": "", "image": make_image(900, "PNG")})
+    assert resp.status_code == 401 and len(image_store) == blobs
+    headers = add_user(50006, "mentor")
+    resp = client.put("/api/profile/image", headers=headers,
+                      files={"image": ("a.png", base64.b64decode(make_image(900, "PNG")), "image/png")})
+    assert resp.status_code == 401 and len(image_store) == blobs
+
+def test_disk_backends_serve_without_heap_copies(tmp_path, monkeypatch):
+    import main
+    from images import BlobImageStore, DirectoryImageStore
+
+    directory = DirectoryImageStore(str(tmp_path / "images"))
+    digest = directory.put(b"abc")
+    assert directory.put(b"abc") == digest
+    assert directory.get(digest) == b"abc"
+    assert len(directory) == 1
+    assert directory.gc(set()) == 1 and directory.get(digest) is None
+
+    blob = BlobImageStore(str(tmp_path / "images.blob"))
+    first = blob.put(b"first")
+    second = blob.put(b"second")
+    assert bytes(blob.get(first)) == b"first"
+    assert isinstance(blob.get(second), memoryview)
+    # 다른 프로세스가 같은 파일을 열어도 인덱스를 다시 만들 수 있어야 함
+    reopened = BlobImageStore(str(tmp_path / "images.blob"))
+    assert bytes(reopened.get(second)) == b"second"
+    reopened.put(b"third")
+    assert bytes(blob.get(reopened.put(b"third"))) == b"third"
+    assert os.path.getsize(tmp_path / "images.blob") == 3 * 40 + len(b"firstsecondthird")
+
+    for store in (DirectoryImageStore(str(tmp_path / "served")), BlobImageStore(str(tmp_path / "served.blob"))):
+        monkeypatch.setattr(main, "image_store", store)
+        headers = add_user(50002, "mentor")
+        client.put("/api/profile", headers=headers, json={"name": "img", "bio": "", "image": make_image(500, "JPEG"), "skills": []})
+        resp = client.get("/api/images/mentor/50002?size=256&format=webp", headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "image/webp"
+        with Image.open(BytesIO(resp.content)) as img:
+            assert img.size == (256, 256)
+
+def test_gc_keeps_referenced_and_recent_images(tmp_path):
+    from images import BlobImageStore, DirectoryImageStore
+
+    directory = DirectoryImageStore(str(tmp_path / "images"))
+    old, live = directory.put(b"old"), directory.put(b"live")
+    os.utime(directory.path(old), (0, 0))
+    os.utime(directory.path(live), (0, 0))
+    since = directory.mark()
+    recent = directory.put(b"recent")
+    assert directory.gc({live}, since) == 1
+    assert directory.get(old) is None and directory.get(live) == b"live" and directory.get(recent) == b"recent"
+
+    blob = BlobImageStore(str(tmp_path / "images.blob"))
+    other = BlobImageStore(str(tmp_path / "images.blob"))  # 같은 파일을 쓰는 다른 워커
+    old, live = blob.put(b"old" * 100), blob.put(b"live")
+    since = blob.mark()
+    recent = other.put(b"recent")
+    assert blob.gc({live}, since) == 1
+    assert os.path.getsize(tmp_path / "images.blob") == 2 * 40 + len(b"liverecent")
+    assert blob.get(old) is None and bytes(blob.get(live)) == b"live"
+    # 다른 워커는 바뀐 파일을 다시 열어 이어서 쓰고 읽는다
+    added = other.put(b"added")
+    assert bytes(blob.get(added)) == b"added" and bytes(other.get(recent)) == b"recent"
+    assert other.get(old) is None
+    assert len(BlobImageStore(str(tmp_path / "images.blob"))) == 3
+
+def test_header_only_validation_messages():
+    headers = add_user(50003, "mentor")
+    put = lambda image: client.put("/api/profile", headers=headers, json={"name": "img", "bio": "", "image": image, "skills": []})
+
+    assert "해상도" in put(make_image(400, "JPEG")).json()["detail"]
+    buf = BytesIO()
+    Image.new("RGB", (500, 600)).save(buf, "PNG")
+    assert "정사각형" in put(base64.b64encode(buf.getvalue()).decode()).json()["detail"]
+    assert ".jpg" in put(make_image(500, "GIF")).json()["detail"]
+    assert "올바르지 않" in put("notbase64").json()["detail"]
+    # 디코딩 전에 인코딩 길이만으로 거절
+    resp = put("A" * (1024 * 1024 * 2))
+    assert resp.status_code == 400 and "1MB" in resp.json()["detail"]
+    # 헤더는 정상이지만 본문이 깨진 이미지는 저장 단계에서 거절
+    broken = base64.b64decode(make_image(500, "JPEG"))[:400]
+    assert "올바르지 않" in put(base64.b64encode(broken).decode()).json()["detail"]
+
+def test_multipart_upload():
+    headers = add_user(50004, "mentor")
+    buf = BytesIO()
+    Image.new("RGB", (500, 500)).save(buf, "JPEG")
+    resp = client.put("/api/profile/image", headers=headers, files={"image": ("a.jpg", buf.getvalue(), "image/jpeg")})
+    assert resp.status_code == 200
+    assert resp.json()["profile"]["name"] == "img"
+    assert client.get("/api/images/mentor/50004?size=64", headers=headers).status_code == 200
+
+    resp = client.put("/api/profile/image", headers=headers, files={"image": ("a.jpg", buf.getvalue() + b"\0" * (1024 * 1024), "image/jpeg")})
+    assert resp.status_code == 400 and "1MB" in resp.json()["detail"]
+    resp = client.put("/api/profile/image", headers=headers, files={"image": ("a.gif", base64.b64decode(make_image(500, "GIF")), "image/gif")})
+    assert resp.status_code == 400 and ".png" in resp.json()["detail"]
+
+def test_upload_body_limited_before_parsing():
+    headers = add_user(50005, "mentor")
+    chunks = []
+
+    def body():
+        for _ in range(64):
+            chunks.append(1)
+            yield b"\0" * 64 * 1024
+
+    # 길이가 큰 요청은 본문을 읽지 않고, 길이가 없는 요청은 제한을 넘는 즉시 중단한다
+    resp = client.put("/api/profile/image", content=body(), headers={
+        **headers, "Content-Type": "multipart/form-data; boundary=x", "Content-Length": str(4 * 1024 * 1024)})
+    assert resp.status_code == 400 and "1MB" in resp.json()["detail"] and not chunks
+    resp = client.put("/api/profile/image", content=body(), headers={
+        **headers, "Content-Type": "multipart/form-data; boundary=x"})
+    assert resp.status_code == 400 and "1MB" in resp.json()["detail"]
@@ -0,0 +1,161 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import pytest
+
+import journal as journal_module
+from journal import Journal, JournalCorrupted, open_journal, read_state
+from store import MatchRequestStore, UserStore, create_stores
+
+def make_user(id, role="mentor"):
+    email = f"j{id}@example.com"
+    return email, {"id": id, "email": email, "hashed_password": "h", "name": f"유저{id}", "role": role,
+                   "profile": {"name": f"유저{id}", "bio": "", "imageUrl": f"/images/{role}/{id}", "skills": ["Go"]}}
+
+def open_stores(directory, **options):
+    users, matches = UserStore(), MatchRequestStore()
+    journal = Journal(str(directory), commit_interval_ms=0, fsync=False, snapshot_interval=0, **options)
+    return users, matches, journal.open(users, matches)
+
+def state(users, matches):
+    return sorted((u["email"], u["version"], u["profile"]) for u in users.records()), \
+        sorted((m["id"], m["status"]) for m in matches.records())
+
+def mutate(users, matches, start):
+    for id in range(start, start + 3):
+        users.create(make_user(id)[0], lambda new_id: make_user(new_id)[1])
+    users.update(f"j{start}@example.com", lambda u: u["profile"].update(bio="수정"))
+    match = matches.create(lambda id: {"id": id, "mentorId": start, "menteeId": start + 1, "message": "", "status": "pending"})
+    matches.update(match["id"], lambda m: m.update(status="accepted"))
+    matches.create(lambda id: {"id": id, "mentorId": start, "menteeId": start + 2, "message": "", "status": "pending"})
+
+def test_replays_journal_after_restart(tmp_path):
+    users, matches, journal = open_stores(tmp_path)
+    mutate(users, matches, 1)
+    del users["j3@example.com"]
+    assert journal.flush(5)
+    journal.close()
+    expected = state(users, matches)
+
+    users2, matches2, journal2 = open_stores(tmp_path)
+    assert state(users2, matches2) == expected
+    assert users2["j1@example.com"]["profile"]["bio"] == "수정" and users2["j1@example.com"]["version"] == 2
+    assert [m["id"] for m in matches2.iter_status("accepted")] == [1]
+    # 삭제된 유저의 id는 다시 발급하지 않는다
+    assert users2.ids.next() == 4 and matches2.ids.next() == 3
+    journal2.close()
+
+def test_snapshot_compacts_segments(tmp_path):
+    users, matches, journal = open_stores(tmp_path)
+    mutate(users, matches, 1)
+    journal.flush(5)
+    journal.snapshot()
+    mutate(users, matches, 10)
+    journal.flush(5)
+    journal.close()
+    expected = state(users, matches)
+    files = sorted(f for f in os.listdir(tmp_path) if f != "LOCK")
+    assert files == [f"journal-{journal.segment:08d}.log", f"snapshot-{journal.segment:08d}.snap"]
+
+    users2, matches2, journal2 = open_stores(tmp_path)
+    assert state(users2, matches2) == expected
+    assert journal2.recovered.tail_records == journal2.since_snapshot == 7
+    journal2.close()
+
+def test_read_state_retries_when_snapshot_runs_during_read(tmp_path, monkeypatch):
+    users, matches, journal = open_stores(tmp_path)
+    mutate(users, matches, 1)
+    journal.flush(5)
+    journal.snapshot()
+    mutate(users, matches, 10)
+    journal.flush(5)
+    expected = state(users, matches)
+    iter_frames = journal_module.iter_frames
+    snapshotted = []
+
+    def snapshot_while_reading(path):
+        # 내보내기가 이전 스냅샷을 읽는 도중 서버가 새 스냅샷을 만들어 이전 세그먼트를 지운다
+        for i, frame in enumerate(iter_frames(path)):
+            if i == 1 and path.endswith(".snap") and not snapshotted:
+                snapshotted.append(journal.snapshot())
+            yield frame
+
+    monkeypatch.setattr(journal_module, "iter_frames", snapshot_while_reading)
+    recovered = read_state(str(tmp_path))
+    assert snapshotted
+    assert (sorted((u["email"], u["version"], u["profile"]) for u in recovered.users.values()),
+            sorted((m["id"], m["status"]) for m in recovered.matches.values())) == expected
+    journal.close()
+
+    # 스냅샷 다음 세그먼트가 빠져 있으면 일부만 재생하지 않는다
+    os.remove(tmp_path / f"journal-{journal.segment:08d}.log")
+    with pytest.raises(JournalCorrupted):
+        read_state(str(tmp_path))
+
+def test_open_removes_stale_snapshot_tmp_and_close_unsubscribes(tmp_path):
+    (tmp_path / "snapshot-00000003.snap.tmp").write_bytes(b"partial")
+    users, matches, journal = open_stores(tmp_path)
+    assert not (tmp_path / "snapshot-00000003.snap.tmp").exists()
+    mutate(users, matches, 1)
+    journal.close()
+    appended = journal.appended
+    # 닫은 뒤의 변경은 기록하지 않고, flush도 기다리지 않는다
+    mutate(users, matches, 10)
+    journal._append(b"late")
+    assert journal.appended == appended and journal.flush(0)
+    assert journal.on_user_event not in users._listeners
+
+def test_snapshot_thread_survives_unexpected_errors(tmp_path, monkeypatch):
+    users, matches, journal = open_stores(tmp_path)
+    journal.snapshot_min_records = 0
+    calls = []
+
+    def broken_snapshot():
+        calls.append(1)
+        raise ValueError("bad record")
+
+    monkeypatch.setattr(journal, "snapshot", broken_snapshot)
+    journal.snapshot_interval = 0.01
+    journal._start(journal._run_snapshots, "journal-snapshot")
+    deadline = time.monotonic() + 5
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.errors >= 2 and journal.last_error == "bad record"
+    journal.close()
+
+def test_truncates_torn_tail_and_rejects_corrupt_middle(tmp_path):
+    users, matches, journal = open_stores(tmp_path)
+    mutate(users, matches, 1)
+    journal.flush(5)
+    journal.close()
+    segment = tmp_path / f"journal-{journal.segment:08d}.log"
+    data = segment.read_bytes()
+    # 마지막 기록을 쓰다가 종료된 상황
+    segment.write_bytes(data[:-5])
+    users2, matches2, journal2 = open_stores(tmp_path)
+    assert journal2.recovered.truncated > 0
+    assert len(users2) == 3 and [m["status"] for m in matches2.records()] == ["accepted"]
+    # 잘린 세그먼트 뒤에 새 세그먼트가 이어지고, 이후 복구에서도 같은 상태
+    mutate(users2, matches2, 20)
+    journal2.flush(5)
+    journal2.close()
+    expected = state(users2, matches2)
+    users3, matches3, journal3 = open_stores(tmp_path)
+    assert state(users3, matches3) == expected
+    journal3.close()
+
+    # 마지막이 아닌 세그먼트가 깨졌으면 복구하지 않는다
+    segment.write_bytes(segment.read_bytes()[:20] + b"\xff" + segment.read_bytes()[21:])
+    with pytest.raises(JournalCorrupted):
+        open_stores(tmp_path)
+
+def test_directory_lock_and_backend_check(tmp_path):
+    _, _, journal = open_stores(tmp_path)
+    with pytest.raises(RuntimeError):
+        open_stores(tmp_path)
+    journal.close()
+    with pytest.raises(ValueError):
+        open_journal(*create_stores("sqlite", str(tmp_path / "app.db")), directory=str(tmp_path / "j"))
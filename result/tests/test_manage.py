@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+import manage
+from passwords import get_context, hash_password
+from store import create_stores
+
+HASHED = hash_password("pw", 4)
+
+def write_lines(path, rows):
+    path.write_text("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+USERS = [
+    {"email": "m1@example.com", "name": "멘토", "role": "mentor", "hashed_password": HASHED, "skills": "Python, Go"},
+    {"email": "m2@example.com", "name": "멘토2", "role": "mentor", "hashed_password": HASHED, "bio": "소개"},
+    {"email": "e1@example.com", "name": "멘티", "role": "mentee", "password": "secret"},
+]
+
+def test_sqlite_import_export_roundtrip(tmp_path, capsys):
+    db = str(tmp_path / "app.db")
+    users_in = write_lines(tmp_path / "users.ndjson", USERS + [
+        {"email": "m1@example.com", "name": "중복", "role": "mentee", "hashed_password": HASHED},
+        {"email": "x@example.com", "name": "역할", "role": "admin", "hashed_password": HASHED},
+    ])
+    (tmp_path / "matches.csv").write_text(
+        "mentorId,menteeId,message,status\n1,3,안녕하세요,pending\n2,3,,accepted\n3,1,,pending\n1,3,,unknown\n",
+        encoding="utf-8")
+    argv = ["--backend", "sqlite", "--sqlite-path", db, "import", "--users", users_in,
+            "--matches", str(tmp_path / "matches.csv"), "--batch-size", "2", "--workers", "1"]
+    # 건너뛴 행이 있으면 종료 코드 1
+    assert manage.main(argv) == 1
+    errors = capsys.readouterr().err
+    assert "line 4: skipped: m1@example.com already exists" in errors
+    assert "line 5: skipped: role must be mentor or mentee" in errors
+    assert "line 4: skipped: mentor 3 not found" in errors and "line 5: skipped: status" in errors
+
+    users, matches = create_stores("sqlite", db)
+    assert [u["id"] for u in users.values()] == [1, 2, 3]
+    mentor = users["m1@example.com"]
+    assert mentor["profile"] == {"name": "멘토", "bio": "", "imageUrl": "/images/mentor/1", "skills": ["Python", "Go"]}
+    # 평문 비밀번호는 가져올 때 해시한다
+    assert get_context().verify("secret", users["e1@example.com"]["hashed_password"])
+    assert [(m["id"], m["status"]) for m in matches.values()] == [(1, "pending"), (2, "accepted")]
+
+    # 내보내기는 시작 시점 기준: 내보내는 도중 서버가 쓴 변경은 포함하지 않는다
+    with manage.point_in_time(manage.build_parser().parse_args(["--backend", "sqlite", "export"]), users, matches) as (u, m):
+        users.create("late@example.com", lambda id: {"id": id, "email": "late@example.com", "hashed_password": HASHED,
+                                                     "name": "늦음", "role": "mentee", "profile": {"name": "늦음", "bio": "", "imageUrl": ""}})
+        assert [user["email"] for user in u] == ["m1@example.com", "m2@example.com", "e1@example.com"]
+        assert len(list(m)) == 2
+    users.db.close()
+
+    out = tmp_path / "users.out.ndjson"
+    assert manage.main(["--backend", "sqlite", "--sqlite-path", db, "export", "--users", str(out),
+                        "--matches", str(tmp_path / "matches.out.csv")]) == 0
+    exported = read_lines(out)
+    assert exported[0] == {"id": 1, "email": "m1@example.com", "name": "멘토", "role": "mentor",
+                           "hashed_password": HASHED, "bio": "", "skills": ["Python", "Go"]}
+    assert len(exported) == 4
+    assert (tmp_path / "matches.out.csv").read_text(encoding="utf-8").splitlines() == [
+        "id,mentorId,menteeId,message,status", "1,1,3,안녕하세요,pending", "2,2,3,,accepted"]
+
+def test_memory_backend_uses_journal(tmp_path):
+    journal = ["--backend", "memory", "--journal", "--journal-dir", str(tmp_path / "journal")]
+    users_in = write_lines(tmp_path / "users.ndjson", [dict(u, hashed_password=HASHED) for u in USERS])
+    matches_in = write_lines(tmp_path / "matches.ndjson", [{"id": 10, "mentorId": 2, "menteeId": 3, "message": "hi"}])
+    assert manage.main(journal + ["import", "--users", users_in, "--matches", matches_in]) == 0
+    out = tmp_path / "out.csv"
+    assert manage.main(journal + ["export", "--users", str(out)]) == 0
+    assert out.read_text(encoding="utf-8").splitlines()[1] == f'1,m1@example.com,멘토,mentor,{HASHED},,"Python,Go"'
+
+    # 다시 가져오면 이미 있는 유저는 건너뛰고 새 id는 기존 다음부터
+    more = write_lines(tmp_path / "more.ndjson", [USERS[0], {"email": "e2@example.com", "name": "새", "role": "mentee",
+                                                          "hashed_password": HASHED}])
+    new_match = write_lines(tmp_path / "new_match.ndjson", [{"mentorId": 1, "menteeId": 4, "message": ""}])
+    assert manage.main(journal + ["import", "--users", more, "--matches", new_match]) == 1
+    assert manage.main(journal + ["export", "--users", str(tmp_path / "u.ndjson"), "--matches", str(tmp_path / "m.ndjson")]) == 0
+    assert [u["id"] for u in read_lines(tmp_path / "u.ndjson")] == [1, 2, 3, 4]
+    assert [m["id"] for m in read_lines(tmp_path / "m.ndjson")] == [10, 11]
+
+def test_gc_images_removes_unreferenced_variants(tmp_path, capsys):
+    from images import DirectoryImageStore
+
+    db = str(tmp_path / "app.db")
+    images = DirectoryImageStore(str(tmp_path / "images"))
+    live, stale = images.put(b"live"), images.put(b"stale")
+    for digest in (live, stale):
+        os.utime(images.path(digest), (0, 0))
+    users, _ = create_stores("sqlite", db)
+    users["m@example.com"] = {"id": 1, "email": "m@example.com", "hashed_password": HASHED, "name": "멘토", "role": "mentor",
+                              "profile": {"name": "멘토", "bio": "", "imageUrl": "", "skills": [],
+                                          "image_variants": {"original": live}}}
+    users.db.close()
+    assert manage.main(["--backend", "sqlite", "--sqlite-path", db, "gc-images", "--image-store", "directory",
+                        "--image-store-path", str(tmp_path / "images"), "--grace", "0"]) == 0
+    assert "removed 1, referenced 1" in capsys.readouterr().err
+    assert images.get(live) == b"live" and images.get(stale) is None
+
+def test_import_retries_auto_ids_taken_by_concurrent_signup(tmp_path, capsys):
+    db = str(tmp_path / "app.db")
+    users, _ = create_stores("sqlite", db)
+    insert_many = users.insert_many
+    signed_up = []
+
+    def signup_then_insert(records):
+        # 배치 id를 정한 뒤 서버가 가입을 받아 같은 id를 먼저 쓴 상황
+        if not signed_up:
+            signed_up.append(users.create("s@example.com", lambda id: {
+                "id": id, "email": "s@example.com", "hashed_password": HASHED, "name": "가입", "role": "mentee",
+                "profile": {"name": "가입", "bio": "", "imageUrl": ""}}))
+        return insert_many(records)
+
+    users.insert_many = signup_then_insert
+    importer = manage.Importer(users, None, 10, 1)
+    rows = [dict(u, hashed_password=HASHED) for u in USERS[:2]] + [
+        {"email": "s@example.com", "name": "중복", "role": "mentee", "hashed_password": HASHED}]
+    assert importer.import_users(iter(enumerate(rows, 1))) == 2
+    assert signed_up[0]["id"] == 1
+    # 이메일이 겹친 행만 건너뛰고, id만 겹친 행은 새 id로 넣는다
+    [error] = capsys.readouterr().err.splitlines()
+    assert error.startswith("line 3: skipped: duplicate key")
+    assert [(u["email"], u["id"], u["profile"]["imageUrl"]) for u in users.values()] == [
+        ("s@example.com", 1, ""), ("m1@example.com", 2, "/images/mentor/2"), ("m2@example.com", 3, "/images/mentor/3")]
+    users.db.close()
@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token
+from metrics import Histogram, SamplingProfiler, SPAN_LATENCY, span, spans
+
+client = TestClient(app)
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("t_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value, "/a")
+    lines = hist.render()
+    assert 't_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 't_seconds_count{route="/a"} 4' in lines
+    assert 't_seconds_sum{route="/a"} 4.05' in lines
+
+def test_metrics_endpoint_uses_route_templates():
+    client.delete("/api/match-requests/123456")
+    client.get("/no-such-path")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    # id가 아니라 경로 템플릿으로 집계하고, 매칭되지 않은 경로는 하나로 묶는다
+    assert 'http_requests_total{method="DELETE",route="/api/match-requests/{id}",status="401"}' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "/123456" not in body
+    assert 'http_requests_in_flight{method="GET"} 1' in body
+    assert 'app_cache_entries{cache="token"}' in body
+
+def test_span_timers_are_opt_in():
+    before = SPAN_LATENCY.count("unit")
+    spans.enabled = False
+    with span("unit"):
+        pass
+    assert SPAN_LATENCY.count("unit") == before
+    spans.enabled = True
+    try:
+        with span("unit"):
+            pass
+    finally:
+        spans.enabled = False
+    assert SPAN_LATENCY.count("unit") == before + 1
+
+def test_profiler_keeps_slow_requests_only():
+    profiler = SamplingProfiler(interval_ms=1, slow_ms=20, keep=2)
+    assert profiler.begin() is None
+    profiler.start()
+    try:
+        fast = profiler.begin()
+        profiler.end(fast, "GET", "/fast", 0.001)
+        slow = profiler.begin()
+        time.sleep(0.05)
+        profiler.end(slow, "GET", "/slow", 0.05)
+    finally:
+        profiler.stop()
+    assert [p["path"] for p in profiler.profiles] == ["/slow"]
+    assert profiler.profiles[0]["samples"] > 0
+    assert "test_profiler_keeps_slow_requests_only" in profiler.profiles[0]["folded"]
+
+def test_debug_endpoints_require_admin_token(monkeypatch):
+    assert client.post("/debug/profiler?profile=true").status_code == 404
+    monkeypatch.setattr(main, "METRICS_ADMIN_TOKEN", "secret")
+    assert client.post("/debug/profiler?profile=true").status_code == 403
+    admin = {"X-Admin-Token": "secret"}
+    try:
+        resp = client.post("/debug/profiler?profile=true&slow_ms=0&spans=true", headers=admin)
+        assert resp.json() == {"profiler": True, "slow_ms": 0, "spans": True}
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'nobody@example.com'})}"}
+        client.get("/api/me", headers=headers)
+        profiles = client.get("/debug/profiles", headers=admin).json()["profiles"]
+        assert any(p["path"] == "/api/me" for p in profiles)
+        assert client.get(f"/debug/profiles/{profiles[0]['id']}", headers=admin).status_code == 200
+        assert SPAN_LATENCY.count("auth") > 0
+    finally:
+        client.post("/debug/profiler?profile=false&slow_ms=500&spans=false", headers=admin)
+    assert not main.profiler.enabled and not spans.enabled
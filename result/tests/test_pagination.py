@@ -0,0 +1,119 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from fastapi.testclient import TestClient
+from main import app, fake_users_db, fake_match_requests, create_access_token
+
+client = TestClient(app)
+
+def add_user(id, role, name, skills=None):
+    email = f"page{id}@example.com"
+    fake_users_db[email] = {
+        "id": id,
+        "email": email,
+        "hashed_password": "",
+        "name": name,
+        "role": role,
+        "profile": {"name": name, "bio": "", "imageUrl": f"/images/{role}/{id}", "skills": skills},
+    }
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+def collect(url, headers):
+    names, pages = [], 0
+    while url:
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200
+        names += [m["profile"]["name"] for m in resp.json()]
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        url = f"{url.split('&cursor=')[0]}&cursor={cursor}" if cursor else None
+    return names, pages
+
+def test_mentor_cursor_pagination_and_stream():
+    mentee = add_user(20000, "mentee", "페이지멘티")
+    names = ["d", "a", "e", "b", "c"]
+    for i, name in enumerate(names):
+        add_user(20001 + i, "mentor", name, ["PageTest", f"S{i}"])
+
+    result, pages = collect("/api/mentors?skill=pagetest&order_by=name&limit=2", mentee)
+    assert result == sorted(names)
+    assert pages == 3
+    result, _ = collect("/api/mentors?skill=pagetest&limit=2", mentee)
+    assert result == names
+
+    # 다른 order_by로 발급된 커서는 거부
+    resp = client.get("/api/mentors?skill=pagetest&order_by=name&limit=2", headers=mentee)
+    cursor = resp.headers["X-Next-Cursor"]
+    resp = client.get(f"/api/mentors?skill=pagetest&order_by=skill&cursor={cursor}", headers=mentee)
+    assert resp.status_code == 400
+    resp = client.get("/api/mentors?cursor=garbage", headers=mentee)
+    assert resp.status_code == 400
+    # match는 any/all만 허용한다
+    assert client.get("/api/mentors?skill=pagetest&match=some", headers=mentee).status_code == 422
+
+    resp = client.get("/api/mentors?skill=pagetest&order_by=name&stream=ndjson", headers=mentee)
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [m["profile"]["name"] for m in lines] == sorted(names)
+    resp = client.get("/api/mentors?skill=pagetest&stream=json", headers=mentee)
+    assert resp.json() == client.get("/api/mentors?skill=pagetest", headers=mentee).json()
+
+def test_match_request_cursor_pagination():
+    mentee = add_user(20100, "mentee", "페이지멘티2")
+    mentor = add_user(20101, "mentor", "페이지멘토2", [])
+    for _ in range(5):
+        resp = client.post("/api/match-requests", headers=mentee, json={"mentorId": 20101, "menteeId": 20100, "message": "hi"})
+        assert resp.status_code == 200
+    expected = [m["id"] for m in fake_match_requests.values() if m["mentorId"] == 20101]
+
+    ids, url = [], "/api/match-requests/incoming?limit=2"
+    while url:
+        resp = client.get(url, headers=mentor)
+        ids += [m["id"] for m in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        url = f"/api/match-requests/incoming?limit=2&cursor={cursor}" if cursor else None
+    assert ids == expected
+
+    resp = client.get("/api/match-requests/outgoing?stream=ndjson", headers=mentee)
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [m["id"] for m in lines] == expected
+    assert "message" not in lines[0]
+
+def test_match_request_status_filter():
+    mentee = add_user(20200, "mentee", "상태멘티")
+    mentor = add_user(20201, "mentor", "상태멘토", [])
+    ids = []
+    for _ in range(3):
+        resp = client.post("/api/match-requests", headers=mentee, json={"mentorId": 20201, "menteeId": 20200, "message": "hi"})
+        ids.append(resp.json()["id"])
+    client.put(f"/api/match-requests/{ids[1]}/accept", headers=mentor)
+
+    resp = client.get("/api/match-requests/incoming?status=accepted", headers=mentor)
+    assert [m["id"] for m in resp.json()] == [ids[1]]
+    resp = client.get("/api/match-requests/outgoing?status=pending", headers=mentee)
+    assert [m["id"] for m in resp.json()] == [ids[0], ids[2]]
+    assert client.get("/api/match-requests/outgoing?status=unknown", headers=mentee).status_code == 422
+
+def test_status_filtered_pages_use_user_status_index():
+    from store import MatchRequestStore
+
+    matches = MatchRequestStore()
+    for id in range(1, 2001):
+        matches[id] = {"id": id, "mentorId": 1, "menteeId": 2, "message": "", "status": "pending"}
+    for id in (1500, 1998, 2000):
+        matches.update(id, lambda m: m.update(status="accepted"))
+    # 수락된 요청 3개만 담긴 목록을 읽는다 (대기 중인 요청 수와 관계없음)
+    assert matches._by_field_status["mentorId"][(1, "accepted")] == [1500, 1998, 2000]
+    page, next_key = matches.page_by("mentorId", 1, limit=2, status="accepted")
+    assert [m["id"] for m in page] == [1500, 1998] and next_key == (1998,)
+    assert [m["id"] for m in matches.page_by("menteeId", 2, 1998, status="accepted")[0]] == [2000]
+    assert len(matches.page_by("menteeId", 2, 1490, 20, status="pending")[0]) == 20
+
+    matches.update(1998, lambda m: m.update(status="cancelled"))
+    del matches[2000]
+    assert [m["id"] for m in matches.page_by("mentorId", 1, status="accepted")[0]] == [1500]
+    assert [m["id"] for m in matches.page_by("menteeId", 2, status="cancelled")[0]] == [1998]
+    matches.clear()
+    assert matches._by_field_status == {"mentorId": {}, "menteeId": {}}
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+import main
+from main import app, fake_users_db
+from passwords import PasswordHasher, hash_password, verify_and_update
+from store import create_stores
+
+client = TestClient(app)
+
+def test_rehash_when_cost_changes():
+    hashed = hash_password("secret", rounds=4)
+    assert verify_and_update("secret", hashed, rounds=4) == (True, None)
+    valid, new_hash = verify_and_update("secret", hashed, rounds=5)
+    assert valid and new_hash.startswith("$2b$05$")
+    assert verify_and_update("wrong", hashed, rounds=5) == (False, None)
+
+def test_hasher_runs_in_pool():
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=4)
+    try:
+        hashed = asyncio.run(hasher.hash("secret"))
+        assert asyncio.run(hasher.verify_and_update("secret", hashed)) == (True, None)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+def test_hasher_replaces_broken_pool():
+    hasher = PasswordHasher(workers=1, max_pending=2, rounds=4)
+    try:
+        # 워커 프로세스가 죽으면 그 요청은 실패하고, 다음 요청은 새 풀에서 처리한다
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(hasher._run(os._exit, 1))
+        hashed = asyncio.run(hasher.hash("secret"))
+        assert asyncio.run(hasher.verify_and_update("secret", hashed)) == (True, None)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+def test_login_rehashes_with_configured_cost(monkeypatch):
+    email = "rehash@example.com"
+    fake_users_db[email] = {
+        "id": 30000, "email": email, "hashed_password": hash_password("pw", rounds=4),
+        "name": "rehash", "role": "mentee", "profile": {"name": "rehash", "bio": "", "imageUrl": ""},
+    }
+    monkeypatch.setattr(main.password_hasher, "rounds", 5)
+    resp = client.post("/api/login", data={"username": email, "password": "pw"})
+    assert resp.status_code == 200
+    assert fake_users_db[email]["hashed_password"].startswith("$2b$05$")
+
+def test_login_rehash_keeps_concurrent_profile_update(tmp_path, monkeypatch):
+    users, _ = create_stores("sqlite", str(tmp_path / "app.db"))
+    monkeypatch.setattr(main, "fake_users_db", users)
+    email = "rehash-race@example.com"
+    users[email] = {
+        "id": 1, "email": email, "hashed_password": hash_password("pw", rounds=4),
+        "name": "race", "role": "mentor", "profile": {"name": "race", "bio": "", "imageUrl": "", "skills": []},
+    }
+
+    async def verify_while_profile_changes(password, hashed):
+        # 해시를 검증하는 동안 다른 요청이 프로필을 바꾼다
+        users.update(email, lambda u: u["profile"].update(skills=["Go"]))
+        return True, hash_password(password, rounds=5)
+
+    monkeypatch.setattr(main.password_hasher, "verify_and_update", verify_while_profile_changes)
+    assert client.post("/api/login", data={"username": email, "password": "pw"}).status_code == 200
+    assert users[email]["hashed_password"].startswith("$2b$05$")
+    assert [m["id"] for m in users.mentors.query(["go"])] == [1]
+    users.db.close()
+
+def test_signup_sheds_load_when_pool_full(monkeypatch):
+    monkeypatch.setattr(main.password_hasher, "max_pending", 0)
+    resp = client.post("/api/signup", json={"email": "busy@example.com", "password": "pw", "name": "busy", "role": "mentee"})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert "busy@example.com" not in fake_users_db
@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token
+from ratelimit import InMemoryRateLimitBackend, RateLimited, RateLimiter, SQLiteRateLimitBackend, client_ip, parse_rate
+from sqlite_store import SQLiteDatabase
+
+client = TestClient(app)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(clock=clock)
+    rate = parse_rate("2/10")
+    assert [backend.acquire("k", rate) for _ in range(3)] == [0, 0, 5.0]
+    assert backend.acquire("other", rate) == 0
+    clock.now += 5
+    assert backend.acquire("k", rate) == 0
+    assert backend.acquire("k", rate) > 0
+    assert parse_rate("0") is None and parse_rate("") is None
+
+def test_memory_backend_bounds_keys():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    rate = parse_rate("1/60")
+    for key in ("a", "b", "c"):
+        backend.acquire(key, rate)
+    assert len(backend) == 2
+    # 밀려난 버킷은 가득 찬 상태로 다시 시작한다
+    assert backend.acquire("a", rate) == 0
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = str(tmp_path / "limits.db")
+    clock = FakeClock()
+    first = SQLiteRateLimitBackend(SQLiteDatabase(path), clock=clock)
+    second = SQLiteRateLimitBackend(SQLiteDatabase(path), clock=clock)
+    rate = parse_rate("2/60")
+    assert first.acquire("k", rate) == 0
+    assert second.acquire("k", rate) == 0
+    assert first.acquire("k", rate) == pytest.approx(30.0)
+    clock.now += 3600
+    second.prune(60)
+    assert first.acquire("k", rate) == 0
+
+def test_limiter_counts_rejections():
+    limiter = RateLimiter(InMemoryRateLimitBackend()).limit("x", "1/60").limit("off", "0")
+    limiter.check("x", "1")
+    with pytest.raises(RateLimited) as e:
+        limiter.check("x", "1")
+    assert e.value.retry_after_header == "60" and limiter.rejected["x"] == 1
+    for _ in range(5):
+        limiter.check("off", "1")
+
+def test_client_ip_trusts_proxy_only_when_enabled():
+    class Client:
+        host = "10.0.0.1"
+    headers = {"x-forwarded-for": "203.0.113.5, 10.0.0.1"}
+    assert client_ip(headers, Client, trust_proxy=False) == "10.0.0.1"
+    assert client_ip(headers, Client, trust_proxy=True) == "203.0.113.5"
+
+@pytest.fixture
+def tight_limits(monkeypatch):
+    limiter = (RateLimiter(InMemoryRateLimitBackend(), enabled=True)
+               .limit("login_ip", "100/60").limit("login_email", "2/60")
+               .limit("signup_ip", "1/60").limit("match_user", "1/60"))
+    monkeypatch.setattr(main, "rate_limiter", limiter)
+    return limiter
+
+def test_login_rejected_before_bcrypt(tight_limits, monkeypatch):
+    calls = []
+    async def verify(password, hashed):
+        calls.append(password)
+        return False, None
+    monkeypatch.setattr(main.password_hasher, "verify_and_update", verify)
+    main.fake_users_db["limited@example.com"] = {
+        "id": 70001, "email": "limited@example.com", "hashed_password": "x", "name": "l", "role": "mentee",
+        "profile": {"name": "l", "bio": "", "imageUrl": "/images/mentee/70001", "skills": None},
+    }
+    statuses = [client.post("/api/login", data={"username": "limited@example.com", "password": "pw"}).status_code
+                for _ in range(3)]
+    assert statuses == [401, 401, 429]
+    assert len(calls) == 2
+    # 이메일 키는 대소문자를 구분하지 않는다
+    resp = client.post("/api/login", data={"username": "Limited@example.com", "password": "pw"})
+    assert resp.status_code == 429 and int(resp.headers["Retry-After"]) >= 1
+    # 다른 이메일은 별도 버킷
+    assert client.post("/api/login", data={"username": "ghost@example.com", "password": "pw"}).status_code == 401
+
+def test_signup_and_match_creation_limits(tight_limits):
+    resp = client.post("/api/signup", json={"email": "rl1@example.com", "password": "pw", "name": "a", "role": "mentee"})
+    assert resp.status_code == 201
+    resp = client.post("/api/signup", json={"email": "rl2@example.com", "password": "pw", "name": "a", "role": "mentee"})
+    assert resp.status_code == 429 and "rl2@example.com" not in main.fake_users_db
+
+    mentee = main.fake_users_db["rl1@example.com"]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'rl1@example.com'})}"}
+    body = {"mentorId": 999999, "menteeId": mentee["id"], "message": "hi"}
+    assert client.post("/api/match-requests", json=body, headers=headers).status_code == 400
+    assert client.post("/api/match-requests", json=body, headers=headers).status_code == 429
+    assert tight_limits.rejected == {"login_ip": 0, "login_email": 0, "signup_ip": 1, "match_user": 1}
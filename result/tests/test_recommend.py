@@ -0,0 +1,122 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token
+from recommend import INITIAL_MENTORS, MentorRecommender, bio_terms
+from store import MatchRequestStore, UserStore
+
+client = TestClient(app)
+
+def make_mentor(id, skills):
+    email = f"r{id}@example.com"
+    return email, {
+        "id": id, "email": email, "hashed_password": "", "name": f"멘토{id}", "role": "mentor",
+        "profile": {"name": f"멘토{id}", "bio": "", "imageUrl": f"/images/mentor/{id}", "skills": skills},
+    }
+
+def make_recommender(users, matches):
+    recommender = MentorRecommender(lambda: (users.iter_role("mentor"), matches.iter_status("accepted")))
+    users.subscribe(recommender.on_user_event)
+    matches.subscribe(recommender.on_match_event)
+    return recommender
+
+def test_ranks_by_weighted_overlap():
+    users, matches = UserStore(), MatchRequestStore()
+    for id, skills in [(1, ["Python"]), (2, ["Python", "Rust"]), (3, ["Python", "Go"]), (4, ["Java"]), (5, ["python"])]:
+        email, mentor = make_mentor(id, skills)
+        users[email] = mentor
+    recommender = make_recommender(users, matches)
+    # Rust는 한 명만 가진 희소한 스킬이라 Python보다 가중치가 크다
+    ranked = recommender.recommend(["Rust", "PYTHON"])
+    assert ranked[0] == (2, 1.0)
+    assert [id for id, _ in ranked] == [2, 1, 3, 5]
+    assert ranked[1][1] == ranked[2][1] < 1
+    assert [id for id, _ in recommender.recommend(["python"], limit=2)] == [1, 2]
+    assert recommender.recommend(["Haskell"]) == []
+    # 소개글에서 찾은 스킬은 낮은 가중치로 반영
+    ranked = recommender.recommend(["Java"], bio="Go 백엔드 개발을 배우고 싶어요")
+    assert [id for id, _ in ranked] == [4, 3]
+    assert "spring boot" in bio_terms("Spring Boot, Kotlin.")
+
+def test_incremental_updates_and_accepted_exclusion():
+    users, matches = UserStore(), MatchRequestStore()
+    email, mentor = make_mentor(1, ["Python"])
+    users[email] = mentor
+    recommender = make_recommender(users, matches)
+    assert recommender.recommend(["Go"]) == []
+
+    users.update(email, lambda u: u["profile"].update(skills=["Go"]))
+    assert [id for id, _ in recommender.recommend(["Go"])] == [1]
+    assert recommender.recommend(["Python"]) == []
+
+    match = matches.create(lambda id: {"id": id, "mentorId": 1, "menteeId": 9, "message": "", "status": "pending"})
+    assert len(recommender.recommend(["Go"])) == 1
+    matches.update(match["id"], lambda m: m.update(status="accepted"))
+    assert recommender.recommend(["Go"]) == []
+    matches.update(match["id"], lambda m: m.update(status="cancelled"))
+    assert len(recommender.recommend(["Go"])) == 1
+
+    # 행렬이 커져도(열 추가) 기존 비트가 유지되고, 삭제된 멘토의 열은 재사용된다
+    for id in range(2, INITIAL_MENTORS + 10):
+        email_i, mentor_i = make_mentor(id, ["Go", f"s{id % 100}"])
+        users[email_i] = mentor_i
+    assert len(recommender.recommend(["Go"], limit=INITIAL_MENTORS + 100)) == INITIAL_MENTORS + 9
+    del users[email]
+    assert 1 not in dict(recommender.recommend(["Go"], limit=INITIAL_MENTORS + 100))
+    users[make_mentor(99999, ["Elm"])[0]] = make_mentor(99999, ["Elm"])[1]
+    assert recommender.recommend(["Elm"]) == [(99999, 1.0)]
+    assert len(recommender) == INITIAL_MENTORS + 9
+
+def test_ties_at_limit_break_by_id():
+    users, matches = UserStore(), MatchRequestStore()
+    for id in range(300, 0, -1):
+        email, mentor = make_mentor(id, ["Go"])
+        users[email] = mentor
+    recommender = make_recommender(users, matches)
+    assert [id for id, _ in recommender.recommend(["Go"], limit=3)] == [1, 2, 3]
+
+def test_changes_during_build_are_applied():
+    users, matches = UserStore(), MatchRequestStore()
+    users[make_mentor(1, ["Go"])[0]] = make_mentor(1, ["Go"])[1]
+
+    def loader():
+        mentors = users.iter_role("mentor")
+        # 행렬을 만드는 도중 가입/매칭 수락이 들어온다
+        users[make_mentor(2, ["Go"])[0]] = make_mentor(2, ["Go"])[1]
+        matches.create(lambda id: {"id": id, "mentorId": 1, "menteeId": 9, "message": "", "status": "accepted"})
+        return mentors, matches.iter_status("pending")
+
+    recommender = MentorRecommender(loader)
+    users.subscribe(recommender.on_user_event)
+    matches.subscribe(recommender.on_match_event)
+    assert [id for id, _ in recommender.recommend(["Go"])] == [2]
+
+def test_recommendations_endpoint():
+    email, mentor = make_mentor(90001, ["Zig", "Nim"])
+    main.fake_users_db[email] = mentor
+    other_email, other = make_mentor(90002, ["Zig"])
+    main.fake_users_db[other_email] = other
+    mentee_email = "r-mentee@example.com"
+    main.fake_users_db[mentee_email] = {
+        "id": 90003, "email": mentee_email, "hashed_password": "", "name": "멘티", "role": "mentee",
+        "profile": {"name": "멘티", "bio": "", "imageUrl": "/images/mentee/90003", "skills": None},
+    }
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': mentee_email})}"}
+
+    resp = client.get("/api/mentors/recommendations?skills=zig,nim&limit=5", headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [item["mentor"]["id"] for item in body] == [90001, 90002]
+    assert body[0]["score"] == 1.0 and body[0]["matchedSkills"] == ["Zig", "Nim"]
+    assert body[0]["mentor"]["profile"]["skills"] == ["Zig", "Nim"]
+
+    main.fake_match_requests.create(lambda id: {
+        "id": id, "mentorId": 90001, "menteeId": 90003, "message": "", "status": "accepted"})
+    resp = client.get("/api/mentors/recommendations?skills=zig,nim", headers=headers)
+    assert [item["mentor"]["id"] for item in resp.json()] == [90002]
+
+    mentor_headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    assert client.get("/api/mentors/recommendations?skills=zig", headers=mentor_headers).status_code == 401
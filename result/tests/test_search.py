@@ -0,0 +1,111 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token
+from search import MentorSearchIndex, tokenize
+from store import UserStore
+
+client = TestClient(app)
+
+def make_mentor(id, name, bio, skills):
+    email = f"q{id}@example.com"
+    return email, {
+        "id": id, "email": email, "hashed_password": "", "name": name, "role": "mentor",
+        "profile": {"name": name, "bio": bio, "imageUrl": f"/images/mentor/{id}", "skills": skills},
+    }
+
+def make_index(mentors):
+    users = UserStore()
+    for id, name, bio, skills in mentors:
+        email, mentor = make_mentor(id, name, bio, skills)
+        users[email] = mentor
+    index = MentorSearchIndex(lambda: users.iter_role("mentor"))
+    users.subscribe(index.on_user_event)
+    return users, index
+
+MENTORS = [
+    (1, "김파이", "파이썬으로 백엔드 API를 만듭니다", ["Python", "FastAPI"]),
+    (2, "Alice Kim", "Frontend developer who loves React and TypeScript", ["React"]),
+    (3, "이자바", "스프링과 자바 백엔드 개발 10년", ["Java", "Spring"]),
+    (4, "Bob", "Python data engineer, Kafka pipelines", ["Python", "Kafka"]),
+]
+
+def ids(results):
+    return [mentor_id for _, mentor_id in results]
+
+def test_tokenize_mixed_korean_and_english():
+    assert tokenize("파이썬을 배우는 C++ 개발자") == [["파이", "이썬", "썬을"], ["배우", "우는"], ["c++"], ["개발", "발자"]]
+    assert tokenize("React개발") == [["react"], ["개발"]]
+
+def test_bm25_ranking_and_prefix():
+    _, index = make_index(MENTORS)
+    # 이름(가중치 3)에 나온 멘토가 소개글에만 나온 멘토보다 앞선다
+    assert ids(index.search("kim")) == [2]
+    # 스킬과 소개글 양쪽에 나온 멘토가 스킬에만 나온 멘토보다 앞선다
+    assert ids(index.search("python")) == [4, 1]
+    assert ids(index.search("python kafka")) == [4]
+    # 한글은 조사가 붙어도 찾는다
+    assert ids(index.search("파이썬")) == [1]
+    assert sorted(ids(index.search("백엔드"))) == [1, 3]
+    # 입력 중인 마지막 단어는 접두어로 일치
+    assert ids(index.search("reac")) == [2]
+    assert ids(index.search("reac", prefix=False)) == []
+    assert ids(index.search("자")) == [3]
+    assert index.search("없는단어") == []
+    assert ids(index.search("백엔드", skills=["java"])) == [3]
+
+def test_incremental_updates():
+    users, index = make_index(MENTORS)
+    assert ids(index.search("rust")) == []
+    users.update("q2@example.com", lambda u: u["profile"].update(bio="Rust 시스템 프로그래밍"))
+    assert ids(index.search("rust")) == [2]
+    assert ids(index.search("typescript")) == []
+    del users["q2@example.com"]
+    assert index.search("rust") == [] and index.search("alice") == []
+    assert "rust" not in index._terms and len(index) == 3
+
+def test_changes_during_build_are_applied():
+    users, _ = make_index(MENTORS[:2])
+
+    def loader():
+        # 색인을 만드는 도중 가입과 프로필 수정이 들어온다
+        mentors = users.iter_role("mentor")
+        email, mentor = make_mentor(*MENTORS[2])
+        users[email] = mentor
+        users.update("q1@example.com", lambda u: u["profile"].update(bio="Kotlin 안드로이드"))
+        return mentors
+
+    index = MentorSearchIndex(loader)
+    users.subscribe(index.on_user_event)
+    assert ids(index.search("스프링")) == [3]
+    assert ids(index.search("kotlin")) == [1] and ids(index.search("백엔드")) == [3]
+
+def test_get_mentors_q_parameter():
+    for id, name, bio, skills in [(91001, "검색멘토", "Elixir 와 Phoenix 전문", ["Elixir"]),
+                                  (91002, "Phoenix Lee", "Elixir 입문 멘토링", ["Elixir", "Go"]),
+                                  (91003, "Other", "nothing relevant", ["Go"])]:
+        email, mentor = make_mentor(id, name, bio, skills)
+        main.fake_users_db[email] = mentor
+    mentee_email = "q-mentee@example.com"
+    main.fake_users_db[mentee_email] = {
+        "id": 91004, "email": mentee_email, "hashed_password": "", "name": "멘티", "role": "mentee",
+        "profile": {"name": "멘티", "bio": "", "imageUrl": "/images/mentee/91004", "skills": None},
+    }
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': mentee_email})}"}
+
+    resp = client.get("/api/mentors?q=phoenix", headers=headers)
+    assert [m["id"] for m in resp.json()] == [91002, 91001]
+    resp = client.get("/api/mentors?q=phoenix&limit=1", headers=headers)
+    assert [m["id"] for m in resp.json()] == [91002]
+    resp = client.get(f"/api/mentors?q=phoenix&limit=1&cursor={resp.headers['X-Next-Cursor']}", headers=headers)
+    assert [m["id"] for m in resp.json()] == [91001] and "X-Next-Cursor" not in resp.headers
+    assert [m["id"] for m in client.get("/api/mentors?q=elix&skill=go", headers=headers).json()] == [91002]
+    assert [m["id"] for m in client.get("/api/mentors?q=검색", headers=headers).json()] == [91001]
+    # 프로필 수정이 바로 검색에 반영된다
+    other_headers = {"Authorization": f"Bearer {create_access_token({'sub': 'q91003@example.com'})}"}
+    client.put("/api/profile", headers=other_headers, json={"bio": "Phoenix LiveView"})
+    assert 91003 in [m["id"] for m in client.get("/api/mentors?q=liveview", headers=headers).json()]
+    assert client.get("/api/mentors?q=phoenix&cursor=bad", headers=headers).status_code == 400
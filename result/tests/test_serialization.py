@@ -0,0 +1,86 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token, MentorProfile, MentorProfileDetails, MenteeProfile, MenteeProfileDetails
+from serialization import ProfileFragmentCache, profile_dict
+
+client = TestClient(app)
+
+def make_user(id, role, skills=None):
+    email = f"s{id}@example.com"
+    return email, {
+        "id": id, "email": email, "hashed_password": "", "name": f"유저{id}", "role": role,
+        "profile": {"name": f"유저{id}", "bio": "소개", "imageUrl": f"/images/{role}/{id}", "skills": skills},
+    }
+
+def test_fragment_matches_pydantic_models():
+    _, mentor = make_user(1, "mentor", ["Python", "FastAPI"])
+    _, mentee = make_user(2, "mentee")
+    expected_mentor = MentorProfile(id=1, email=mentor["email"], role="mentor", profile=MentorProfileDetails(
+        name="유저1", bio="소개", imageUrl="/images/mentor/1", skills=["Python", "FastAPI"]))
+    expected_mentee = MenteeProfile(id=2, email=mentee["email"], role="mentee", profile=MenteeProfileDetails(
+        name="유저2", bio="소개", imageUrl="/images/mentee/2"))
+    cache = ProfileFragmentCache()
+    assert json.loads(cache.fragment(mentor)) == jsonable_encoder(expected_mentor)
+    assert json.loads(cache.fragment(mentee)) == jsonable_encoder(expected_mentee)
+    assert list(profile_dict(mentor)) == list(expected_mentor.model_dump())
+
+def test_fragment_cache_invalidation():
+    cache = ProfileFragmentCache(max_size=2)
+    _, user = make_user(1, "mentor", ["Go"])
+    first = cache.fragment(user)
+    assert cache.fragment(user) is first and cache.stats()["hits"] == 1
+    # 같은 버전이면 캐시된 조각을 쓰고, 저장으로 버전이 오르면 다시 인코딩한다
+    user["profile"]["skills"] = ["Rust"]
+    assert json.loads(cache.fragment(user))["profile"]["skills"] == ["Go"]
+    user["version"] = 2
+    assert json.loads(cache.fragment(user))["profile"]["skills"] == ["Rust"]
+    # 오래된 사본이 새 버전 조각을 덮어쓰지 않는다
+    cache.fragment(dict(user, version=1))
+    assert cache.fragment(user) is cache.fragment(user)
+    cache.on_user_event("delete", user)
+    assert len(cache) == 0
+    for id in (2, 3):
+        cache.fragment(make_user(id, "mentee")[1])
+    assert len(cache) == 2
+
+def test_profile_endpoints_use_fresh_fragments():
+    mentor_email, mentor = make_user(60001, "mentor", ["Elixir"])
+    mentee_email, mentee = make_user(60002, "mentee")
+    main.fake_users_db[mentor_email] = mentor
+    main.fake_users_db[mentee_email] = mentee
+    mentor_headers = {"Authorization": f"Bearer {create_access_token({'sub': mentor_email})}"}
+    mentee_headers = {"Authorization": f"Bearer {create_access_token({'sub': mentee_email})}"}
+
+    assert client.get("/api/me", headers=mentee_headers).json()["profile"] == {
+        "name": "유저60002", "bio": "소개", "imageUrl": "/images/mentee/60002"}
+    assert client.get("/api/me", headers=mentor_headers).json()["profile"]["skills"] == ["Elixir"]
+    resp = client.put("/api/profile", headers=mentor_headers, json={"name": "새이름", "skills": ["Elixir", "Erlang"]})
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json()["profile"]["name"] == "새이름"
+    assert client.get("/api/me", headers=mentor_headers).json()["profile"]["skills"] == ["Elixir", "Erlang"]
+
+    resp = client.get("/api/mentors?skill=erlang&limit=1", headers=mentee_headers)
+    assert [m["profile"]["name"] for m in resp.json()] == ["새이름"]
+    assert "X-Next-Cursor" not in resp.headers
+
+def test_me_etag_and_not_modified():
+    email, user = make_user(60003, "mentee")
+    main.fake_users_db[email] = user
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+    resp = client.get("/api/me", headers=headers)
+    etag = resp.headers["ETag"]
+    assert etag.startswith('W/"') and resp.headers["Cache-Control"] == "private, no-cache"
+    resp = client.get("/api/me", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304 and resp.content == b"" and resp.headers["ETag"] == etag
+
+    resp = client.put("/api/profile", headers=headers, json={"bio": "바뀐 소개"})
+    assert resp.headers["ETag"] != etag
+    resp = client.get("/api/me", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 200 and resp.json()["profile"]["bio"] == "바뀐 소개"
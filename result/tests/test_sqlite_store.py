@@ -0,0 +1,154 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+import main
+from main import app, create_access_token
+from store import DuplicateKeyError, create_stores
+
+client = TestClient(app)
+
+@pytest.fixture(params=["memory", "sqlite"])
+def stores(request, tmp_path):
+    users, matches = create_stores(request.param, str(tmp_path / "app.db"))
+    yield users, matches
+    if request.param == "sqlite":
+        users.db.close()
+
+def make_mentor(id, name, skills):
+    email = f"m{id}@example.com"
+    return email, {
+        "id": id, "email": email, "hashed_password": "", "name": name, "role": "mentor",
+        "profile": {"name": name, "bio": "", "imageUrl": f"/images/mentor/{id}", "skills": skills},
+    }
+
+def test_user_store_backends_agree(stores):
+    users, _ = stores
+    events = []
+    users.subscribe(lambda event, user: events.append((event, user["id"])))
+    for id, name, skills in [(1, "Cara", ["Python", "FastAPI"]), (2, "Abe", ["react"]), (3, "Bob", ["React", "Python"])]:
+        email, user = make_mentor(id, name, skills)
+        users[email] = user
+    users["e4@example.com"] = {"id": 4, "email": "e4@example.com", "hashed_password": "", "name": "E", "role": "mentee",
+                               "profile": {"name": "E", "bio": "", "imageUrl": "", "skills": None}}
+
+    assert len(users) == 4 and "m1@example.com" in users
+    assert users.get_by_id(2)["profile"]["name"] == "Abe"
+    assert users.get_by_role("mentee", 2) is None
+    assert users.count_role("mentor") == 3
+    ids = lambda mentors: [m["id"] for m in mentors]
+    assert ids(users.mentors.query(order_by="name")) == [2, 3, 1]
+    assert ids(users.mentors.query(["REACT", "python"], match="all")) == [3]
+    assert ids(users.mentors.query(["react", "fastapi"], order_by="skill")) == [1, 3, 2]
+    page, next_key = users.mentors.page(order_by="name", limit=2)
+    assert ids(page) == [2, 3]
+    assert ids(users.mentors.page(order_by="name", after=next_key, limit=2)[0]) == [1]
+
+    bob = users.get("m3@example.com")
+    bob["profile"]["skills"] = ["Go"]
+    users.save(bob)
+    assert ids(users.mentors.query(["react"])) == [2]
+    assert users.get("m3@example.com")["profile"]["skills"] == ["Go"]
+    del users["m1@example.com"]
+    assert users.get_by_id(1) is None
+    assert events[-2:] == [("update", 3), ("delete", 1)]
+
+def test_match_store_backends_agree(stores):
+    _, matches = stores
+    for id in range(1, 6):
+        matches[id] = {"id": id, "mentorId": 10 + id % 2, "menteeId": 20, "message": "hi", "status": "pending"}
+    assert len(matches) == 5
+    items, next_key = matches.page_by("mentorId", 11, 0, 2)
+    assert [m["id"] for m in items] == [1, 3] and next_key == (3,)
+    assert [m["id"] for m in matches.page_by("mentorId", 11, 3, 2)[0]] == [5]
+    match = matches.get(2)
+    match["status"] = "accepted"
+    matches.save(match)
+    assert matches[2]["status"] == "accepted"
+    assert [m["id"] for m in matches.page_by("menteeId", 20)[0]] == [1, 2, 3, 4, 5]
+    assert [m["id"] for m in matches.page_by("menteeId", 20, status="accepted")[0]] == [2]
+    assert [m["id"] for m in matches.page_by("mentorId", 10, status="pending")[0]] == [4]
+    assert [m["id"] for m in matches.iter_status("pending")] == [1, 3, 4, 5]
+    assert matches.count_status("accepted") == 1
+    del matches[2]
+    assert matches.count_status("accepted") == 0
+    assert matches.page_by("mentorId", 10)[0][0]["id"] == 4
+
+def test_api_on_sqlite_backend(tmp_path, monkeypatch):
+    users, matches = create_stores("sqlite", str(tmp_path / "api.db"))
+    users.subscribe(main.token_cache.on_user_event)
+    profile_cache = main.ProfileFragmentCache()
+    users.subscribe(profile_cache.on_user_event)
+    monkeypatch.setattr(main, "profile_cache", profile_cache)
+    monkeypatch.setattr(main, "fake_users_db", users)
+    monkeypatch.setattr(main, "fake_match_requests", matches)
+    email, mentor = make_mentor(1, "멘토", ["Python"])
+    users[email] = mentor
+    users["mentee@example.com"] = {"id": 2, "email": "mentee@example.com", "hashed_password": "", "name": "멘티",
+                                   "role": "mentee", "profile": {"name": "멘티", "bio": "", "imageUrl": "", "skills": None}}
+    mentor_headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    mentee_headers = {"Authorization": f"Bearer {create_access_token({'sub': 'mentee@example.com'})}"}
+
+    resp = client.put("/api/profile", headers=mentor_headers, json={"name": "멘토2", "bio": "bio", "skills": ["Rust"]})
+    assert resp.status_code == 200
+    resp = client.get("/api/mentors?skill=rust", headers=mentee_headers)
+    assert [m["profile"]["name"] for m in resp.json()] == ["멘토2"]
+    resp = client.post("/api/match-requests", headers=mentee_headers, json={"mentorId": 1, "menteeId": 2, "message": "hi"})
+    match_id = resp.json()["id"]
+    resp = client.put(f"/api/match-requests/{match_id}/accept", headers=mentor_headers)
+    assert resp.json()["status"] == "accepted"
+    resp = client.get("/api/match-requests/incoming", headers=mentor_headers)
+    assert resp.json()[0]["status"] == "accepted"
+    users.db.close()
+
+def test_user_versions_bump_on_every_save(stores):
+    users, _ = stores
+    email, user = make_mentor(1, "Cara", ["Python"])
+    users[email] = user
+    assert users[email]["version"] == 1
+    user = users[email]
+    users.save(user)
+    assert users[email]["version"] == 2
+    users.update(email, lambda u: u["profile"].update(bio="new"))
+    assert users[email]["version"] == 3
+    users[email] = make_mentor(1, "Cara", ["Go"])[1]
+    assert users[email]["version"] == 4
+    created = users.create("new@example.com", lambda id: make_mentor(id, "New", [])[1])
+    assert created["version"] == 1 and users.epoch
+
+def test_insert_many_is_all_or_nothing(stores):
+    users, matches = stores
+    batch = [make_mentor(id, f"M{id}", ["Python"])[1] for id in range(1, 4)]
+    assert users.insert_many(batch) == 3
+    assert users.count_role("mentor") == 3 and users["m2@example.com"]["version"] == 1
+    with pytest.raises(DuplicateKeyError):
+        users.insert_many([make_mentor(4, "M4", [])[1], make_mentor(2, "dup", [])[1]])
+    assert len(users) == 3
+
+    rows = [{"id": id, "mentorId": 1, "menteeId": 9, "message": "", "status": "pending"} for id in range(1, 6)]
+    assert matches.insert_many(rows) == 5
+    with pytest.raises(DuplicateKeyError):
+        matches.insert_many(rows[:1])
+    assert matches.page_by("mentorId", 1, 0, 2)[1] == (2,)
+    assert matches.create(lambda id: dict(rows[0], id=id))["id"] == 6
+
+def test_update_many_reports_missing_and_skipped(stores):
+    _, matches = stores
+    events = []
+    matches.subscribe(lambda event, match: events.append((event, match["id"])))
+    matches.insert_many({"id": id, "mentorId": id % 2, "menteeId": 9, "message": "", "status": "pending"} for id in range(1, 5))
+    events.clear()
+
+    def accept_own(match):
+        if match["mentorId"] != 1:
+            return False
+        match["status"] = "accepted"
+        return True
+
+    results = matches.update_many([3, 1, 99, 2, 3], accept_own)
+    assert list(results) == [3, 1, 99, 2]
+    assert results[99] is None and results[2]["status"] == "pending"
+    assert sorted(events) == [("update", 1), ("update", 3)]
+    assert [matches[id]["status"] for id in range(1, 5)] == ["accepted", "pending", "accepted", "pending"]
@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import subprocess
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import main
+import openapi_cache
+
+RESULT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_heavy_dependencies_load_lazily():
+    code = "import sys, main; print(','.join(m for m in ('PIL', 'passlib', 'bcrypt', 'jose', 'numpy') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=RESULT_DIR, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+def test_openapi_cache_is_current():
+    # 실패하면 `python openapi_cache.py`로 다시 생성한다
+    assert openapi_cache.load() == openapi_cache.build(main.app)
+
+def test_install_serves_pregenerated_schema(tmp_path):
+    path = str(tmp_path / "openapi.json")
+    app = FastAPI(title="t")
+
+    @app.get("/ping")
+    def ping():
+        return "pong"
+
+    openapi_cache.install(app, path)
+    assert "/ping" in TestClient(app).get("/openapi.json").json()["paths"]
+
+    with open(path, "w") as f:
+        json.dump({"openapi": "3.1.0", "info": {"title": "cached", "version": "1"}, "paths": {}}, f)
+    app.openapi_schema = None
+    assert TestClient(app).get("/openapi.json").json()["info"]["title"] == "cached"
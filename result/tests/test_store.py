@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from store import UserStore
+
+def make_user(id, email, role):
+    return {"id": id, "email": email, "role": role, "profile": {"name": email, "bio": "", "imageUrl": ""}}
+
+def test_user_store_indexes():
+    store = UserStore()
+    store["a@example.com"] = make_user(1, "a@example.com", "mentor")
+    store["b@example.com"] = make_user(2, "b@example.com", "mentee")
+    store["c@example.com"] = make_user(3, "c@example.com", "mentor")
+
+    assert len(store) == 3
+    assert "a@example.com" in store
+    assert store.get_by_id(2)["email"] == "b@example.com"
+    assert store.get_by_role("mentor", 3)["email"] == "c@example.com"
+    assert store.get_by_role("mentor", 2) is None
+    assert [u["id"] for u in store.iter_role("mentor")] == [1, 3]
+
+    # 같은 이메일로 덮어쓰면 이전 인덱스가 제거되어야 함
+    store["a@example.com"] = make_user(4, "a@example.com", "mentee")
+    assert store.get_by_id(1) is None
+    assert store.get_by_role("mentee", 4)["email"] == "a@example.com"
+    assert [u["id"] for u in store.iter_role("mentor")] == [3]
+
+    del store["c@example.com"]
+    assert store.get_by_id(3) is None
+    assert store.count_role("mentor") == 0
+
+def make_mentor(id, name, skills):
+    user = make_user(id, f"m{id}@example.com", "mentor")
+    user["profile"].update({"name": name, "skills": skills})
+    return user
+
+def test_mentor_index_filters_and_orders():
+    store = UserStore()
+    for m in [
+        make_mentor(1, "Cara", ["Python", "FastAPI"]),
+        make_mentor(2, "Abe", ["react"]),
+        make_mentor(3, "Bob", ["React", "Python"]),
+    ]:
+        store[m["email"]] = m
+
+    ids = lambda mentors: [m["id"] for m in mentors]
+    assert ids(store.mentors.query()) == [1, 2, 3]
+    assert ids(store.mentors.query(order_by="name")) == [2, 3, 1]
+    assert ids(store.mentors.query(order_by="skill")) == [1, 3, 2]
+    assert ids(store.mentors.query(["REACT"])) == [2, 3]
+    assert ids(store.mentors.query(["react", "fastapi"], match="any", order_by="name")) == [2, 3, 1]
+    assert ids(store.mentors.query(["react", "python"], match="all")) == [3]
+    assert ids(store.mentors.query(["go"])) == []
+
+    # 프로필 변경 후 save 하면 역색인과 정렬 뷰가 갱신되어야 함
+    bob = store.get_by_id(3)
+    bob["profile"]["name"] = "Zoe"
+    bob["profile"]["skills"] = ["Go"]
+    store.save(bob)
+    assert ids(store.mentors.query(["react"])) == [2]
+    assert ids(store.mentors.query(["go"])) == [3]
+    assert ids(store.mentors.query(order_by="name")) == [2, 1, 3]
+
+def test_mentor_index_survives_failed_update():
+    store = UserStore()
+    for m in [make_mentor(1, "Cara", ["Python"]), make_mentor(2, "Abe", ["Go"])]:
+        store[m["email"]] = m
+    ids = lambda mentors: [m["id"] for m in mentors]
+
+    # 다른 이름과 비교할 수 없는 정렬 키, 문자열이 아닌 스킬: 색인은 이전 상태를 유지한다
+    for bad in ({"name": 123}, {"skills": [None]}):
+        with pytest.raises((TypeError, AttributeError)):
+            store.update("m1@example.com", lambda u: u["profile"].update(bad))
+        assert ids(store.mentors.query(order_by="name")) == [2, 1]
+        assert ids(store.mentors.query(["python"])) == [1]
+        store.update("m1@example.com", lambda u: u["profile"].update(name="Cara", skills=["Python"]))
+    store.update("m1@example.com", lambda u: u["profile"].update(name="Aaron"))
+    assert ids(store.mentors.query(order_by="name")) == [1, 2]
+    assert ids(store.mentors.query()) == [1, 2]
+
+def test_update_profile_rejects_non_string_fields():
+    from fastapi.testclient import TestClient
+    from main import app, create_access_token, fake_users_db
+
+    client = TestClient(app)
+    for id, name in ((93001, "정렬 멘토"), (93002, "Sort Mentor")):
+        fake_users_db[f"sort{id}@example.com"] = dict(make_mentor(id, name, ["Cobol"]), email=f"sort{id}@example.com",
+                                                       hashed_password="", name=name)
+    fake_users_db["sort-mentee@example.com"] = dict(make_user(93003, "sort-mentee@example.com", "mentee"), hashed_password="",
+                                                    name="멘티")
+    mentor = {"Authorization": f"Bearer {create_access_token({'sub': 'sort93001@example.com'})}"}
+    mentee = {"Authorization": f"Bearer {create_access_token({'sub': 'sort-mentee@example.com'})}"}
+
+    for body in ({"name": 123, "bio": ""}, {"name": "멘토", "bio": "", "skills": "Cobol"}, {"name": "멘토", "skills": [1]}):
+        assert client.put("/api/profile", headers=mentor, json=body).status_code == 400
+    assert client.put("/api/profile", headers=mentor, json={"name": "Alpha", "bio": "", "skills": ["Cobol"]}).status_code == 200
+    resp = client.get("/api/mentors?skill=cobol&order_by=name", headers=mentee)
+    assert [m["id"] for m in resp.json()] == [93001, 93002]
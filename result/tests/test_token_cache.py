@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import timedelta
+from fastapi.testclient import TestClient
+from main import app, fake_users_db, create_access_token, token_cache
+from token_cache import TokenCache
+
+client = TestClient(app)
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_never_serves_expired_entries():
+    clock = FakeClock()
+    cache = TokenCache(max_size=10, ttl=300, clock=clock)
+    cache.put("t1", {"sub": "a@example.com", "exp": 1010})
+    assert cache.get("t1")["sub"] == "a@example.com"
+    clock.now = 1010
+    assert cache.get("t1") is None
+    assert len(cache) == 0
+
+    # TTL이 exp보다 짧으면 TTL이 우선
+    cache.put("t2", {"sub": "a@example.com", "exp": 5000})
+    clock.now = 1010 + 300
+    assert cache.get("t2") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 2}
+
+def test_lru_eviction_and_subject_invalidation():
+    cache = TokenCache(max_size=2, ttl=300, clock=FakeClock())
+    cache.put("t1", {"sub": "a", "exp": 2000})
+    cache.put("t2", {"sub": "b", "exp": 2000})
+    cache.get("t1")
+    cache.put("t3", {"sub": "a", "exp": 2000})
+    assert cache.get("t2") is None
+    cache.invalidate_subject("a")
+    assert cache.get("t1") is None and cache.get("t3") is None
+
+def test_get_current_user_uses_cache_and_invalidates_on_delete():
+    email = "cache@example.com"
+    fake_users_db[email] = {
+        "id": 40000, "email": email, "hashed_password": "", "name": "cache", "role": "mentee",
+        "profile": {"name": "cache", "bio": "", "imageUrl": ""},
+    }
+    token = create_access_token({"sub": email})
+    headers = {"Authorization": f"Bearer {token}"}
+    hits = token_cache.hits
+    assert client.get("/api/me", headers=headers).status_code == 200
+    assert client.get("/api/me", headers=headers).status_code == 200
+    assert token_cache.hits == hits + 1
+
+    del fake_users_db[email]
+    assert token_cache.get(token) is None
+    assert client.get("/api/me", headers=headers).status_code == 401
+
+    expired = create_access_token({"sub": email}, expires_delta=timedelta(seconds=-1))
+    assert client.get("/api/me", headers={"Authorization": f"Bearer {expired}"}).status_code == 401
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+# --- 토큰 캐시 설정 ---
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL = int(os.environ.get("TOKEN_CACHE_TTL", "300"))
+
+
+# --- 검증된 JWT 캐시 ---
+# 원본 토큰 문자열을 키로 디코딩된 claims를 보관하는 LRU/TTL 캐시.
+# 항목은 토큰의 exp와 TTL 중 이른 시점까지만 유효하며, 만료된 항목은 절대 반환하지 않는다.
+class TokenCache:
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE, ttl: int = TOKEN_CACHE_TTL, clock=time.time):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self._by_subject: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[dict]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, expires_at = entry
+            if now >= expires_at:
+                self._discard(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, claims: dict):
+        exp = claims.get("exp")
+        if self.max_size <= 0 or exp is None:
+            return
+        expires_at = min(float(exp), self._clock() + self.ttl)
+        subject = claims.get("sub")
+        with self._lock:
+            self._discard(token)
+            self._entries[token] = (claims, expires_at)
+            self._by_subject.setdefault(subject, set()).add(token)
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_subject(self, subject: str):
+        with self._lock:
+            for token in list(self._by_subject.get(subject, ())):
+                self._discard(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_subject.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def on_user_event(self, event: str, user: dict):
+        # UserStore 리스너: 삭제되거나 자격 증명/프로필이 바뀐 유저의 토큰은 다시 검증한다.
+        if event in ("update", "delete"):
+            self.invalidate_subject(user["email"])
+
+    def _discard(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        subject = entry[0].get("sub")
+        tokens = self._by_subject.get(subject)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_subject[subject]